@@ -1,29 +1,14 @@
-import nltk
-import os
-
-nltk_data_path = os.path.join(os.path.dirname(__file__), 'nltk_data')
-if nltk_data_path not in nltk.data.path:
-    nltk.data.path.append(nltk_data_path)
-
-from nltk.tokenize import word_tokenize
-pos_tags = pos_tag(word_tokenize(user_input))
-
 import streamlit as st
-import joblib
-import numpy as np
 import pandas as pd
-from wordcloud import WordCloud
 import matplotlib.pyplot as plt
-from scipy.sparse import hstack
-import seaborn as sns
-import shap
-import streamlit.components.v1 as components
 from PIL import Image
 
-# Load model & vectorizers
-model = joblib.load("logistic_model.pkl")
-vectorizer_text = joblib.load("countvectorizer_text.pkl")
-vectorizer_pos = joblib.load("countvectorizer_pos.pkl")
+from charts import probability_bars
+from model_bundle import get_bundle
+from scoring import predict
+
+# Load model & vectorizers (sekali per proses, dipakai bersama semua sesi)
+bundle = get_bundle()
 
 # Custom style
 st.set_page_config(page_title="Deteksi Lowongan Kerja Palsu", layout="wide")
@@ -95,37 +80,14 @@ if page == "🔍 Prediksi":
         if len(user_input.split()) < 5:  # Pastikan input lebih dari 5 kata
             st.warning("⚠️ Input harus terdiri dari setidaknya 5 kata agar model dapat melakukan analisis yang akurat.")
         else:
-            # Tokenisasi dan POS tagging
-            tokenizer = TreebankWordTokenizer()
-            tokens = tokenizer.tokenize(user_input)
-            pos_tags = pos_tag(tokens)
-            pos_features = ' '.join(tag[1] for tag in pos_tags)
-
-            # Transformasi teks dan fitur POS menggunakan CountVectorizer
-            text_vector = vectorizer_text.transform([user_input])
-            pos_vector = vectorizer_pos.transform([pos_features])
-
-            # Gabungkan fitur teks dan POS
-            combined_vector = hstack([text_vector, pos_vector])
-
-            # Prediksi dengan model
-            prediction = model.predict(combined_vector)[0]
-            prob = model.predict_proba(combined_vector)[0][1]
-
-            feature_names = vectorizer_text.get_feature_names_out()
-            text_features = text_vector.toarray()[0]
-
-            # Ambil 5 kata dengan nilai tertinggi dari vektor
-            top_indices = text_features.argsort()[::-1][:5]
-            highlight_words = [feature_names[i] for i in top_indices if text_features[i] > 0]
-
-            # Tampilkan probabilitas sebagai bar chart
-            prob_data = [prob, 1 - prob]
-            labels = ['Palsu', 'Asli']
-            fig, ax = plt.subplots()
-            sns.barplot(x=labels, y=prob_data, ax=ax)
-            ax.set_ylim(0, 1)
-            st.pyplot(fig)
+            # Preprocessing, tokenisasi, POS tagging dan vektorisasi sama dengan app.py dan train.py (lihat scoring.py)
+            result = predict(bundle, [user_input])[0]
+            prediction = result["prediction"]
+            prob = result["probability"]
+            highlight_words = result["highlight_words"]
+
+            # Tampilkan probabilitas sebagai bar chart (SVG, lihat charts.py)
+            st.markdown(probability_bars(prob, st.get_option("theme.base")), unsafe_allow_html=True)
 
             # Menampilkan hasil prediksi
             if prediction == 1:
@@ -247,8 +209,9 @@ elif page == "📌 Tentang":
 
         ax.axis('equal')
 
-        # Tampilkan chart
+        # Tampilkan chart, lalu lepas figure agar tidak menumpuk di pyplot antar rerun
         st.pyplot(fig)
+        plt.close(fig)
 
     except Exception as e:
         st.error(f"Terjadi kesalahan saat memuat data: {e}")
@@ -1,29 +1,11 @@
-import nltk
-import nltk
-nltk.data.path.append("nltk_data")
-import joblib
-import numpy as np
-import pandas as pd
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-from scipy.sparse import hstack
-import seaborn as sns
-import shap
-import streamlit.components.v1 as components
-from PIL import Image
-
-# Load model & vectorizers
-model = joblib.load("logistic_model.pkl")
-vectorizer_text = joblib.load("countvectorizer_text.pkl")
-vectorizer_pos = joblib.load("countvectorizer_pos.pkl")
+import streamlit as st
 
 # Custom style
 st.set_page_config(page_title="Deteksi Lowongan Kerja Palsu", layout="wide")
 
 
 # Tambahkan logo (jika ada)
-logo = Image.open("logo.png")
-st.sidebar.image(logo, width=150)
+st.sidebar.image("logo.png", width=150)
 
 # Header Sidebar
 st.sidebar.markdown("## 📊 Job Scam Classifier")
@@ -62,6 +44,65 @@ st.sidebar.markdown("""
 
 # Prediksi
 if page == "🔍 Prediksi":
+    # Model dan NLTK hanya dimuat ketika halaman prediksi dibuka
+    from model_bundle import get_bundle
+    from scoring import DEFAULT_THRESHOLD, predict
+    import instrumentation
+    from feedback import get_store as get_feedback_store, update as update_from_feedback
+    from near_duplicates import get_index as get_duplicate_index
+    from charts import probability_bars
+    from prediction_cache import DEFAULT_PATH as PREDICTION_CACHE_PATH, get_cache
+    from term_counts import get_term_counts
+
+    # Load model & vectorizers (sekali per proses, dipakai bersama semua sesi)
+    bundle = get_bundle()
+    with st.sidebar.expander("⚙️ Status Model"):
+        metrics = bundle.metrics()
+        st.markdown(f"- Versi artefak: `{metrics['version']}`")
+        st.markdown(f"- Waktu muat: {metrics['total_load_seconds']:.2f} detik")
+        if metrics["rss_bytes"] is not None:
+            st.markdown(f"- Memori proses: {metrics['rss_bytes'] / 2**20:,.0f} MB")
+        # Model punkt dimuat per bahasa saat pertama dibutuhkan (lihat punkt_registry.py)
+        punkt_stats = bundle.sentence_tokenizer.stats()
+        st.markdown(
+            f"- Tokenizer punkt: {', '.join(punkt_stats['loaded'])} "
+            f"({len(punkt_stats['loaded'])}/{punkt_stats['max_models']} dimuat)"
+        )
+        # Cache prediksi dipakai bersama semua sesi dan score.py --cache
+        cache_stats = get_cache(PREDICTION_CACHE_PATH).stats()
+        st.markdown(f"- Cache prediksi: {cache_stats['size']:,} entri, hit rate {cache_stats['hit_rate']:.0%}")
+        # Verdict moderator; model aktif diganti tanpa restart (lihat feedback.py)
+        feedback_stats = get_feedback_store().stats()
+        st.markdown(f"- Feedback moderator: {feedback_stats['total']:,} ({feedback_stats['pending']:,} belum diterapkan)")
+        if feedback_stats["pending"] and st.button("🔄 Terapkan feedback"):
+            update_result = update_from_feedback(get_feedback_store(), duplicates=get_duplicate_index())
+            st.markdown(
+                f"- Model diperbarui ke versi `{update_result['version']}` "
+                f"dalam {update_result['seconds']:.1f} detik"
+            )
+
+    # Hanya tampil jika FAKE_JOB_METRICS=1 (lihat instrumentation.py)
+    if instrumentation.enabled():
+        with st.sidebar.expander("⏱️ Waktu per Tahap"):
+            stages = instrumentation.snapshot()["stages"]
+            st.table([
+                {"tahap": name, "panggilan": s["count"], "dokumen": s["items"], "rata-rata (ms)": round(s["mean_ms"], 2)}
+                for name, s in stages.items()
+            ])
+            st.download_button("⬇️ Metrik Prometheus", instrumentation.prometheus_text(), file_name="metrics.txt")
+            profiler = instrumentation.profiler()
+            if profiler is not None:
+                st.download_button("⬇️ Profil (collapsed stack)", profiler.collapsed(), file_name="profile.txt")
+
+    # Ambang probabilitas palsu; turunkan untuk menaikkan recall iklan palsu
+    threshold = st.sidebar.slider("🎚️ Ambang prediksi palsu:", 0.05, 0.95, DEFAULT_THRESHOLD, 0.05)
+
+    # Early exit: iklan yang jelas asli/palsu tidak melewati POS tagging (lihat cascade.py)
+    cascade = None
+    if bundle.cascade is not None and st.sidebar.checkbox("⚡ Mode cascade"):
+        band = st.sidebar.slider("Pita ketidakpastian:", 0.0, 1.0, (bundle.cascade.low, bundle.cascade.high), 0.01)
+        cascade = bundle.cascade.banded(*band)
+
     st.title("🔍 Deteksi Iklan Lowongan Kerja Palsu")
     
     # Penjelasan lebih detail
@@ -87,56 +128,112 @@ if page == "🔍 Prediksi":
         if len(user_input.split()) < 5:  # Pastikan input lebih dari 5 kata
             st.warning("⚠️ Input harus terdiri dari setidaknya 5 kata agar model dapat melakukan analisis yang akurat.")
         else:
-            # Tokenisasi dan POS tagging
-            pos_tags = nltk.pos_tag(nltk.word_tokenize(user_input))
-            pos_features = ' '.join(tag[1] for tag in pos_tags)
-
-            # Transformasi teks dan fitur POS menggunakan CountVectorizer
-            text_vector = vectorizer_text.transform([user_input])
-            pos_vector = vectorizer_pos.transform([pos_features])
-
-            # Gabungkan fitur teks dan POS
-            combined_vector = hstack([text_vector, pos_vector])
-
-            # Prediksi dengan model
-            prediction = model.predict(combined_vector)[0]
-            prob = model.predict_proba(combined_vector)[0][1]
-
-            # Interpretasi fitur penting (SHAP / alternatif manual)
-            # Ambil fitur teks penting yang digunakan model
-            feature_names = vectorizer_text.get_feature_names_out()
-            text_features = text_vector.toarray()[0]
-
-            # Ambil 5 kata dengan nilai tertinggi dari vektor
-            top_indices = text_features.argsort()[::-1][:5]
-            highlight_words = [feature_names[i] for i in top_indices if text_features[i] > 0]
-
-            # Tampilkan probabilitas sebagai bar chart
-            prob_data = [prob, 1 - prob]
-            labels = ['Palsu', 'Asli']
-            fig, ax = plt.subplots()
-            sns.barplot(x=labels, y=prob_data, ax=ax)
-            ax.set_ylim(0, 1)
-            st.pyplot(fig)
+            # Tokenisasi, POS tagging, vektorisasi dan prediksi (lihat scoring.py)
+            result = predict(bundle, [user_input], threshold=threshold, term_counts=get_term_counts(),
+                             cache=get_cache(PREDICTION_CACHE_PATH), duplicates=get_duplicate_index(),
+                             cascade=cascade)[0]
+            prediction = result["prediction"]
+            prob = result["probability"]
+            highlight_words = result["highlight_words"]
+            # Disimpan agar tombol feedback di bawah tetap tahu prediksi mana yang dinilai setelah rerun
+            st.session_state["last_prediction"] = {
+                "text": user_input, "prediction": prediction, "probability": prob, "version": bundle.version,
+            }
+
+            with instrumentation.stage("chart"):
+                # Tampilkan probabilitas sebagai bar chart (SVG, tanpa matplotlib; lihat charts.py)
+                st.markdown(probability_bars(prob, st.get_option("theme.base")), unsafe_allow_html=True)
 
             # Menampilkan hasil prediksi
+            if "duplicate_of" in result:
+                st.warning(
+                    f"🧬 Iklan ini hampir sama ({result['similarity']:.0%}) dengan kelompok iklan palsu "
+                    f"#{result['duplicate_of']} yang sudah dikenal; verdict kelompok tersebut dipakai."
+                )
+            if result.get("stage") == "first":
+                st.caption("⚡ Diputuskan model tahap pertama (cascade); POS tagging dilewati.")
             if prediction == 1:
                 st.error(f"❌ Ini kemungkinan **PALSU** ({prob*100:.2f}%)")
                 
-                st.subheader("🔎 Kenapa terdeteksi palsu?")
-                st.write(
-                    f"Iklan ini diklasifikasikan sebagai **palsu** karena mengandung kata-kata seperti:"
-                )
-                st.markdown(
-                    " - " + "\n - ".join([f"`{word}`" for word in highlight_words])
-                )
-                st.info(
-                    "Kata-kata tersebut sering muncul pada iklan palsu berdasarkan pelatihan model, "
-                    "seperti janji gaji besar tanpa detail, promosi cepat, atau permintaan transfer uang."
-                )
+                # Hasil dari klaster duplikat tidak punya kata penjelas
+                if highlight_words:
+                    st.subheader("🔎 Kenapa terdeteksi palsu?")
+                    st.write(
+                        f"Iklan ini diklasifikasikan sebagai **palsu** karena mengandung kata-kata seperti:"
+                    )
+                    st.markdown(
+                        " - " + "\n - ".join([f"`{word}`" for word in highlight_words])
+                    )
+                    st.info(
+                        "Kata-kata tersebut sering muncul pada iklan palsu berdasarkan pelatihan model, "
+                        "seperti janji gaji besar tanpa detail, promosi cepat, atau permintaan transfer uang."
+                    )
             else:
                 st.success(f"✅ Ini kemungkinan **ASLI** ({(1 - prob)*100:.2f}%)")
 
+                # Term yang paling menurunkan skor palsu menurut bobot model
+                real_words = [term for term, _ in result["explanation"]["real"]]
+                if real_words:
+                    st.write("Kata-kata yang paling mendukung keaslian iklan ini:")
+                    st.markdown(" - " + "\n - ".join([f"`{word}`" for word in real_words]))
+
+    # Moderator mengonfirmasi atau membalik verdict terakhir
+    last_prediction = st.session_state.get("last_prediction")
+    if last_prediction is not None and last_prediction["text"] == user_input:
+        st.write("🧑‍⚖️ Apakah verdict ini benar?")
+        confirm_column, overturn_column = st.columns(2)
+        verdict = None
+        if confirm_column.button("👍 Benar"):
+            verdict = last_prediction["prediction"]
+        if overturn_column.button("👎 Salah, balik verdict"):
+            verdict = 1 - last_prediction["prediction"]
+        if verdict is not None:
+            get_feedback_store().add(
+                last_prediction["text"], last_prediction["prediction"], verdict,
+                last_prediction["probability"], last_prediction["version"],
+            )
+            del st.session_state["last_prediction"]
+            st.success(f"✅ Verdict disimpan sebagai **{'PALSU' if verdict == 1 else 'ASLI'}**. Terima kasih!")
+
+    # Prediksi batch dari file CSV (skema fake_job_postings.csv)
+    with st.expander("📦 Prediksi Batch (CSV)"):
+        st.write("""
+        Unggah file CSV dengan kolom seperti *fake_job_postings.csv* (title, company_profile, description, dll.)
+        atau tuliskan path file CSV di server. File diproses per chunk dan hasilnya ditulis bertahap ke file output.
+        """)
+        uploaded_file = st.file_uploader("📁 Unggah file CSV:", type="csv")
+        csv_path = st.text_input("📂 ... atau path file CSV di server:")
+        output_path = st.text_input("💾 File output:", "prediksi_batch.csv")
+        chunksize = st.number_input("Ukuran chunk (baris):", min_value=100, max_value=50000, value=1000, step=100)
+        workers = st.number_input("Proses paralel untuk POS tagging:", min_value=1, max_value=64, value=1)
+
+        if st.button("🚀 Jalankan Batch") and (uploaded_file is not None or csv_path.strip()):
+            progress_bar = st.progress(0.0)
+            status = st.empty()
+
+            def report_progress(stats):
+                progress_bar.progress(stats["fraction"])
+                status.text(f"{stats['rows']:,} baris diproses · {stats['rows_per_sec']:,.0f} baris/detik")
+
+            try:
+                from batch import score_csv
+
+                source = uploaded_file if uploaded_file is not None else csv_path.strip()
+                stats = score_csv(source, output_path, bundle, chunksize=int(chunksize),
+                                  progress=report_progress, threshold=threshold, workers=int(workers),
+                                  term_counts=get_term_counts(), duplicates=get_duplicate_index(),
+                                  cascade=cascade)
+            except Exception as e:
+                st.error(f"Terjadi kesalahan saat memproses batch: {e}")
+            else:
+                progress_bar.progress(1.0)
+                st.success(
+                    f"✅ {stats['rows']:,} iklan diproses dalam {stats['seconds']:.1f} detik "
+                    f"({stats['rows_per_sec']:,.0f} baris/detik), {stats['fraudulent']:,} terdeteksi palsu."
+                )
+                with open(output_path, "rb") as f:
+                    st.download_button("⬇️ Unduh hasil", f, file_name="prediksi_batch.csv", mime="text/csv")
+
 # Tentang
 elif page == "📌 Tentang":
     st.title("ℹ️ Tentang Aplikasi 🧠")
@@ -161,27 +258,41 @@ elif page == "📌 Tentang":
 
     # Menampilkan DataFrame asli (fake_job_postings.csv)
     try:
-        # Memuat data dari CSV
-        df = pd.read_csv('fake_job_postings.csv')
+        # Memuat data dari store kolumnar (dibuat sekali dari CSV, lihat dataset_store.py)
+        import dataset_store
+        import search_index
+
+        # Store dan indeks pencarian dibangun sekali, lalu dibaca ulang hanya jika CSV berubah
+        search_index.ensure_index()
 
         # Menampilkan DataFrame dengan pencarian dan filter
         st.subheader("Data Iklan Lowongan Kerja Asli")
         
         # Menambahkan opsi pencarian
         search_query = st.text_input("Cari Lowongan (title, description, dll.):")
+        label_filter = st.radio("Tampilkan:", ["Semua", "Asli", "Palsu"], horizontal=True)
         if search_query:
-            filtered_df = df[df['title'].str.contains(search_query, case=False, na=False)]
-            st.dataframe(filtered_df.head(15))
+            # Pencarian lewat indeks terbalik (title, company_profile, description, requirements)
+            label = {"Semua": None, "Asli": 0, "Palsu": 1}[label_filter]
+            hits = search_index.get_index().search(search_query, k=15, label=label)
+            if hits.truncated:
+                # Awalan pendek hanya diperluas ke sebagian term (lihat search_index.MAX_PREFIX_TERMS)
+                st.caption(f"Setidaknya {hits.total:,} lowongan cocok. Kata terakhir terlalu pendek; "
+                           "ketik lebih lengkap untuk hasil yang lengkap.")
+            else:
+                st.caption(f"{hits.total:,} lowongan cocok")
+            st.dataframe(dataset_store.take(hits.rows))
         else:
-            st.dataframe(df.head(15))  # Menampilkan beberapa baris pertama
+            st.dataframe(dataset_store.head(15))  # Menampilkan beberapa baris pertama
 
         # Statistik Iklan Asli dan Palsu dengan Tampilan Profesional
         st.subheader("📈 Statistik Iklan Lowongan Kerja")
 
-        # Hitung statistik dasar
-        total_ads = len(df)
-        true_ads = df['fraudulent'].value_counts().get(0, 0)
-        fake_ads = df['fraudulent'].value_counts().get(1, 0)
+        # Statistik dasar sudah dihitung saat konversi (stats.json)
+        stats = dataset_store.load_stats()
+        total_ads = stats["total"]
+        true_ads = stats["real"]
+        fake_ads = stats["fake"]
         true_pct = (true_ads / total_ads) * 100
         fake_pct = (fake_ads / total_ads) * 100
 
@@ -191,9 +302,8 @@ elif page == "📌 Tentang":
         col2.metric("✅ Iklan Asli", f"{true_ads:,}", f"{true_pct:.2f}%")
         col3.metric("❌ Iklan Palsu", f"{fake_ads:,}", f"{fake_pct:.2f}%")
 
-        # Cek tema untuk menyesuaikan warna teks
+        # Tema menentukan warna teks pada chart
         theme = st.get_option("theme.base")
-        text_color = 'white' if theme == 'dark' else 'black'
 
         # Visualisasi Distribusi: Pie Chart Profesional
         st.subheader("📊 Distribusi Iklan Asli vs Palsu")
@@ -201,46 +311,10 @@ elif page == "📌 Tentang":
         # Penjelasan distribusi iklan
         st.write("Berikut merupakan distribusi sebaran iklan lowongan pekerjaan palsu dan asli, sesuai dataset tersebut:")
 
-        # Membuat pie chart distribusi
-        fig, ax = plt.subplots(figsize=(6, 6))
-        fig.patch.set_alpha(0)
-        ax.set_facecolor('none')
-
-        # Susun data dengan label dan size yang sudah diurutkan
-        data = {
-            'Asli': true_ads,
-            'Palsu': fake_ads
-        }
-        labels = list(data.keys())
-        sizes = list(data.values())
-        colors = ['#0D47A1', '#B71C1C']  # Biru dongker & Merah gelap
-
-        def custom_autopct(pct, allvals):
-            absolute = int(round(pct/100.*sum(allvals)))
-            return f'{pct:.1f}%\n({absolute:,})'
-
-        wedges, texts, autotexts = ax.pie(
-            sizes,
-            labels=None,
-            autopct=lambda pct: custom_autopct(pct, sizes),
-            startangle=90,
-            colors=colors,
-            wedgeprops={'edgecolor': 'white', 'linewidth': 2},
-        )
-
-        # Tambahkan label manual di tengah potongan
-        for i, autotext in enumerate(autotexts):
-            autotext.set_text(f'{labels[i]}\n{autotext.get_text()}')
-            autotext.set_color(text_color)
-            autotext.set_fontsize(14)
-            autotext.set_fontweight('bold')
-            autotext.set_ha('center')
-            autotext.set_va('center')
+        # Pie chart distribusi dirender sekali per (versi store, tema) lalu diambil dari cache (lihat charts.py)
+        from charts import distribution_pie
 
-        ax.axis('equal')
-
-        # Tampilkan chart
-        st.pyplot(fig)
+        st.image(distribution_pie(true_ads, fake_ads, theme, dataset_store.version()), use_container_width=True)
 
     except Exception as e:
         st.error(f"Terjadi kesalahan saat memuat data: {e}")
@@ -269,10 +343,28 @@ elif page == "☁️ Word Cloud":
         "Pilih kategori iklan untuk ditampilkan Word Cloud-nya:",
         ("Iklan Asli (Real Job)", "Iklan Palsu (Fake Job)")
     )
+    windows = {"Semua data": None, "30 hari terakhir": 30, "7 hari terakhir": 7}
+    pilihan_window = st.selectbox("Rentang data:", list(windows))
+
+    def tampilkan_word_cloud(label, static_image):
+        # Word cloud dinamis dari tabel frekuensi term (lihat term_counts.py) jika tersedia
+        from term_counts import get_term_counts, word_cloud
+
+        store = get_term_counts()
+        if not store.available():
+            st.image(static_image, use_container_width=True)
+            return
+        from model_bundle import get_bundle
+
+        image = word_cloud(get_bundle(), label, windows[pilihan_window], store)
+        if image is None:
+            st.info("Belum ada iklan yang diprediksi dalam rentang waktu ini.")
+        else:
+            st.image(image, use_container_width=True)
 
     if pilihan_wc == "Iklan Asli (Real Job)":
         st.subheader("✅ Word Cloud - Iklan Lowongan Kerja Asli")
-        st.image("wc-realjob.png", use_container_width=True)
+        tampilkan_word_cloud(0, "wc-realjob.png")
         st.markdown("""
         ### 🔍 Analisis Word Cloud - Iklan Asli
         Kata-kata dominan:
@@ -290,7 +382,7 @@ elif page == "☁️ Word Cloud":
 
     elif pilihan_wc == "Iklan Palsu (Fake Job)":
         st.subheader("❌ Word Cloud - Iklan Lowongan Kerja Palsu")
-        st.image("wc-fakejob.png", use_container_width=True)
+        tampilkan_word_cloud(1, "wc-fakejob.png")
         st.markdown("""
         ### ⚠️ Analisis Word Cloud - Iklan Palsu
         Kata-kata dominan:
@@ -0,0 +1,118 @@
+"""Prediksi batch untuk file CSV dengan skema ``fake_job_postings.csv``.
+
+File dibaca secara streaming per chunk, setiap chunk diubah menjadi satu
+matriks sparse (teks + POS) dan diskor dengan satu panggilan model, lalu
+hasilnya langsung ditulis ke file output sehingga memori tetap kecil
+berapa pun ukuran file input.
+"""
+import contextlib
+import csv
+import io
+import os
+import time
+
+from pos_tagging import PosTaggingPool
+from scoring import DEFAULT_THRESHOLD, predict
+
+# Kolom yang digabung menjadi 'combined_text' saat pelatihan (lihat iklan-palsu.ipynb)
+TEXT_COLUMNS = [
+    "title", "location", "salary_range", "company_profile", "description",
+    "requirements", "benefits", "employment_type", "required_experience",
+    "required_education", "industry", "function", "department",
+]
+ID_COLUMN = "job_id"
+OUTPUT_COLUMNS = [ID_COLUMN, "prediction", "probability"]
+DEFAULT_CHUNKSIZE = 1000
+
+
+def combine_columns(row):
+    """Gabungkan kolom teks satu baris seperti ``df.fillna(' ')`` + ``' '.join`` di notebook."""
+    if "combined_text" in row and not any(col in row for col in TEXT_COLUMNS):
+        return row["combined_text"] or ""
+    return " ".join(row.get(col) or " " for col in TEXT_COLUMNS)
+
+
+def iter_chunks(rows, chunksize=DEFAULT_CHUNKSIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def score_chunk(bundle, rows, threshold=DEFAULT_THRESHOLD, pos_pool=None, term_counts=None, duplicates=None,
+                cascade=None):
+    texts = [combine_columns(row) for row in rows]
+    # Satu matriks sparse dan satu perkalian dengan bobot model per chunk
+    return predict(bundle, texts, with_words=False, threshold=threshold, pos_pool=pos_pool,
+                   term_counts=term_counts, duplicates=duplicates, cascade=cascade)
+
+
+def pos_pool_for(workers):
+    """Pool POS tagging jika ``workers`` > 1, atau context kosong untuk proses tunggal."""
+    if workers is not None and workers > 1:
+        return PosTaggingPool(workers)
+    return contextlib.nullcontext()
+
+
+def score_csv(source, output_path, bundle, chunksize=DEFAULT_CHUNKSIZE, progress=None,
+              threshold=DEFAULT_THRESHOLD, workers=1, term_counts=None, duplicates=None, cascade=None):
+    """Skor semua baris ``source`` (path atau file biner) dan tulis ke ``output_path``.
+
+    ``progress`` dipanggil setelah tiap chunk dengan dict berisi jumlah baris,
+    fraksi file yang sudah dibaca dan throughput (baris/detik).
+    Mengembalikan ringkasan akhir dalam format yang sama. ``workers`` > 1
+    membagi POS tagging ke beberapa proses. ``term_counts`` mencatat jumlah
+    term setiap chunk untuk word cloud (lihat ``term_counts.py``);
+    ``duplicates`` memakai verdict klaster untuk iklan hampir-duplikat dari
+    kampanye penipuan yang dikenal (lihat ``near_duplicates.py``);
+    ``cascade`` melewati model penuh untuk iklan yang jelas (lihat ``cascade.py``).
+    """
+    raw = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    total_bytes = _stream_size(raw)
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    try:
+        reader = csv.DictReader(text)
+        start = time.perf_counter()
+        stats = {"rows": 0, "fraudulent": 0, "fraction": 0.0, "seconds": 0.0, "rows_per_sec": 0.0}
+
+        with open(output_path, "w", encoding="utf-8", newline="") as out, pos_pool_for(workers) as pos_pool:
+            writer = csv.writer(out)
+            writer.writerow(OUTPUT_COLUMNS)
+            for chunk in iter_chunks(reader, chunksize):
+                results = score_chunk(bundle, chunk, threshold, pos_pool, term_counts, duplicates, cascade)
+                for i, (row, result) in enumerate(zip(chunk, results)):
+                    row_id = row.get(ID_COLUMN, stats["rows"] + i)
+                    writer.writerow([row_id, result["prediction"], f"{result['probability']:.6f}"])
+                out.flush()
+
+                stats["rows"] += len(chunk)
+                stats["fraudulent"] += sum(result["prediction"] == 1 for result in results)
+                stats["seconds"] = time.perf_counter() - start
+                stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+                if total_bytes:
+                    stats["fraction"] = min(raw.tell() / total_bytes, 1.0)
+                if progress is not None:
+                    progress(dict(stats))
+
+        stats["fraction"] = 1.0
+        return stats
+    finally:
+        # Jangan tutup file milik pemanggil (mis. hasil st.file_uploader)
+        if raw is source:
+            text.detach()
+        else:
+            text.close()
+
+
+def _stream_size(raw):
+    try:
+        position = raw.tell()
+        size = raw.seek(0, io.SEEK_END)
+        raw.seek(position)
+        return size - position
+    except (AttributeError, OSError):
+        return None
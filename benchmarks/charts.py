@@ -0,0 +1,134 @@
+"""Benchmark render chart per rerun: cara lama (matplotlib/seaborn) vs ``charts.py``.
+
+Satu rerun = bar chart probabilitas halaman Prediksi + pie chart distribusi
+halaman Tentang. Cara lama meniru kode ``app.py`` sebelumnya: ``plt.subplots``
++ ``sns.barplot`` dan pie chart baru setiap rerun, ditampilkan seperti
+``st.pyplot`` (``savefig`` ke PNG) tanpa pernah ditutup. Cara baru memakai
+SVG untuk batang probabilitas dan pie chart dari cache.
+
+Setiap cara diukur di proses Python baru; dilaporkan waktu rerun pertama,
+median dan p95 rerun berikutnya, RSS sebelum/sesudah dan jumlah figure
+pyplot yang masih terbuka.
+
+Contoh:
+    python benchmarks/charts.py --reruns 200
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+MODES = ("lama", "baru")
+# Proporsi fake_job_postings.csv
+REAL_ADS = 17014
+FAKE_ADS = 866
+
+
+def _show(fig):
+    # Yang dilakukan st.pyplot: savefig ke buffer PNG, figure tidak ditutup
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def legacy_rerun(probability, theme):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    fig, ax = plt.subplots()
+    sns.barplot(x=["Palsu", "Asli"], y=[probability, 1 - probability], ax=ax)
+    ax.set_ylim(0, 1)
+    _show(fig)
+
+    fig, ax = plt.subplots(figsize=(6, 6))
+    fig.patch.set_alpha(0)
+    ax.set_facecolor("none")
+    sizes = [REAL_ADS, FAKE_ADS]
+    _, _, autotexts = ax.pie(
+        sizes, labels=None, autopct=lambda pct: f"{pct:.1f}%\n({int(round(pct / 100. * sum(sizes))):,})",
+        startangle=90, colors=["#0D47A1", "#B71C1C"], wedgeprops={"edgecolor": "white", "linewidth": 2},
+    )
+    for label, autotext in zip(["Asli", "Palsu"], autotexts):
+        autotext.set_text(f"{label}\n{autotext.get_text()}")
+        autotext.set_color("white" if theme == "dark" else "black")
+        autotext.set_fontsize(14)
+        autotext.set_fontweight("bold")
+    ax.axis("equal")
+    _show(fig)
+
+
+def current_rerun(probability, theme):
+    from charts import distribution_pie, probability_bars
+
+    probability_bars(probability, theme)
+    distribution_pie(REAL_ADS, FAKE_ADS, theme, version=1)
+
+
+def run(mode, reruns, theme):
+    """Ukur ``reruns`` rerun di proses ini; dipanggil lewat ``--mode`` di proses baru."""
+    import matplotlib
+    matplotlib.use("Agg")
+
+    from model_bundle import current_rss_bytes
+
+    rerun = legacy_rerun if mode == "lama" else current_rerun
+    rss_before = current_rss_bytes()
+    seconds = []
+    for i in range(reruns):
+        start = time.perf_counter()
+        rerun((i % 100) / 100, theme)
+        seconds.append(time.perf_counter() - start)
+    rss_after = current_rss_bytes()
+    open_figures = len(sys.modules["matplotlib.pyplot"].get_fignums()) if "matplotlib.pyplot" in sys.modules else 0
+    rest = sorted(seconds[1:]) or seconds
+    return {
+        "first_ms": seconds[0] * 1000,
+        "median_ms": statistics.median(rest) * 1000,
+        "p95_ms": rest[min(len(rest) - 1, int(len(rest) * 0.95))] * 1000,
+        "rss_before_bytes": rss_before,
+        "rss_after_bytes": rss_after,
+        "open_figures": open_figures,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=100)
+    parser.add_argument("--theme", default="light")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.mode:
+        print(json.dumps(run(args.mode, args.reruns, args.theme)))
+        return 0
+
+    results = {}
+    for mode in MODES:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--mode", mode, "--reruns", str(args.reruns),
+             "--theme", args.theme],
+            cwd=REPO_DIR, capture_output=True, text=True, check=True,
+        )
+        results[mode] = json.loads(completed.stdout.splitlines()[-1])
+
+    print(f"{'cara':<6}{'pertama':>10}{'median':>10}{'p95':>10}{'RSS awal':>11}{'RSS akhir':>11}{'figure':>8}")
+    for mode, result in results.items():
+        print(f"{mode:<6}{result['first_ms']:>8.1f}ms{result['median_ms']:>8.2f}ms{result['p95_ms']:>8.2f}ms"
+              f"{result['rss_before_bytes'] / 2**20:>9.0f}MB{result['rss_after_bytes'] / 2**20:>9.0f}MB"
+              f"{result['open_figures']:>8}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Throughput ``scoring.score_matrix`` vs ``model.predict`` + ``model.predict_proba``.
+
+Jika ``logistic_model.pkl`` ada, bobot model asli dipakai; jika tidak,
+dibuat LogisticRegression sintetis dengan jumlah fitur yang mirip. Matriks
+input adalah CSR acak dengan jumlah nonzero per baris yang bisa diatur.
+
+Contoh:
+    python benchmarks/predict_throughput.py --rows 20000 --nnz 300
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.sparse import random as sparse_random
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from scoring import score_matrix  # noqa: E402
+
+
+def load_model(n_features):
+    path = os.path.join(REPO_DIR, "logistic_model.pkl")
+    if os.path.exists(path):
+        import joblib
+        return joblib.load(path)
+
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(0)
+    X = sparse_random(2000, n_features, density=50 / n_features, format="csr", random_state=0)
+    y = rng.integers(0, 2, size=2000)
+    return LogisticRegression(max_iter=50).fit(X, y)
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--nnz", type=int, default=300, help="rata-rata nonzero per baris")
+    parser.add_argument("--features", type=int, default=500000, help="dipakai jika tidak ada model asli")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    model = load_model(args.features)
+    n_features = model.coef_.shape[1]
+    X = sparse_random(args.rows, n_features, density=args.nnz / n_features, format="csr",
+                      random_state=1, data_rvs=lambda n: np.random.default_rng(2).integers(1, 4, n))
+
+    def two_calls():
+        model.predict(X)
+        model.predict_proba(X)[:, 1]
+
+    def single_pass():
+        score_matrix(model, X)
+
+    labels = score_matrix(model, X).labels
+    assert (labels == model.predict(X)).all(), "label score_matrix berbeda dari model.predict"
+
+    baseline = best_of(two_calls, args.repeat)
+    fast = best_of(single_pass, args.repeat)
+    print(f"predict + predict_proba: {args.rows / baseline:,.0f} baris/detik")
+    print(f"score_matrix:            {args.rows / fast:,.0f} baris/detik ({baseline / fast:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
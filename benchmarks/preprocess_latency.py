@@ -0,0 +1,106 @@
+"""Bandingkan latensi preprocessing notebook dengan ``TextPreprocessor``.
+
+Baseline menjalankan langkah notebook satu per satu untuk setiap dokumen:
+``clean_text`` (re.sub + nltk.word_tokenize + stopword) lalu ``nlp(text)``
+spaCy untuk lemma. Jika spaCy tidak terpasang, baseline hanya mengukur
+``clean_text``. Skrip juga memastikan hasil ``clean`` identik byte per byte
+dengan ``clean_text`` notebook.
+
+Contoh:
+    python benchmarks/preprocess_latency.py --docs 500
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocessing import TextPreprocessor  # noqa: E402
+
+WORDS = (
+    "we are looking for a motivated customer service representative to join our team "
+    "work from home data entry earn money weekly no experience required apply now "
+    "engineer developer client project cannot wanna gonna benefits salary 10km"
+).split()
+
+
+def make_postings(n, seed=0):
+    rng = random.Random(seed)
+    postings = []
+    for _ in range(n):
+        words = rng.choices(WORDS, k=rng.randint(50, 400))
+        postings.append(
+            "<p>" + " ".join(words).capitalize() + ".</p> Visit https://example.com/job?id="
+            + str(rng.randint(1, 10**6)) + " &amp; APPLY!!"
+        )
+    return postings
+
+
+def notebook_clean_text(text, stop_words):
+    import nltk
+
+    if isinstance(text, str):
+        text = text.lower()
+        text = re.sub(r'<.*?>', '', text)
+        text = re.sub(r'http\S+', '', text)
+        text = re.sub(r'[^a-zA-Z0-9]', ' ', text)
+        tokens = nltk.word_tokenize(text)
+        tokens = [word for word in tokens if word not in stop_words]
+        return ' '.join(tokens)
+    return ''
+
+
+def load_spacy():
+    try:
+        import spacy
+        return spacy.load("en_core_web_sm", disable=["parser", "ner"])
+    except (ImportError, OSError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    postings = make_postings(args.docs)
+    preprocessor = TextPreprocessor()
+    stop_words = set(preprocessor.stop_words)
+    nlp = load_spacy()
+
+    start = time.perf_counter()
+    baseline = []
+    for text in postings:
+        cleaned = notebook_clean_text(text, stop_words)
+        if nlp is not None:
+            doc = nlp(cleaned)
+            cleaned = " ".join(t.lemma_ for t in doc if not t.is_punct and not t.is_space)
+        baseline.append(cleaned)
+    baseline_seconds = time.perf_counter() - start
+
+    if nlp is not None:
+        preprocessor.fit([preprocessor.clean(text) for text in postings], nlp=nlp)
+
+    start = time.perf_counter()
+    fast = preprocessor.transform(postings)
+    fast_seconds = time.perf_counter() - start
+
+    mismatches = sum(
+        preprocessor.clean(text) != notebook_clean_text(text, stop_words) for text in postings
+    )
+    lemma_note = "dengan lematisasi spaCy" if nlp is not None else "tanpa spaCy (hanya clean_text)"
+    print(f"Baseline notebook ({lemma_note}): {baseline_seconds / len(postings) * 1e3:.3f} ms/dokumen")
+    print(f"TextPreprocessor: {fast_seconds / len(postings) * 1e3:.3f} ms/dokumen "
+          f"({baseline_seconds / fast_seconds:.1f}x lebih cepat)")
+    print(f"Hasil clean berbeda dari clean_text notebook: {mismatches} dokumen")
+    if nlp is not None:
+        differ = sum(a != b for a, b in zip(baseline, fast))
+        print(f"Lemma lookup berbeda dari spaCy per dokumen: {differ} dokumen")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""Benchmark per tahap pipeline prediksi dengan iklan sintetis.
+
+Iklan dibuat secara lokal dari daftar kata lowongan kerja dengan distribusi
+panjang yang bisa diatur (``--length-dist``) dan seed tetap, sehingga hasil
+bisa dibandingkan antar run. Untuk setiap tahap (preprocess, tokenisasi,
+POS tagging, kedua ``CountVectorizer``, ``hstack``, skor LogisticRegression)
+diukur latensi satu dokumen (p50/p95) dan throughput batch (dokumen/detik).
+Waktu muat setiap artefak ``.pkl`` juga diukur.
+
+Hasil disimpan sebagai JSON (``--output``); dengan ``--baseline`` hasil
+dibandingkan dengan run sebelumnya dan exit code 1 jika ada tahap yang
+lebih lambat dari toleransi.
+
+Contoh:
+    python benchmarks/stages.py --docs 500 --output bench.json
+    python benchmarks/stages.py --baseline bench.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from model_bundle import ARTIFACTS, artifact_paths, load_bundle  # noqa: E402
+from scoring import score_matrix  # noqa: E402
+
+WORDS = (
+    "experience work team client ability year company looking time service project provide customer "
+    "product management development business skill support design data system sales marketing "
+    "engineer developer manager analyst office remote full part position opportunity salary benefit "
+    "training growth communication strong knowledge requirement degree education high school entry "
+    "easy money income home apply now immediate payment weekly no required earn fast cash bonus "
+    "guaranteed online flexible hour start today"
+).split()
+LENGTH_DISTS = ("fixed", "uniform", "lognormal")
+
+
+def synthetic_postings(n, mean_words=250, length_dist="lognormal", sigma=0.6, seed=0):
+    """``n`` teks iklan acak; panjang (kata) mengikuti ``length_dist`` dengan rata-rata ``mean_words``."""
+    rng = np.random.default_rng(seed)
+    if length_dist == "fixed":
+        lengths = np.full(n, mean_words)
+    elif length_dist == "uniform":
+        lengths = rng.integers(max(1, mean_words // 2), mean_words * 3 // 2 + 1, size=n)
+    else:
+        # mean lognormal = exp(mu + sigma^2 / 2)
+        lengths = rng.lognormal(np.log(mean_words) - sigma ** 2 / 2, sigma, size=n)
+    lengths = np.maximum(np.asarray(lengths, dtype=np.int64), 1)
+    words = np.array(WORDS)
+    postings = []
+    for length in lengths:
+        tokens = words[rng.integers(0, len(words), size=length)]
+        postings.append(" ".join(tokens).capitalize() + ".")
+    return postings
+
+
+def stage_functions(bundle):
+    """Daftar (nama, fungsi); input setiap tahap adalah output tahap sebelumnya."""
+    tagger = bundle.pos_tagger
+
+    return [
+        ("preprocess", bundle.preprocess),
+        ("tokenize", lambda texts: (texts, [tagger.tokenize(text) for text in texts])),
+        ("pos_tag", lambda state: (
+            state[0], [" ".join(tag for _, tag in tagger.tagger.tag(words)) for words in state[1]]
+        )),
+        ("vectorize_text", lambda state: (bundle.vectorizer_text.transform(state[0]), state[1])),
+        ("vectorize_pos", lambda state: (state[0], bundle.vectorizer_pos.transform(state[1]))),
+        ("hstack", lambda state: _hstack(state)),
+        ("score", lambda matrix: score_matrix(bundle.model, matrix)),
+    ]
+
+
+def _hstack(state):
+    from scipy.sparse import hstack
+    return hstack(list(state)).tocsr()
+
+
+def _slice(state, i):
+    """Input tahap untuk dokumen ke-``i`` saja (list atau matriks sparse)."""
+    if isinstance(state, tuple):
+        return tuple(_slice(part, i) for part in state)
+    return state[i:i + 1]
+
+
+def measure_stages(bundle, postings, repeat=3):
+    results = {}
+    state = list(postings)
+    for name, fn in stage_functions(bundle):
+        # Latensi satu dokumen: setiap dokumen diproses sendiri
+        latencies = []
+        for i in range(len(postings)):
+            single = _slice(state, i)
+            start = time.perf_counter()
+            fn(single)
+            latencies.append(time.perf_counter() - start)
+
+        # Throughput batch: seluruh dokumen sekaligus, ambil run tercepat
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output = fn(state)
+            timings.append(time.perf_counter() - start)
+
+        latencies_ms = np.array(latencies) * 1000
+        results[name] = {
+            "latency_ms": {
+                "p50": float(np.percentile(latencies_ms, 50)),
+                "p95": float(np.percentile(latencies_ms, 95)),
+                "mean": float(latencies_ms.mean()),
+            },
+            "batch_seconds": min(timings),
+            "docs_per_sec": len(postings) / min(timings) if min(timings) else None,
+        }
+        state = output
+    return results
+
+
+def measure_load(paths, repeat=3):
+    """Median waktu ``joblib.load`` untuk setiap artefak .pkl yang ada (dan ``artifacts.mmap``)."""
+    import joblib
+
+    load = {}
+    for name in [*ARTIFACTS, "preprocessor"]:
+        path = paths[name]
+        if not os.path.exists(path):
+            continue
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            joblib.load(path)
+            timings.append(time.perf_counter() - start)
+        load[name] = {"seconds": statistics.median(timings), "bytes": os.path.getsize(path)}
+
+    if os.path.exists(paths["mapped"]):
+        from mapped_artifacts import load as load_mapped
+
+        directory = os.path.dirname(paths["mapped"])
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            load_mapped(directory)
+            timings.append(time.perf_counter() - start)
+        size = sum(entry["bytes"] for entry in load_mapped(directory)[3]["files"].values())
+        load["mapped"] = {"seconds": statistics.median(timings), "bytes": size}
+    return load
+
+
+def compare(results, baseline, tolerance):
+    """Tahap yang regresi dibanding baseline: (nama, metrik, baseline, sekarang)."""
+    regressions = []
+    for name, current in results["stages"].items():
+        previous = baseline.get("stages", {}).get(name)
+        if previous is None:
+            continue
+        if previous["docs_per_sec"] and current["docs_per_sec"] < previous["docs_per_sec"] * (1 - tolerance):
+            regressions.append((name, "docs_per_sec", previous["docs_per_sec"], current["docs_per_sec"]))
+        if current["latency_ms"]["p50"] > previous["latency_ms"]["p50"] * (1 + tolerance):
+            regressions.append(
+                (name, "latency_ms.p50", previous["latency_ms"]["p50"], current["latency_ms"]["p50"])
+            )
+    for name, current in results["load"].items():
+        previous = baseline.get("load", {}).get(name)
+        if previous and current["seconds"] > previous["seconds"] * (1 + tolerance):
+            regressions.append((f"load {name}", "seconds", previous["seconds"], current["seconds"]))
+    return regressions
+
+
+def environment():
+    import nltk
+    import scipy
+    import sklearn
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "scikit-learn": sklearn.__version__,
+        "nltk": nltk.__version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--mean-words", type=int, default=250)
+    parser.add_argument("--length-dist", choices=LENGTH_DISTS, default="lognormal")
+    parser.add_argument("--sigma", type=float, default=0.6, help="sigma untuk distribusi lognormal")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--artifacts-dir", default=None)
+    parser.add_argument("--output", help="simpan hasil ke file JSON")
+    parser.add_argument("--baseline", help="file JSON hasil run sebelumnya untuk dibandingkan")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="fraksi perlambatan yang masih diterima")
+    args = parser.parse_args(argv)
+
+    paths = artifact_paths(args.artifacts_dir)
+    bundle = load_bundle(paths)
+    postings = synthetic_postings(args.docs, args.mean_words, args.length_dist, args.sigma, args.seed)
+
+    results = {
+        "params": {name: value for name, value in vars(args).items() if name not in ("output", "baseline")},
+        "environment": environment(),
+        "artifact_version": bundle.version,
+        "load": measure_load(paths, args.repeat),
+        "stages": measure_stages(bundle, postings, args.repeat),
+    }
+
+    print(f"{'tahap':<16}{'p50 ms':>10}{'p95 ms':>10}{'dok/detik':>14}")
+    for name, stage in results["stages"].items():
+        latency = stage["latency_ms"]
+        print(f"{name:<16}{latency['p50']:>10.3f}{latency['p95']:>10.3f}{stage['docs_per_sec'] or 0:>14,.0f}")
+    for name, load in results["load"].items():
+        print(f"muat {name:<20}{load['seconds']:>8.3f} s ({load['bytes'] / 2**20:,.1f} MB)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        changed = [name for name in ("docs", "mean_words", "length_dist", "sigma", "seed")
+                   if baseline.get("params", {}).get(name) != results["params"][name]]
+        if changed or baseline.get("artifact_version") != results["artifact_version"]:
+            print(f"peringatan: parameter/artefak berbeda dari baseline ({', '.join(changed) or 'artefak'})",
+                  file=sys.stderr)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, metric, previous, current in regressions:
+            print(f"REGRESI {name} {metric}: {previous:.4g} -> {current:.4g}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
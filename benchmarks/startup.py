@@ -0,0 +1,106 @@
+"""Benchmark waktu import (cold start) untuk tiap halaman app.py.
+
+Setiap halaman diukur di proses Python baru sehingga hasilnya mendekati
+cold start container: Streamlit ditambah modul yang diimpor oleh cabang
+halaman tersebut. Nilai yang dilaporkan adalah median dari beberapa run.
+
+Contoh:
+    python benchmarks/startup.py --repeat 5 --budget Prediksi=3.5
+
+Exit code 1 jika ada halaman yang melebihi budget (detik).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Harus sinkron dengan import yang dilakukan di masing-masing cabang halaman app.py
+BASE_MODULES = ["streamlit"]
+PAGE_MODULES = {
+    "📌 Tentang": [
+        "dataset_store", "search_index", "pandas", "pyarrow.parquet", "pyarrow.dataset", "charts",
+        "matplotlib.figure", "matplotlib.backends.backend_agg",
+    ],
+    "🔍 Prediksi": [
+        "instrumentation", "model_bundle", "scoring", "feedback", "near_duplicates", "charts", "prediction_cache",
+        "term_counts",
+    ],
+    "☁️ Word Cloud": ["term_counts"],
+}
+DEFAULT_BUDGETS = {
+    "📌 Tentang": 3.0,
+    "🔍 Prediksi": 4.0,
+    "☁️ Word Cloud": 2.0,
+}
+
+_PROBE = r"""
+import importlib, json, sys, time
+timings = {}
+start = time.perf_counter()
+for name in sys.argv[1:]:
+    t = time.perf_counter()
+    importlib.import_module(name)
+    timings[name] = time.perf_counter() - t
+print(json.dumps({"total": time.perf_counter() - start, "modules": timings}))
+"""
+
+
+def measure(modules, repeat=3):
+    """Median waktu import total dan per modul (detik) di proses baru."""
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE, *modules],
+            cwd=REPO_DIR, capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(completed.stdout))
+    return {
+        "total": statistics.median(run["total"] for run in runs),
+        "modules": {name: statistics.median(run["modules"][name] for run in runs) for name in modules},
+    }
+
+
+def parse_budgets(values):
+    budgets = dict(DEFAULT_BUDGETS)
+    for value in values:
+        key, _, seconds = value.partition("=")
+        matches = [page for page in PAGE_MODULES if key.strip() and key.strip() in page]
+        if len(matches) != 1 or not seconds:
+            raise SystemExit(f"budget tidak valid: {value!r} (contoh: Prediksi=3.5)")
+        budgets[matches[0]] = float(seconds)
+    return budgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", action="append", default=[], help="HALAMAN=DETIK, boleh diulang")
+    parser.add_argument("--json", help="simpan hasil ke file JSON")
+    args = parser.parse_args(argv)
+    budgets = parse_budgets(args.budget)
+
+    results = {}
+    failed = []
+    for page, modules in PAGE_MODULES.items():
+        result = measure(BASE_MODULES + modules, args.repeat)
+        result["budget"] = budgets[page]
+        results[page] = result
+        status = "OK" if result["total"] <= budgets[page] else "MELEBIHI BUDGET"
+        if status != "OK":
+            failed.append(page)
+        print(f"{page}: {result['total']:.3f} s (budget {budgets[page]:.1f} s) {status}")
+        for name, seconds in sorted(result["modules"].items(), key=lambda item: -item[1]):
+            print(f"    {name:<20} {seconds:.3f} s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
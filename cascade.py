@@ -0,0 +1,236 @@
+"""Skor dua tahap (cascade) dengan early exit untuk iklan yang jelas.
+
+Setiap prediksi penuh membayar POS tagging ``nltk`` plus dua vectorizer
+unigram+bigram, padahal banyak iklan jelas asli atau jelas palsu. Dengan
+cascade, model linear murah di atas fitur unigram teks saja
+(``CountVectorizer`` + ``LogisticRegression``) menilai semua iklan lebih dulu;
+hanya iklan dengan probabilitas palsu di dalam pita ketidakpastian
+``[low, high]`` yang diteruskan ke POS tagging dan model penuh
+(``scoring.predict(..., cascade=model)``). Hasil diberi ``"stage"``:
+``"first"`` atau ``"full"``.
+
+``python cascade.py fit`` melatih tahap pertama pada split latih dataset,
+lalu pada split holdout melaporkan untuk beberapa pita: persentase early
+exit, akurasi model penuh vs cascade (delta), kesepakatan dengan model penuh
+dan perkiraan percepatan dari waktu yang diukur. Split-nya sama dengan
+``train.py`` (oversampling, ``--test-size`` dan ``--seed`` yang sama), jadi
+holdout hanya berisi baris uji model penuh; salinan oversampling yang juga
+ada di data latih dibuang. Model disimpan sebagai ``cascade_model.pkl`` di
+folder artefak.
+
+Contoh:
+    python cascade.py fit fake_job_postings.csv --band 0.1 0.9
+    python cascade.py evaluate fake_job_postings.csv --bands 0.05:0.95 0.2:0.8
+"""
+import copy
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+from scipy.special import expit
+
+DEFAULT_LOW = 0.1
+DEFAULT_HIGH = 0.9
+DEFAULT_MAX_FEATURES = 50_000
+DEFAULT_BANDS = ((0.02, 0.98), (0.05, 0.95), (0.1, 0.9), (0.2, 0.8), (0.3, 0.7))
+FILENAME = "cascade_model.pkl"
+
+
+class CascadeModel:
+    """Model tahap pertama beserta pita ketidakpastiannya.
+
+    Punya atribut ``model`` dan ``text_feature_names`` seperti ``ModelBundle``
+    sehingga ``scoring.explain`` bisa dipakai untuk hasil early exit.
+    """
+
+    def __init__(self, vectorizer, model, low=DEFAULT_LOW, high=DEFAULT_HIGH):
+        if not 0 <= low <= high <= 1:
+            raise ValueError("pita harus memenuhi 0 <= low <= high <= 1")
+        self.vectorizer = vectorizer
+        self.model = model
+        self.low = low
+        self.high = high
+        self._feature_names = None
+
+    def banded(self, low, high):
+        """Salinan dengan pita lain (model dan vectorizer dipakai bersama)."""
+        if not 0 <= low <= high <= 1:
+            raise ValueError("pita harus memenuhi 0 <= low <= high <= 1")
+        other = copy.copy(self)
+        other.low, other.high = low, high
+        return other
+
+    def first_stage(self, bundle, texts):
+        """(matriks unigram, logit palsu) untuk teks mentah; preprocessing sama dengan model penuh."""
+        from scoring import fraud_parameters
+
+        matrix = self.vectorizer.transform(bundle.preprocess(texts))
+        weights, intercept = fraud_parameters(self.model)
+        return matrix, np.asarray(matrix @ weights).ravel() + intercept
+
+    @property
+    def variant(self):
+        """Penanda mode dan pita untuk kunci cache prediksi."""
+        return f"cascade:{self.low:g}-{self.high:g}"
+
+    def covers(self, threshold):
+        """Apakah ``threshold`` berada di dalam pita; jika tidak, early exit bisa salah label."""
+        return self.low < threshold < self.high
+
+    def uncertain(self, probabilities):
+        """Mask iklan yang harus diteruskan ke model penuh."""
+        return (probabilities >= self.low) & (probabilities <= self.high)
+
+    def text_feature_names(self, columns):
+        if self._feature_names is None:
+            self._feature_names = self.vectorizer.get_feature_names_out()
+        return [str(self._feature_names[column]) for column in columns]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_feature_names"] = None
+        return state
+
+
+def fit_first_stage(texts, labels, C=1.0, max_features=DEFAULT_MAX_FEATURES, max_iter=500):
+    """Latih tahap pertama pada teks yang sudah di-preprocess."""
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.linear_model import LogisticRegression
+
+    vectorizer = CountVectorizer(ngram_range=(1, 1), max_features=max_features)
+    matrix = vectorizer.fit_transform(texts)
+    model = LogisticRegression(C=C, max_iter=max_iter, class_weight="balanced").fit(matrix, labels)
+    return vectorizer, model
+
+
+def band_report(first_probabilities, full_probabilities, labels, low, high, threshold=0.5,
+                first_seconds=None, full_seconds=None):
+    """Metrik cascade untuk satu pita, dari probabilitas kedua tahap pada data holdout."""
+    uncertain = (first_probabilities >= low) & (first_probabilities <= high)
+    full_labels = (full_probabilities > threshold).astype(np.int64)
+    cascade_labels = np.where(uncertain, full_labels, (first_probabilities > threshold).astype(np.int64))
+    full_accuracy = float(np.mean(full_labels == labels))
+    cascade_accuracy = float(np.mean(cascade_labels == labels))
+    report = {
+        "band": [low, high],
+        "early_exit_rate": float(1 - uncertain.mean()),
+        "full_accuracy": full_accuracy,
+        "cascade_accuracy": cascade_accuracy,
+        "accuracy_delta": cascade_accuracy - full_accuracy,
+        "agreement": float(np.mean(cascade_labels == full_labels)),
+    }
+    if first_seconds is not None and full_seconds:
+        # Perkiraan: tahap pertama untuk semua iklan + model penuh hanya untuk yang tidak pasti
+        report["estimated_speedup"] = full_seconds / (first_seconds + full_seconds * float(uncertain.mean()))
+    return report
+
+
+def holdout_split(dataset, test_size, seed):
+    """(teks latih, label latih, teks holdout, label holdout, jumlah duplikat dibuang).
+
+    Baris dan urutan acaknya sama dengan ``train.py`` untuk ``test_size`` dan
+    ``seed`` yang sama, sehingga model penuh tidak pernah melihat holdout.
+    Baris uji yang teksnya juga ada di data latih (salinan oversampling iklan
+    palsu) dibuang agar metrik tidak in-sample.
+    """
+    from sklearn.model_selection import train_test_split
+
+    from train import LABEL_COLUMN, combine_columns, load_dataset
+
+    df = combine_columns(load_dataset(dataset, seed))
+    texts = df["combined_text"].tolist()
+    labels = df[LABEL_COLUMN].to_numpy(dtype=np.int64)
+    # train.py memecah matriks fitur dengan cara yang sama; indeks baris cukup untuk mereproduksinya
+    train_rows, test_rows = train_test_split(np.arange(len(texts)), test_size=test_size, random_state=seed)
+    train_texts = [texts[i] for i in train_rows]
+    seen = set(train_texts)
+    held_out = [i for i in test_rows if texts[i] not in seen]
+    return (train_texts, labels[train_rows], [texts[i] for i in held_out], labels[held_out],
+            len(test_rows) - len(held_out))
+
+
+def evaluate(bundle, cascade, texts, labels, bands=DEFAULT_BANDS, threshold=0.5, pos_pool=None):
+    """Laporan per pita; kedua tahap dijalankan sekali pada semua ``texts`` dan waktunya diukur."""
+    from scoring import featurize, score_matrix
+
+    start = time.perf_counter()
+    _, logits = cascade.first_stage(bundle, texts)
+    first_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    full = score_matrix(bundle.model, featurize(bundle, texts, pos_pool)[1], threshold)
+    full_seconds = time.perf_counter() - start
+    first_probabilities = expit(logits)
+    return [
+        band_report(first_probabilities, full.probabilities, labels, low, high, threshold, first_seconds,
+                    full_seconds)
+        for low, high in bands
+    ]
+
+
+def save(cascade, directory):
+    path = os.path.join(directory, FILENAME)
+    joblib.dump(cascade, path + ".tmp")
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def _band(value):
+    low, high = (float(part) for part in value.split(":"))
+    return low, high
+
+
+def main(argv=None):
+    import argparse
+
+    from batch import pos_pool_for
+    from model_bundle import artifact_paths, get_bundle
+
+    parser = argparse.ArgumentParser(description="Latih/evaluasi model cascade tahap pertama.")
+    parser.add_argument("command", choices=["fit", "evaluate"])
+    parser.add_argument("dataset", help="CSV berlabel (skema fake_job_postings.csv)")
+    parser.add_argument("--artifacts-dir", default=None)
+    parser.add_argument("--band", nargs=2, type=float, default=(DEFAULT_LOW, DEFAULT_HIGH), metavar=("LOW", "HIGH"),
+                        help="pita ketidakpastian yang disimpan bersama model (fit)")
+    parser.add_argument("--bands", nargs="+", type=_band, default=DEFAULT_BANDS, metavar="LOW:HIGH",
+                        help="pita yang dilaporkan")
+    parser.add_argument("--test-size", type=float, default=0.2, help="harus sama dengan train.py --test-size")
+    parser.add_argument("--seed", type=int, default=42, help="harus sama dengan train.py --seed")
+    parser.add_argument("--C", type=float, default=1.0)
+    parser.add_argument("--max-features", type=int, default=DEFAULT_MAX_FEATURES)
+    parser.add_argument("--workers", type=int, default=1, help="jumlah proses untuk POS tagging")
+    args = parser.parse_args(argv)
+
+    paths = artifact_paths(args.artifacts_dir)
+    bundle = get_bundle(paths)
+    train_texts, train_labels, test_texts, test_labels, dropped = holdout_split(args.dataset, args.test_size,
+                                                                                args.seed)
+    if args.command == "fit":
+        vectorizer, model = fit_first_stage(bundle.preprocess(train_texts), train_labels, args.C, args.max_features)
+        cascade = CascadeModel(vectorizer, model, *args.band)
+    elif bundle.cascade is None:
+        print(f"{FILENAME} tidak ada; jalankan 'python cascade.py fit' dulu", file=sys.stderr)
+        return 1
+    else:
+        cascade = bundle.cascade
+
+    with pos_pool_for(args.workers) as pos_pool:
+        reports = evaluate(bundle, cascade, test_texts, test_labels, args.bands, pos_pool=pos_pool)
+    print(f"holdout (split uji train.py): {len(test_labels):,} iklan, "
+          f"{dropped:,} salinan data latih dibuang")
+    print(f"{'pita':<13}{'early exit':>12}{'akurasi penuh':>15}{'cascade':>10}{'delta':>9}{'sepakat':>9}{'speedup':>9}")
+    for report in reports:
+        low, high = report["band"]
+        print(f"{low:.2f}-{high:.2f}{report['early_exit_rate']:>15.1%}{report['full_accuracy']:>15.4f}"
+              f"{report['cascade_accuracy']:>10.4f}{report['accuracy_delta']:>+9.4f}{report['agreement']:>9.1%}"
+              f"{report.get('estimated_speedup', 0):>8.1f}x")
+
+    if args.command == "fit":
+        path = save(cascade, os.path.dirname(paths["model"]))
+        print(f"pita {cascade.low}-{cascade.high} disimpan ke {path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Grafik ringan untuk halaman "🔍 Prediksi" dan "📌 Tentang".
+
+Sebelumnya setiap prediksi membuat figure matplotlib + seaborn baru untuk
+dua batang probabilitas, dan halaman Tentang menggambar ulang pie chart
+distribusi pada setiap rerun. Figure dari ``plt.subplots`` tidak pernah
+ditutup sehingga tetap terdaftar di pyplot dan memori proses naik terus
+antar sesi. Di sini:
+
+- batang probabilitas dibuat sebagai SVG inline (``probability_bars``),
+  tanpa mengimpor matplotlib;
+- pie chart distribusi dirender ke PNG sekali per (versi data, tema) dan
+  disimpan di ``RenderCache`` (lihat ``term_counts.py``);
+- figure dibuat langsung dengan ``matplotlib.figure.Figure`` (tidak masuk
+  registry pyplot) dan dibersihkan segera setelah PNG ditulis.
+
+Waktu render per rerun dan pertumbuhan memori cara lama vs cara baru diukur
+dengan ``benchmarks/charts.py``.
+"""
+import io
+
+from term_counts import RenderCache
+
+REAL_COLOR = "#0D47A1"  # Biru dongker
+FAKE_COLOR = "#B71C1C"  # Merah gelap
+BAR_WIDTH = 480
+BAR_LABEL_WIDTH = 60
+BAR_ROW_HEIGHT = 36
+
+chart_cache = RenderCache()
+
+
+def text_color(theme):
+    return "white" if theme == "dark" else "black"
+
+
+def probability_bars(probability, theme=None, width=BAR_WIDTH):
+    """SVG dua batang horizontal (Palsu, Asli) untuk ``st.markdown(..., unsafe_allow_html=True)``."""
+    color = text_color(theme)
+    track = width - BAR_LABEL_WIDTH - 70
+    rows = []
+    bars = (("Palsu", probability, FAKE_COLOR), ("Asli", 1 - probability, REAL_COLOR))
+    for i, (label, value, fill) in enumerate(bars):
+        y = i * BAR_ROW_HEIGHT
+        bar = track * min(max(value, 0.0), 1.0)
+        rows.append(
+            f'<text x="0" y="{y + 22}" fill="{color}" font-weight="bold">{label}</text>'
+            f'<rect x="{BAR_LABEL_WIDTH}" y="{y + 6}" width="{track}" height="24" fill="{color}" '
+            f'fill-opacity="0.08" rx="3"/>'
+            f'<rect x="{BAR_LABEL_WIDTH}" y="{y + 6}" width="{bar:.1f}" height="24" fill="{fill}" rx="3"/>'
+            f'<text x="{BAR_LABEL_WIDTH + track + 8}" y="{y + 22}" fill="{color}">{value:.1%}</text>'
+        )
+    height = 2 * BAR_ROW_HEIGHT
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" role="img" '
+        f'aria-label="Probabilitas palsu {probability:.1%}" font-family="sans-serif" font-size="14">'
+        + "".join(rows) + "</svg>"
+    )
+
+
+def render_pie(sizes, labels, colors, theme=None, size=6, dpi=100):
+    """Pie chart dengan label dan persentase di tengah potongan, sebagai PNG transparan."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(size, size), dpi=dpi)
+    FigureCanvasAgg(fig)
+    try:
+        fig.patch.set_alpha(0)
+        ax = fig.subplots()
+        ax.set_facecolor("none")
+        total = sum(sizes)
+
+        def autopct(pct):
+            return f"{pct:.1f}%\n({int(round(pct / 100. * total)):,})"
+
+        _, _, autotexts = ax.pie(
+            sizes,
+            labels=None,
+            autopct=autopct,
+            startangle=90,
+            colors=colors,
+            wedgeprops={"edgecolor": "white", "linewidth": 2},
+        )
+        # Label manual di tengah potongan
+        for label, autotext in zip(labels, autotexts):
+            autotext.set_text(f"{label}\n{autotext.get_text()}")
+            autotext.set_color(text_color(theme))
+            autotext.set_fontsize(14)
+            autotext.set_fontweight("bold")
+            autotext.set_ha("center")
+            autotext.set_va("center")
+        ax.axis("equal")
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png")
+        return buffer.getvalue()
+    finally:
+        # Lepas artist dan buffer Agg sekarang, tidak menunggu garbage collector
+        fig.clear()
+
+
+def distribution_pie(real, fake, theme=None, version=None, cache=chart_cache):
+    """PNG distribusi iklan asli vs palsu; dirender ulang hanya jika ``version`` atau tema berubah."""
+    return cache.get(
+        ("distribution", theme), version,
+        lambda: render_pie([real, fake], ["Asli", "Palsu"], [REAL_COLOR, FAKE_COLOR], theme),
+    )
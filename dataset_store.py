@@ -0,0 +1,138 @@
+"""Penyimpanan kolumnar ``fake_job_postings.csv`` untuk halaman "📌 Tentang".
+
+``pd.read_csv`` atas seluruh dataset (termasuk kolom teks panjang) pada
+setiap rerun membuat halaman lambat. ``convert`` mengubah CSV sekali menjadi
+Parquet, dengan kolom berkardinalitas rendah sebagai ``category`` dan flag
+numerik sebagai ``int8``, lalu menyimpan statistik agregat (total, asli,
+palsu) di ``stats.json``. Halaman hanya membaca kolom yang dibutuhkan dan
+hasilnya di-cache di proses sampai file store berubah.
+"""
+import functools
+import json
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_CSV = os.path.join(BASE_DIR, "fake_job_postings.csv")
+STORE_DIR = os.path.join(BASE_DIR, "dataset")
+POSTINGS_FILE = "postings.parquet"
+STATS_FILE = "stats.json"
+ROW_GROUP_SIZE = 4096
+
+CATEGORICAL_COLUMNS = [
+    "location", "department", "salary_range", "employment_type", "required_experience",
+    "required_education", "industry", "function",
+]
+FLAG_COLUMNS = ["telecommuting", "has_company_logo", "has_questions", "fraudulent"]
+
+
+def convert(csv_path=DATASET_CSV, store_dir=STORE_DIR):
+    """Konversi CSV ke Parquet + ``stats.json``; kembalikan statistiknya."""
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    for column in CATEGORICAL_COLUMNS:
+        if column in df:
+            df[column] = df[column].astype("category")
+    for column in FLAG_COLUMNS:
+        if column in df:
+            df[column] = df[column].fillna(0).astype("int8")
+
+    counts = df["fraudulent"].value_counts()
+    stats = {
+        "total": int(len(df)),
+        "real": int(counts.get(0, 0)),
+        "fake": int(counts.get(1, 0)),
+        "columns": list(df.columns),
+        "source_mtime_ns": os.stat(csv_path).st_mtime_ns,
+    }
+
+    os.makedirs(store_dir, exist_ok=True)
+    postings_path = os.path.join(store_dir, POSTINGS_FILE)
+    df.to_parquet(postings_path + ".tmp", index=False, row_group_size=ROW_GROUP_SIZE)
+    os.replace(postings_path + ".tmp", postings_path)
+    with open(os.path.join(store_dir, STATS_FILE + ".tmp"), "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2)
+    os.replace(os.path.join(store_dir, STATS_FILE + ".tmp"), os.path.join(store_dir, STATS_FILE))
+    return stats
+
+
+def ensure_store(csv_path=DATASET_CSV, store_dir=STORE_DIR):
+    """Buat store jika belum ada atau jika CSV sumber lebih baru."""
+    stats_path = os.path.join(store_dir, STATS_FILE)
+    if os.path.exists(stats_path):
+        if not os.path.exists(csv_path):
+            return store_dir
+        with open(stats_path, encoding="utf-8") as f:
+            if json.load(f).get("source_mtime_ns") == os.stat(csv_path).st_mtime_ns:
+                return store_dir
+    convert(csv_path, store_dir)
+    return store_dir
+
+
+def _version(store_dir):
+    # Dipakai sebagai bagian kunci cache agar store baru otomatis dibaca ulang
+    return os.stat(os.path.join(store_dir, STATS_FILE)).st_mtime_ns
+
+
+def version(store_dir=STORE_DIR):
+    """Versi store saat ini; berubah setiap kali store dikonversi ulang."""
+    return _version(store_dir)
+
+
+def load_stats(store_dir=STORE_DIR):
+    return _load_stats(store_dir, _version(store_dir))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_stats(store_dir, version):
+    with open(os.path.join(store_dir, STATS_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_columns(columns, store_dir=STORE_DIR):
+    """DataFrame berisi hanya ``columns`` (di-cache per proses; jangan dimodifikasi)."""
+    return _load_columns(tuple(columns), store_dir, _version(store_dir))
+
+
+@functools.lru_cache(maxsize=16)
+def _load_columns(columns, store_dir, version):
+    import pandas as pd
+    return pd.read_parquet(os.path.join(store_dir, POSTINGS_FILE), columns=list(columns))
+
+
+def head(n=15, store_dir=STORE_DIR):
+    """``n`` baris pertama; hanya row group pertama yang dibaca."""
+    return _head(n, store_dir, _version(store_dir))
+
+
+@functools.lru_cache(maxsize=4)
+def _head(n, store_dir, version):
+    import pyarrow.parquet as pq
+
+    table = pq.ParquetFile(os.path.join(store_dir, POSTINGS_FILE)).read_row_group(0)
+    return table.slice(0, n).to_pandas()
+
+
+def take(indices, store_dir=STORE_DIR, columns=None):
+    """Baris pada posisi ``indices`` tanpa memuat seluruh tabel."""
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(os.path.join(store_dir, POSTINGS_FILE), format="parquet")
+    return dataset.take(list(indices), columns=columns).to_pandas()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Konversi fake_job_postings.csv ke store kolumnar.")
+    parser.add_argument("csv", nargs="?", default=DATASET_CSV)
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    args = parser.parse_args(argv)
+    stats = convert(args.csv, args.store_dir)
+    print(f"{stats['total']:,} baris ({stats['fake']:,} palsu) disimpan di {args.store_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+"""Feedback moderator dan pembaruan model inkremental tanpa melatih ulang.
+
+Moderator mengonfirmasi atau membalik verdict di halaman "🔍 Prediksi";
+setiap keputusan disimpan di ``FeedbackStore`` (sqlite3) beserta teks,
+verdict model dan versi artefak saat itu.
+
+``update`` mengambil feedback yang belum dipakai, membuat fiturnya dengan
+bundle yang sedang aktif (ruang fitur tetap, vectorizer tidak berubah),
+lalu menjalankan beberapa epoch gradient descent mini-batch pada bobot
+logistik. Penalti L2 menarik bobot ke bobot sebelumnya sehingga beberapa
+feedback tidak menghapus apa yang dipelajari dari dataset. Hasilnya:
+
+- disimpan sebagai versi di ``model_versions/<versi>.pkl`` (versi = hash
+  bobot) dan dicatat di ``model_versions/versions.jsonl`` beserta versi
+  induk dan metrik pada batch feedback sebelum/sesudah;
+- dipasang dengan ``os.replace`` ke ``logistic_model.pkl`` (selalu model
+  sklearn, juga jika bundle aktif memakai ``artifacts.mmap``), lalu sebagai
+  versi baru ``artifacts.mmap`` jika folder itu ada (``CURRENT`` diganti
+  atomik). ``model_bundle.get_bundle`` mendeteksi perubahan artefak,
+  sehingga aplikasi, ``server.py`` dan ``stream.py`` memakai model baru pada
+  permintaan berikutnya tanpa restart.
+
+Satu pembaruan (baca feedback tertunda, fit, pasang, tandai terpakai)
+memegang kunci ``<store>.lock``, jadi tombol di aplikasi dan ``watch`` tidak
+pernah menerapkan feedback yang sama dua kali.
+
+Jika indeks iklan hampir-duplikat (``near_duplicates.py``) diberikan,
+klaster yang cocok dengan teks feedback diberi label moderator, dan klaster
+hasil prediksi versi model lama dihapus.
+
+Versi lama bisa dipasang kembali dengan ``rollback``.
+
+Contoh:
+    python feedback.py stats
+    python feedback.py update --min-feedback 20
+    python feedback.py watch --interval 60
+    python feedback.py rollback 3f9a1c2b7d10
+"""
+import contextlib
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import joblib
+import numpy as np
+from scipy.special import expit
+
+from model_bundle import artifact_paths, get_bundle
+from near_duplicates import DEFAULT_PATH as DEFAULT_DEDUP_PATH, DuplicateIndex
+from scoring import featurize, fraud_parameters
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(BASE_DIR, "feedback.sqlite3")
+VERSIONS_DIR = "model_versions"
+VERSIONS_LOG = "versions.jsonl"
+DEFAULT_LEARNING_RATE = 0.05
+DEFAULT_EPOCHS = 5
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_L2 = 0.01
+LOCK_TIMEOUT = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    text TEXT NOT NULL,
+    predicted INTEGER NOT NULL,
+    probability REAL,
+    label INTEGER NOT NULL,
+    model_version TEXT,
+    applied_version TEXT
+);
+CREATE INDEX IF NOT EXISTS feedback_pending ON feedback (applied_version);
+"""
+
+
+class FeedbackStore:
+    """Verdict moderator yang disimpan di sqlite3."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+        connection.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @contextlib.contextmanager
+    def update_lock(self, timeout=LOCK_TIMEOUT):
+        """Kunci antarproses untuk satu pembaruan model.
+
+        Memakai transaksi ``BEGIN IMMEDIATE`` pada file sqlite terpisah agar
+        ``add`` dari aplikasi tidak ikut tertahan selama model di-fit.
+        """
+        connection = sqlite3.connect(self.path + ".lock", timeout=timeout, isolation_level=None)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            finally:
+                connection.execute("ROLLBACK")
+        finally:
+            connection.close()
+
+    def add(self, text, predicted, label, probability=None, model_version=None):
+        """Catat verdict moderator (``label``) untuk teks yang diprediksi ``predicted``."""
+        with self._connect() as connection:
+            feedback_id = connection.execute(
+                "INSERT INTO feedback (created_at, text, predicted, probability, label, model_version) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (time.time(), text, int(predicted), probability, int(label), model_version),
+            ).lastrowid
+        connection.close()
+        return feedback_id
+
+    def pending(self, limit=None):
+        """(id, teks, label) feedback yang belum dipakai untuk pembaruan, yang terlama dulu."""
+        query = "SELECT id, text, label FROM feedback WHERE applied_version IS NULL ORDER BY id"
+        with self._connect() as connection:
+            rows = connection.execute(query + (" LIMIT ?" if limit else ""), (limit,) if limit else ()).fetchall()
+        connection.close()
+        return rows
+
+    def mark_applied(self, ids, version):
+        with self._connect() as connection:
+            connection.executemany(
+                "UPDATE feedback SET applied_version = ? WHERE id = ?", [(version, i) for i in ids]
+            )
+        connection.close()
+
+    def stats(self):
+        with self._connect() as connection:
+            total, pending, overturned = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(applied_version IS NULL), 0), "
+                "COALESCE(SUM(label != predicted), 0) FROM feedback"
+            ).fetchone()
+        connection.close()
+        return {"total": total, "pending": pending, "overturned": overturned, "confirmed": total - overturned}
+
+
+_stores = {}
+
+
+def get_store(path=DEFAULT_PATH):
+    store = _stores.get(path)
+    if store is None:
+        store = _stores.setdefault(path, FeedbackStore(path))
+    return store
+
+
+def batch_metrics(matrix, labels, weights, intercept):
+    """Log loss dan akurasi bobot ``weights`` (arah kelas palsu) pada batch feedback."""
+    probabilities = np.clip(expit(matrix @ weights + intercept), 1e-12, 1 - 1e-12)
+    log_loss = -np.mean(labels * np.log(probabilities) + (1 - labels) * np.log(1 - probabilities))
+    accuracy = np.mean((probabilities > 0.5) == (labels == 1))
+    return {"log_loss": float(log_loss), "accuracy": float(accuracy)}
+
+
+def sgd_update(matrix, labels, weights, intercept, learning_rate=DEFAULT_LEARNING_RATE, epochs=DEFAULT_EPOCHS,
+               batch_size=DEFAULT_BATCH_SIZE, l2=DEFAULT_L2, seed=0):
+    """Gradient descent mini-batch untuk log loss, dengan penalti L2 ke bobot awal."""
+    anchor = np.asarray(weights, dtype=np.float64)
+    weights = anchor.copy()
+    rng = np.random.default_rng(seed)
+    for _ in range(epochs):
+        order = rng.permutation(len(labels))
+        for start in range(0, len(order), batch_size):
+            rows = order[start:start + batch_size]
+            errors = expit(matrix[rows] @ weights + intercept) - labels[rows]
+            weights -= learning_rate * (matrix[rows].T @ errors / len(rows) + l2 * (weights - anchor))
+            intercept -= learning_rate * float(errors.mean())
+    return weights, intercept
+
+
+def weights_version(coef, intercept):
+    digest = hashlib.sha256(np.ascontiguousarray(coef, dtype=np.float64).tobytes())
+    digest.update(np.asarray(intercept, dtype=np.float64).tobytes())
+    return digest.hexdigest()[:12]
+
+
+def as_sklearn(model, paths):
+    """``model`` sebagai LogisticRegression sklearn yang bisa di-pickle.
+
+    ``MappedLogisticModel`` (bundle dari ``artifacts.mmap``) hanya membungkus
+    array memory-mapped; bobotnya disalin ke ``logistic_model.pkl`` yang ada,
+    atau ke LogisticRegression baru jika pickle itu tidak ada.
+    """
+    if hasattr(model, "get_params"):
+        return model
+    if os.path.exists(paths["model"]):
+        base = copy.copy(joblib.load(paths["model"]))
+    else:
+        from sklearn.linear_model import LogisticRegression
+        base = LogisticRegression()
+    base.coef_ = np.array(model.coef_, dtype=np.float64)
+    base.intercept_ = np.array(model.intercept_, dtype=np.float64)
+    base.classes_ = np.array(model.classes_)
+    base.n_features_in_ = base.coef_.shape[1]
+    return base
+
+
+def with_weights(model, weights, intercept):
+    """Salinan ``model`` dengan bobot arah kelas palsu yang baru (mengikuti urutan ``classes_``)."""
+    sign = 1 if model.classes_[1] == 1 else -1
+    updated = copy.copy(model)
+    updated.coef_ = (sign * weights).reshape(1, -1)
+    updated.intercept_ = np.array([sign * intercept])
+    return updated
+
+
+def versions_dir(paths):
+    return os.path.join(os.path.dirname(paths["model"]), VERSIONS_DIR)
+
+
+def list_versions(paths):
+    path = os.path.join(versions_dir(paths), VERSIONS_LOG)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _write_atomic(obj, path):
+    joblib.dump(obj, path + ".tmp")
+    os.replace(path + ".tmp", path)
+
+
+def install(model, paths):
+    """Pasang ``model`` (sklearn) sebagai artefak aktif; setiap artefak diganti secara atomik."""
+    # Pickle dulu: selama artifacts.mmap belum diganti, loader tetap memakai versi mmap lama yang utuh
+    _write_atomic(model, paths["model"])
+    mapped = paths.get("mapped")
+    if mapped and os.path.exists(mapped):
+        from mapped_artifacts import replace_weights
+        replace_weights(np.asarray(model.coef_), np.asarray(model.intercept_), os.path.dirname(mapped))
+
+
+def archive(model, paths, version, entry):
+    directory = versions_dir(paths)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{version}.pkl")
+    if not os.path.exists(path):
+        _write_atomic(model, path)
+    with open(os.path.join(directory, VERSIONS_LOG), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"version": version, "created_at": time.time(), **entry}) + "\n")
+
+
+def update(store, paths=None, min_feedback=1, limit=None, learning_rate=DEFAULT_LEARNING_RATE,
+           epochs=DEFAULT_EPOCHS, batch_size=DEFAULT_BATCH_SIZE, l2=DEFAULT_L2, duplicates=None):
+    """Terapkan feedback yang tertunda ke model aktif; kembalikan ringkasan, atau None jika belum cukup."""
+    paths = paths or artifact_paths()
+    with store.update_lock():
+        return _update(store, paths, min_feedback, limit, learning_rate, epochs, batch_size, l2, duplicates)
+
+
+def _update(store, paths, min_feedback, limit, learning_rate, epochs, batch_size, l2, duplicates):
+    rows = store.pending(limit)
+    if len(rows) < max(min_feedback, 1):
+        return None
+    start = time.perf_counter()
+    bundle = get_bundle(paths)
+    model = as_sklearn(bundle.model, paths)
+    weights, intercept = fraud_parameters(model)
+    parent = weights_version(model.coef_, model.intercept_)
+    if not list_versions(paths):
+        # Versi awal diarsipkan dulu agar bisa di-rollback
+        archive(model, paths, parent, {"parent": None, "feedback": 0})
+
+    _, matrix = featurize(bundle, [text for _, text, _ in rows])
+    labels = np.array([label for _, _, label in rows], dtype=np.float64)
+    before = batch_metrics(matrix, labels, weights, intercept)
+    new_weights, new_intercept = sgd_update(matrix, labels, weights, float(intercept), learning_rate, epochs,
+                                            batch_size, l2)
+    after = batch_metrics(matrix, labels, new_weights, new_intercept)
+
+    updated = with_weights(model, new_weights, new_intercept)
+    version = weights_version(updated.coef_, updated.intercept_)
+    archive(updated, paths, version, {"parent": parent, "feedback": len(rows), "before": before, "after": after})
+    install(updated, paths)
+    store.mark_applied([feedback_id for feedback_id, _, _ in rows], version)
+    summary = {"version": version, "parent": parent, "feedback": len(rows), "before": before, "after": after}
+    if duplicates is not None:
+        # Verdict moderator menggantikan verdict klaster; klaster dari model lama tidak berlaku lagi
+        summary["clusters_relabeled"] = duplicates.relabel([text for _, text, _ in rows], labels.astype(int))
+        summary["clusters_pruned"] = duplicates.prune(get_bundle(paths).version)
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def rollback(version, paths=None):
+    """Pasang kembali versi yang diarsipkan."""
+    paths = paths or artifact_paths()
+    path = os.path.join(versions_dir(paths), f"{version}.pkl")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"versi {version} tidak ada di {versions_dir(paths)}")
+    # Arsip lama bisa berisi MappedLogisticModel
+    install(as_sklearn(joblib.load(path), paths), paths)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Feedback moderator dan pembaruan model inkremental.")
+    parser.add_argument("--store", default=DEFAULT_PATH, help="file sqlite3 feedback")
+    parser.add_argument("--artifacts-dir", default=None)
+    parser.add_argument("--dedup", default=DEFAULT_DEDUP_PATH, metavar="PATH",
+                        help="indeks iklan hampir-duplikat yang ikut diperbarui (diabaikan jika belum ada)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="jumlah feedback (total, tertunda, dibalik)")
+    subparsers.add_parser("versions", help="riwayat versi model")
+    for name, help_text in (("update", "terapkan feedback tertunda sekali"),
+                            ("watch", "terapkan feedback tertunda secara berkala")):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument("--min-feedback", type=int, default=1, help="jumlah minimum feedback tertunda")
+        command.add_argument("--limit", type=int, default=None, help="maksimum feedback per pembaruan")
+        command.add_argument("--learning-rate", type=float, default=DEFAULT_LEARNING_RATE)
+        command.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS)
+        command.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        command.add_argument("--l2", type=float, default=DEFAULT_L2, help="penalti ke bobot sebelumnya")
+        if name == "watch":
+            command.add_argument("--interval", type=float, default=60.0, help="detik antar pemeriksaan")
+    rollback_parser = subparsers.add_parser("rollback", help="pasang kembali versi lama")
+    rollback_parser.add_argument("version")
+    args = parser.parse_args(argv)
+
+    paths = artifact_paths(args.artifacts_dir)
+    store = FeedbackStore(args.store)
+    duplicates = DuplicateIndex(args.dedup) if os.path.exists(args.dedup) else None
+    if args.command == "stats":
+        print(json.dumps(store.stats(), indent=2))
+    elif args.command == "versions":
+        for entry in list_versions(paths):
+            print(json.dumps(entry))
+    elif args.command == "rollback":
+        try:
+            rollback(args.version, paths)
+        except FileNotFoundError as e:
+            print(e, file=sys.stderr)
+            return 1
+        print(f"versi {args.version} dipasang")
+    else:
+        while True:
+            result = update(store, paths, args.min_feedback, args.limit, args.learning_rate, args.epochs,
+                            args.batch_size, args.l2, duplicates)
+            if result is not None:
+                print(json.dumps(result), flush=True)
+            elif args.command == "update":
+                print(f"feedback tertunda kurang dari {args.min_feedback}", file=sys.stderr)
+            if args.command == "update":
+                break
+            time.sleep(args.interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""Timer dan counter per tahap untuk jalur prediksi.
+
+Dipakai oleh ``scoring.py``, ``pos_tagging.py`` dan ``app.py``::
+
+    with stage("vectorize_text", n=len(texts)):
+        ...
+
+Secara default instrumentasi mati dan ``stage`` mengembalikan context
+kosong yang sama setiap kali, sehingga biayanya hanya satu pemanggilan
+fungsi. Aktifkan lewat environment variable atau ``configure``:
+
+- ``FAKE_JOB_METRICS=1``     : catat durasi (histogram) dan jumlah dokumen per tahap;
+- ``FAKE_JOB_METRICS_LOG=1`` : tulis satu baris log JSON per tahap ke stderr (logger ``fake_job.metrics``);
+- ``FAKE_JOB_PROFILE=5``     : jalankan profiler sampling dengan interval 5 ms.
+
+Hasilnya diekspor sebagai teks Prometheus (``prometheus_text``), ringkasan
+dict (``snapshot``) atau collapsed stack untuk flame graph
+(``SamplingProfiler.collapsed``). Timer berlaku per proses: tahap yang
+berjalan di worker ``PosTaggingPool`` tidak ikut tercatat di proses utama.
+"""
+import bisect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "fake_job"
+
+logger = logging.getLogger("fake_job.metrics")
+_log_handler = None
+
+
+class _Stage:
+    __slots__ = ("count", "items", "seconds", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.items = 0
+        self.seconds = 0.0
+        # Jumlah per bucket (non-kumulatif); indeks terakhir untuk +Inf
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = Counter()
+
+    def observe(self, name, seconds, items=1):
+        with self._lock:
+            entry = self._stages.get(name)
+            if entry is None:
+                entry = self._stages[name] = _Stage()
+            entry.count += 1
+            entry.items += items
+            entry.seconds += seconds
+            entry.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self._counters[name] += value
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        with self._lock:
+            stages = {
+                name: {
+                    "count": entry.count,
+                    "items": entry.items,
+                    "seconds": entry.seconds,
+                    "mean_ms": entry.seconds / entry.count * 1000 if entry.count else 0.0,
+                }
+                for name, entry in self._stages.items()
+            }
+            return {"stages": stages, "counters": dict(self._counters)}
+
+    def prometheus_text(self):
+        with self._lock:
+            stages = {name: (entry.count, entry.items, entry.seconds, list(entry.buckets))
+                      for name, entry in sorted(self._stages.items())}
+            counters = sorted(self._counters.items())
+
+        lines = [
+            f"# HELP {PREFIX}_stage_seconds Durasi setiap tahap prediksi.",
+            f"# TYPE {PREFIX}_stage_seconds histogram",
+        ]
+        for name, (count, _, seconds, buckets) in stages.items():
+            cumulative = 0
+            for bound, value in zip(BUCKETS + ("+Inf",), buckets):
+                cumulative += value
+                lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{name}"}} {seconds:.9f}')
+            lines.append(f'{PREFIX}_stage_seconds_count{{stage="{name}"}} {count}')
+        lines += [
+            f"# HELP {PREFIX}_stage_items_total Dokumen yang diproses setiap tahap.",
+            f"# TYPE {PREFIX}_stage_items_total counter",
+        ]
+        lines += [f'{PREFIX}_stage_items_total{{stage="{name}"}} {items}'
+                  for name, (_, items, _, _) in stages.items()]
+        lines += [f"# HELP {PREFIX}_events_total Counter kejadian.", f"# TYPE {PREFIX}_events_total counter"]
+        lines += [f'{PREFIX}_events_total{{name="{name}"}} {value}' for name, value in counters]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+_enabled = False
+_log = False
+_profiler = None
+
+
+class _Timer:
+    __slots__ = ("name", "items", "start")
+
+    def __init__(self, name, items):
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        seconds = time.perf_counter() - self.start
+        registry.observe(self.name, seconds, self.items)
+        if _log:
+            logger.info(json.dumps({"event": "stage", "stage": self.name, "seconds": round(seconds, 6),
+                                    "items": self.items, "ok": exc[0] is None}))
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullTimer()
+
+
+def stage(name, n=1):
+    """Context manager yang mencatat durasi tahap ``name`` untuk ``n`` dokumen."""
+    if not _enabled:
+        return _NULL
+    return _Timer(name, n)
+
+
+def count(name, value=1):
+    if _enabled:
+        registry.increment(name, value)
+
+
+def enabled():
+    return _enabled
+
+
+def snapshot():
+    return registry.snapshot()
+
+
+def prometheus_text():
+    return registry.prometheus_text()
+
+
+class SamplingProfiler:
+    """Profiler sampling berbasis thread: mencatat stack thread lain setiap ``interval`` detik."""
+
+    def __init__(self, interval=0.005, max_depth=64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self):
+        """Format collapsed stack (``flamegraph.pl``/speedscope): satu baris per stack."""
+        return "\n".join(f"{stack} {samples}" for stack, samples in self.samples.most_common())
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def profiler():
+    """Profiler yang dijalankan oleh ``configure(profile=...)``, atau None."""
+    return _profiler
+
+
+def configure(enabled=None, log=None, profile=None):
+    """Atur instrumentasi; argumen None memakai environment variable.
+
+    ``profile`` adalah interval sampling dalam milidetik (0 = mati).
+    """
+    global _enabled, _log, _profiler, _log_handler
+    if enabled is None:
+        enabled = os.environ.get("FAKE_JOB_METRICS", "") not in ("", "0")
+    if log is None:
+        log = os.environ.get("FAKE_JOB_METRICS_LOG", "") not in ("", "0")
+    if profile is None:
+        profile = float(os.environ.get("FAKE_JOB_PROFILE", "0") or 0)
+    _log = bool(log)
+    _enabled = bool(enabled) or _log
+    # Tanpa handler dan level, logger.info jatuh ke level WARNING bawaan dan dibuang
+    if _log and _log_handler is None and not logger.handlers:
+        _log_handler = logging.StreamHandler(sys.stderr)
+        _log_handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(_log_handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    elif not _log and _log_handler is not None:
+        logger.removeHandler(_log_handler)
+        _log_handler = None
+        logger.setLevel(logging.NOTSET)
+        logger.propagate = True
+    if profile and _profiler is None:
+        _profiler = SamplingProfiler(profile / 1000).start()
+    elif not profile and _profiler is not None:
+        _profiler.stop()
+        _profiler = None
+
+
+configure()
@@ -0,0 +1,235 @@
+"""Format artefak memory-mapped untuk model dan kedua vectorizer.
+
+``logistic_model.pkl`` dan ``countvectorizer_*.pkl`` adalah pickle generik:
+setiap proses men-deserialisasi seluruh isinya ke heap sendiri. ``export``
+menulis isi yang sama ke folder ``artifacts.mmap/`` sebagai array numpy
+(``.npy``, header numpy membuat data selaras 64 byte). Setiap ekspor adalah
+versi baru ``artifacts.mmap/<versi>/`` yang dipasang dengan mengganti
+``artifacts.mmap/CURRENT`` (lihat ``versioned_dir.py``), sehingga pembaca
+tidak pernah melihat folder kosong, setengah jadi atau campuran. Isi
+setiap versi:
+
+- ``coef.npy``, ``intercept.npy``, ``classes.npy`` : bobot LogisticRegression;
+- ``vocab_text/``, ``vocab_pos/`` : vocabulary ringkas (lihat ``vocabulary.py``);
+- ``manifest.json`` : versi format, checksum SHA-256 dan ukuran setiap file.
+
+``load`` membuka semua array dengan ``mmap_mode='r'`` sehingga beberapa
+proses aplikasi/worker berbagi satu salinan fisik lewat page cache, dan
+waktu muat hampir nol. ``model_bundle.load_bundle`` memakai folder ini jika
+ada. Checksum selalu dicek saat ekspor; saat muat, versi format dan ukuran
+file dicek, dan checksum penuh dengan ``verify=True`` atau
+``python mapped_artifacts.py verify``.
+
+Contoh:
+    python mapped_artifacts.py export
+    python mapped_artifacts.py verify artifacts.mmap
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+import numpy as np
+from scipy.special import expit
+
+import versioned_dir
+from vocabulary import CompactCountVectorizer, write_vocabulary
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIR = os.path.join(BASE_DIR, "artifacts.mmap")
+MANIFEST = "manifest.json"
+FORMAT = "fake-job-mmap"
+FORMAT_VERSION = 1
+
+
+class IntegrityError(ValueError):
+    pass
+
+
+class MappedLogisticModel:
+    """Pengganti LogisticRegression biner untuk inferensi, di atas array memory-mapped."""
+
+    def __init__(self, coef, intercept, classes):
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.classes_ = classes
+
+    @property
+    def n_features_in_(self):
+        return self.coef_.shape[1]
+
+    def decision_function(self, X):
+        return np.asarray(X @ self.coef_[0]).ravel() + self.intercept_[0]
+
+    def predict_proba(self, X):
+        positive = expit(self.decision_function(X))
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(np.int64)]
+
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _files(directory):
+    for root, _, names in os.walk(directory):
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, directory).replace(os.sep, "/")
+            if relative != MANIFEST:
+                yield relative, path
+
+
+def export(model, vectorizer_text, vectorizer_pos, directory=DEFAULT_DIR):
+    """Tulis model dan vectorizer sebagai versi baru ``directory``; dipasang setelah semua file lengkap."""
+    if len(model.classes_) != 2 or model.coef_.shape[0] != 1:
+        raise ValueError("hanya LogisticRegression biner yang bisa diekspor")
+
+    tmp_dir = versioned_dir.staging(directory)
+    np.save(os.path.join(tmp_dir, "coef.npy"), np.ascontiguousarray(model.coef_, dtype=np.float64))
+    np.save(os.path.join(tmp_dir, "intercept.npy"), np.asarray(model.intercept_, dtype=np.float64))
+    np.save(os.path.join(tmp_dir, "classes.npy"), np.asarray(model.classes_))
+    write_vocabulary(vectorizer_text, os.path.join(tmp_dir, "vocab_text"))
+    write_vocabulary(vectorizer_pos, os.path.join(tmp_dir, "vocab_pos"))
+    return _publish(tmp_dir, directory, int(model.coef_.shape[1]))
+
+
+def replace_weights(coef, intercept, directory=DEFAULT_DIR):
+    """Pasang versi baru ``directory`` dengan ``coef``/``intercept`` baru; vocabulary di-hardlink.
+
+    Dipakai oleh ``feedback.py``: bobot berubah, ruang fitur tetap. File
+    artefak tidak pernah diubah di tempat, jadi hardlink aman.
+    """
+    source = active_dir(directory)
+    manifest = read_manifest(source)
+    if coef.shape[1] != manifest["n_features"]:
+        raise ValueError("jumlah fitur bobot baru berbeda dengan vocabulary")
+    tmp_dir = versioned_dir.staging(directory)
+    for name, path in _files(source):
+        if name in ("coef.npy", "intercept.npy"):
+            continue
+        target = os.path.join(tmp_dir, *name.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copy2(path, target)
+    np.save(os.path.join(tmp_dir, "coef.npy"), np.ascontiguousarray(coef, dtype=np.float64))
+    np.save(os.path.join(tmp_dir, "intercept.npy"), np.asarray(intercept, dtype=np.float64))
+    return _publish(tmp_dir, directory, manifest["n_features"])
+
+
+def _publish(tmp_dir, directory, n_features):
+    """Tulis manifest untuk ``tmp_dir`` lalu pasang sebagai versi aktif ``directory``."""
+    files = {
+        name: {"sha256": file_digest(path), "bytes": os.path.getsize(path)}
+        for name, path in _files(tmp_dir)
+    }
+    manifest = {
+        "format": FORMAT,
+        "format_version": FORMAT_VERSION,
+        # Versi konten: berubah jika dan hanya jika isi salah satu file berubah
+        "version": hashlib.sha256(json.dumps(files, sort_keys=True).encode()).hexdigest()[:12],
+        "n_features": n_features,
+        "files": files,
+    }
+    with open(os.path.join(tmp_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    versioned_dir.publish(tmp_dir, directory, manifest["version"])
+    return manifest
+
+
+def active_dir(directory):
+    """Folder versi aktif di dalam ``directory``; ``FileNotFoundError`` jika belum ada."""
+    active = versioned_dir.resolve(directory)
+    if active is None:
+        raise FileNotFoundError(f"tidak ada versi artefak terpasang di {directory}")
+    return active
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT or manifest.get("format_version") != FORMAT_VERSION:
+        raise IntegrityError(
+            f"format artefak tidak didukung: {manifest.get('format')} v{manifest.get('format_version')}"
+        )
+    return manifest
+
+
+def verify(directory, checksums=True):
+    """Cek ukuran (dan checksum) setiap file versi aktif ``directory``; raise ``IntegrityError`` jika berbeda."""
+    return _verify(active_dir(directory), checksums)
+
+
+def _verify(directory, checksums):
+    manifest = read_manifest(directory)
+    for name, expected in manifest["files"].items():
+        path = os.path.join(directory, *name.split("/"))
+        if not os.path.exists(path) or os.path.getsize(path) != expected["bytes"]:
+            raise IntegrityError(f"{name}: file hilang atau ukurannya berbeda")
+        if checksums and file_digest(path) != expected["sha256"]:
+            raise IntegrityError(f"{name}: checksum tidak cocok")
+    return manifest
+
+
+def load(directory=DEFAULT_DIR, verify_checksums=False, mmap_mode="r"):
+    """Kembalikan (model, vectorizer_text, vectorizer_pos, manifest) dari versi aktif ``directory``."""
+    # Diresolusi sekali: semua file berasal dari versi yang sama walau CURRENT diganti di tengah jalan
+    directory = active_dir(directory)
+    manifest = _verify(directory, verify_checksums)
+
+    def array(name):
+        return np.load(os.path.join(directory, name), mmap_mode=mmap_mode)
+
+    model = MappedLogisticModel(array("coef.npy"), array("intercept.npy"), array("classes.npy"))
+    vectorizer_text = CompactCountVectorizer(os.path.join(directory, "vocab_text"), mmap_mode)
+    vectorizer_pos = CompactCountVectorizer(os.path.join(directory, "vocab_pos"), mmap_mode)
+    if vectorizer_text.n_features + vectorizer_pos.n_features != manifest["n_features"]:
+        raise IntegrityError("jumlah fitur vocabulary tidak sama dengan bobot model")
+    return model, vectorizer_text, vectorizer_pos, manifest
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Ekspor/verifikasi artefak model memory-mapped.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export", help="konversi artefak .pkl ke artifacts.mmap/")
+    export_parser.add_argument("--artifacts-dir", default=None, help="folder berisi file .pkl")
+    export_parser.add_argument("--output", default=None, help="folder tujuan (default: <artifacts-dir>/artifacts.mmap)")
+    verify_parser = subparsers.add_parser("verify", help="cek checksum semua file")
+    verify_parser.add_argument("directory", nargs="?", default=DEFAULT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        import joblib
+
+        from model_bundle import artifact_paths
+
+        paths = artifact_paths(args.artifacts_dir)
+        output = args.output or os.path.join(os.path.dirname(paths["model"]), "artifacts.mmap")
+        manifest = export(
+            joblib.load(paths["model"]), joblib.load(paths["vectorizer_text"]), joblib.load(paths["vectorizer_pos"]),
+            output,
+        )
+        print(f"versi {manifest['version']}: {manifest['n_features']:,} fitur diekspor ke {output}")
+    else:
+        try:
+            manifest = verify(args.directory)
+        except (IntegrityError, FileNotFoundError) as e:
+            print(f"GAGAL: {e}", file=sys.stderr)
+            return 1
+        print(f"OK: versi {manifest['version']}, {len(manifest['files'])} file")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
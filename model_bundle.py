@@ -0,0 +1,219 @@
+"""Bundle model dan vectorizer yang dimuat sekali per proses.
+
+Streamlit menjalankan ulang ``app.py`` setiap kali ada interaksi widget,
+sehingga ``joblib.load`` di level skrip membaca ulang semua pickle pada
+setiap klik. Modul ini menyimpan satu ``ModelBundle`` (model, kedua
+vectorizer, POS tagger dan registry tokenizer punkt) di level proses sehingga
+dipakai bersama oleh semua sesi dan rerun. Bundle hanya dimuat ulang
+jika file artefak di disk berubah (mtime atau ukuran).
+"""
+import hashlib
+import os
+import threading
+import time
+
+import joblib
+
+from pos_tagging import PosTagger, load_tagger
+from punkt_registry import DEFAULT_LANGUAGE, get_registry
+from versioned_dir import POINTER, resolve
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ARTIFACTS = {
+    "model": "logistic_model.pkl",
+    "vectorizer_text": "countvectorizer_text.pkl",
+    "vectorizer_pos": "countvectorizer_pos.pkl",
+}
+# Artefak opsional. Tanpa preprocessor, teks input dipakai apa adanya;
+# jika vocabulary ringkas ada (lihat vocabulary.py), countvectorizer_text.pkl tidak dimuat;
+# jika artifacts.mmap ada (lihat mapped_artifacts.py), ketiga pickle tidak dimuat. Kedua folder
+# berversi: CURRENT menunjuk versi aktif dan diganti atomik, jadi perubahannya terlihat di tanda tangan;
+# cascade_model.pkl adalah model tahap pertama untuk mode cascade (lihat cascade.py).
+OPTIONAL_ARTIFACTS = {
+    "preprocessor": "preprocessor.pkl",
+    "cascade": "cascade_model.pkl",
+    "vectorizer_text_compact": os.path.join("countvectorizer_text.vocab", POINTER),
+    "mapped": os.path.join("artifacts.mmap", POINTER),
+}
+
+_lock = threading.Lock()
+_bundle = None
+
+
+def current_rss_bytes():
+    """Resident set size proses saat ini (byte), atau None jika tidak tersedia."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss: kilobyte di Linux, byte di macOS (puncak, bukan nilai saat ini)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def artifact_paths(base_dir=None):
+    base_dir = base_dir or BASE_DIR
+    artifacts = {**ARTIFACTS, **OPTIONAL_ARTIFACTS}
+    return {name: os.path.join(base_dir, filename) for name, filename in artifacts.items()}
+
+
+def artifact_signature(paths):
+    """Tanda tangan murah (path, mtime, ukuran) untuk mendeteksi perubahan artefak."""
+    signature = []
+    for name in sorted(paths):
+        if not os.path.exists(paths[name]):
+            signature.append((name, paths[name], None, None))
+            continue
+        stat = os.stat(paths[name])
+        signature.append((name, paths[name], stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class ModelBundle:
+    """Model, vectorizer dan resource NLTK yang sudah dimuat, beserta metrik muatnya."""
+
+    def __init__(self, model, vectorizer_text, vectorizer_pos, tagger, sentence_tokenizer,
+                 signature, load_seconds, rss_before, rss_after, preprocessor=None, cascade=None):
+        self.model = model
+        self.vectorizer_text = vectorizer_text
+        self.vectorizer_pos = vectorizer_pos
+        self.preprocessor = preprocessor
+        self.cascade = cascade
+        self.tagger = tagger
+        self.sentence_tokenizer = sentence_tokenizer
+        self.signature = signature
+        self.load_seconds = load_seconds
+        self.rss_before = rss_before
+        self.rss_after = rss_after
+        self.loaded_at = time.time()
+        self.pos_tagger = PosTagger(tagger, sentence_tokenizer)
+        self._feature_names = None
+
+    @property
+    def version(self):
+        """Hash pendek dari tanda tangan artefak; berubah setiap artefak diganti."""
+        digest = hashlib.sha1(repr(self.signature).encode("utf-8")).hexdigest()
+        return digest[:12]
+
+    def preprocess(self, texts):
+        """Terapkan preprocessing pelatihan (preprocessor.pkl) jika tersedia."""
+        if self.preprocessor is None:
+            return list(texts)
+        return self.preprocessor.transform(texts)
+
+    def text_feature_names(self, columns):
+        """Nama term untuk indeks kolom matriks teks (array nama dibuat sekali per bundle)."""
+        if hasattr(self.vectorizer_text, "feature_name"):
+            return [self.vectorizer_text.feature_name(column) for column in columns]
+        if self._feature_names is None:
+            self._feature_names = self.vectorizer_text.get_feature_names_out()
+        return [str(self._feature_names[column]) for column in columns]
+
+    def tokenize(self, text):
+        return self.pos_tagger.tokenize(text)
+
+    def pos_features(self, text):
+        # Sama dengan ' '.join(tag for _, tag in nltk.pos_tag(nltk.word_tokenize(text)))
+        return self.pos_tagger(text)
+
+    def metrics(self):
+        rss_now = current_rss_bytes()
+        return {
+            "version": self.version,
+            "load_seconds": dict(self.load_seconds),
+            "total_load_seconds": sum(self.load_seconds.values()),
+            "rss_bytes": rss_now,
+            "rss_delta_bytes": (
+                self.rss_after - self.rss_before
+                if self.rss_after is not None and self.rss_before is not None
+                else None
+            ),
+            "loaded_at": self.loaded_at,
+        }
+
+
+def load_bundle(paths=None):
+    """Muat bundle baru dari disk tanpa melalui cache."""
+    paths = paths or artifact_paths()
+    signature = artifact_signature(paths)
+    rss_before = current_rss_bytes()
+    load_seconds = {}
+    loaded = {}
+
+    mapped = paths.get("mapped")
+    compact = paths.get("vectorizer_text_compact")
+    if mapped and os.path.exists(mapped):
+        from mapped_artifacts import load as load_mapped
+
+        start = time.perf_counter()
+        loaded["model"], loaded["vectorizer_text"], loaded["vectorizer_pos"], _ = load_mapped(
+            os.path.dirname(mapped)
+        )
+        load_seconds["mapped"] = time.perf_counter() - start
+    elif compact and os.path.exists(compact):
+        from vocabulary import CompactCountVectorizer
+
+        start = time.perf_counter()
+        loaded["vectorizer_text"] = CompactCountVectorizer(resolve(os.path.dirname(compact)))
+        load_seconds["vectorizer_text"] = time.perf_counter() - start
+
+    for name in ("model", "vectorizer_text", "vectorizer_pos"):
+        if name in loaded:
+            continue
+        start = time.perf_counter()
+        loaded[name] = joblib.load(paths[name])
+        load_seconds[name] = time.perf_counter() - start
+
+    for name in ("preprocessor", "cascade"):
+        if paths.get(name) and os.path.exists(paths[name]):
+            start = time.perf_counter()
+            loaded[name] = joblib.load(paths[name])
+            load_seconds[name] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tagger = load_tagger()
+    # Registry dipakai bersama antar bundle; hanya model bahasa default yang dimuat sekarang
+    sentence_tokenizer = get_registry()
+    sentence_tokenizer.get(DEFAULT_LANGUAGE)
+    load_seconds["nltk"] = time.perf_counter() - start
+
+    return ModelBundle(
+        loaded["model"],
+        loaded["vectorizer_text"],
+        loaded["vectorizer_pos"],
+        tagger,
+        sentence_tokenizer,
+        signature=signature,
+        load_seconds=load_seconds,
+        rss_before=rss_before,
+        rss_after=current_rss_bytes(),
+        preprocessor=loaded.get("preprocessor"),
+        cascade=loaded.get("cascade"),
+    )
+
+
+def get_bundle(paths=None):
+    """Bundle bersama untuk seluruh proses; dimuat ulang hanya jika artefak berubah."""
+    global _bundle
+    paths = paths or artifact_paths()
+    signature = artifact_signature(paths)
+    bundle = _bundle
+    if bundle is not None and bundle.signature == signature:
+        return bundle
+    with _lock:
+        # Cek ulang: thread lain mungkin sudah memuat artefak yang sama
+        if _bundle is None or _bundle.signature != signature:
+            _bundle = load_bundle(paths)
+        return _bundle
+
+
+def clear_cache():
+    global _bundle
+    with _lock:
+        _bundle = None
@@ -0,0 +1,352 @@
+"""Deteksi iklan hampir-duplikat dengan MinHash + LSH.
+
+Kampanye penipuan memasang ratusan salinan iklan yang hanya sedikit diubah.
+Setiap teks diubah menjadi himpunan shingle (3 kata berurutan, lowercase,
+alfanumerik), lalu diringkas menjadi signature MinHash ``NUM_PERM`` nilai.
+Signature dibagi menjadi ``BANDS`` band; dua iklan menjadi kandidat jika
+salah satu band-nya sama persis, lalu kandidat diverifikasi dengan estimasi
+kemiripan Jaccard (fraksi nilai signature yang sama).
+
+- ``cluster`` mengelompokkan satu batch teks di memori.
+- ``DuplicateIndex`` menyimpan klaster (beserta verdict dan probabilitasnya)
+  di sqlite3, sehingga memori tetap terbatas untuk jutaan signature; setiap
+  klaster menyimpan paling banyak ``MAX_MEMBERS`` signature anggota.
+  ``scoring.predict(..., duplicates=index)`` memakai verdict klaster untuk
+  iklan yang cocok tanpa menjalankan pipeline model.
+
+Verdict klaster yang berasal dari prediksi model dicatat bersama versi
+artefak model; klaster dari versi lain diabaikan saat lookup sehingga model
+yang diperbarui (retrain, ``feedback.py``) tidak ditimpa verdict lama.
+Klaster berlabel pasti (dataset berlabel, verdict moderator) tidak punya
+versi dan berlaku untuk semua versi model.
+
+Contoh:
+    python near_duplicates.py build fake_job_postings.csv
+    python near_duplicates.py cluster postingan_baru.csv
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(BASE_DIR, ".cache", "near_duplicates.sqlite3")
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.6
+MAX_MEMBERS = 32
+SEED = 1
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Pengali untuk menggabungkan hash token menjadi hash shingle
+_SHINGLE_MULTIPLIERS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64)
+
+Match = namedtuple("Match", ["cluster", "similarity", "label", "probability", "size"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clusters (
+    id INTEGER PRIMARY KEY,
+    label INTEGER NOT NULL,
+    probability REAL NOT NULL,
+    size INTEGER NOT NULL,
+    members INTEGER NOT NULL,
+    version TEXT
+);
+CREATE TABLE IF NOT EXISTS postings (
+    id INTEGER PRIMARY KEY,
+    cluster INTEGER NOT NULL,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bands (
+    key INTEGER NOT NULL,
+    posting INTEGER NOT NULL,
+    PRIMARY KEY (key, posting)
+) WITHOUT ROWID;
+-- Untuk anggota klaster dan prune (hapus posting/band per klaster) tanpa memindai seluruh tabel
+CREATE INDEX IF NOT EXISTS postings_cluster ON postings (cluster);
+CREATE INDEX IF NOT EXISTS bands_posting ON bands (posting);
+"""
+
+
+class MinHasher:
+    def __init__(self, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE, seed=SEED):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)[:, None]
+
+    def shingles(self, text):
+        """Hash 32-bit setiap shingle kata (unik)."""
+        tokens = np.fromiter(
+            (zlib.crc32(token.encode()) for token in _TOKEN.findall(text.lower())), dtype=np.uint64
+        )
+        size = min(self.shingle_size, len(tokens))
+        if size == 0:
+            return tokens
+        combined = np.zeros(len(tokens) - size + 1, dtype=np.uint64)
+        for offset in range(size):
+            combined += tokens[offset:offset + len(combined)] * _SHINGLE_MULTIPLIERS[offset]
+        return np.unique(combined >> np.uint64(32))
+
+    def signature(self, text):
+        """Signature MinHash (uint32), atau None untuk teks tanpa token."""
+        shingles = self.shingles(text)
+        if not len(shingles):
+            return None
+        # Permutasi universal (a*x + b) mod p, dipotong ke 32 bit; a, b, x < 2**32 sehingga muat di uint64
+        hashed = ((self._a * shingles + self._b) % _MERSENNE_PRIME) & _MAX_HASH
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def signatures(self, texts):
+        return [self.signature(text) for text in texts]
+
+
+def band_keys(signature, bands=BANDS):
+    """Satu kunci int64 per band (hash dari nilai band dan nomor band-nya)."""
+    rows = len(signature) // bands
+    return [
+        int.from_bytes(
+            hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8,
+                            person=band.to_bytes(2, "little")).digest(),
+            "little", signed=True,
+        )
+        for band in range(bands)
+    ]
+
+
+def similarity(signature, other):
+    return float(np.mean(signature == other))
+
+
+def cluster(texts, threshold=SIMILARITY_THRESHOLD, hasher=None, bands=BANDS):
+    """Nomor klaster untuk setiap teks dalam satu batch (klaster = indeks anggota pertamanya)."""
+    hasher = hasher or MinHasher()
+    signatures = hasher.signatures(texts)
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    for i, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        for key in band_keys(signature, bands):
+            first = buckets.setdefault(key, i)
+            # Cukup dibandingkan dengan anggota pertama bucket agar tetap linear
+            if first != i and find(first) != find(i) and similarity(signatures[first], signature) >= threshold:
+                a, b = sorted((find(first), find(i)))
+                parent[b] = a
+    return np.array([find(i) for i in range(len(texts))], dtype=np.int64)
+
+
+class DuplicateIndex:
+    """Klaster iklan hampir-duplikat yang disimpan di sqlite3."""
+
+    def __init__(self, path=DEFAULT_PATH, threshold=SIMILARITY_THRESHOLD, hasher=None, bands=BANDS,
+                 max_members=MAX_MEMBERS):
+        self.path = path
+        self.threshold = threshold
+        self.hasher = hasher or MinHasher()
+        self.bands = bands
+        self.max_members = max_members
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(clusters)")]
+            if "version" not in columns:
+                # Indeks lama: klaster tanpa versi dianggap berlabel pasti
+                connection.execute("ALTER TABLE clusters ADD COLUMN version TEXT")
+        connection.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _similar(self, connection, signature, version=None):
+        """{id klaster: kemiripan tertinggi} untuk klaster di atas ambang yang berlaku bagi ``version``."""
+        keys = band_keys(signature, self.bands)
+        query = (
+            "SELECT p.cluster, p.signature FROM postings p JOIN clusters c ON c.id = p.cluster WHERE p.id IN "
+            f"(SELECT posting FROM bands WHERE key IN ({','.join('?' * len(keys))}))"
+        )
+        if version is not None:
+            query += " AND (c.version IS NULL OR c.version = ?)"
+            keys = [*keys, version]
+        scores = {}
+        for cluster_id, blob in connection.execute(query, keys).fetchall():
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold and score > scores.get(cluster_id, -1.0):
+                scores[cluster_id] = score
+        return scores
+
+    def _best_match(self, connection, signature, version=None):
+        scores = self._similar(connection, signature, version)
+        if not scores:
+            return None
+        cluster_id = max(scores, key=scores.get)
+        label, probability, size = connection.execute(
+            "SELECT label, probability, size FROM clusters WHERE id = ?", (cluster_id,)
+        ).fetchone()
+        return Match(cluster_id, scores[cluster_id], label, probability, size)
+
+    def lookup(self, texts, version=None):
+        """``Match`` klaster paling mirip untuk setiap teks, atau None.
+
+        Dengan ``version``, hanya klaster berlabel pasti dan klaster dari
+        versi model tersebut yang dipakai.
+        """
+        matches = []
+        with self._connect() as connection:
+            for signature in self.hasher.signatures(texts):
+                matches.append(None if signature is None else self._best_match(connection, signature, version))
+        connection.close()
+        return matches
+
+    def add(self, texts, labels, probabilities, version=None):
+        """Masukkan teks ke klaster yang cocok atau buat klaster baru; kembalikan id klasternya.
+
+        ``version`` adalah versi model yang menghasilkan label; None untuk label pasti.
+        """
+        cluster_ids = []
+        with self._connect() as connection:
+            for signature, label, probability in zip(self.hasher.signatures(texts), labels, probabilities):
+                if signature is None:
+                    cluster_ids.append(None)
+                    continue
+                match = self._best_match(connection, signature, version)
+                if match is None:
+                    cluster_id = connection.execute(
+                        "INSERT INTO clusters (label, probability, size, members, version) VALUES (?, ?, 1, 0, ?)",
+                        (int(label), float(probability), version),
+                    ).lastrowid
+                    members = 0
+                else:
+                    # Verdict klaster tetap; probabilitas menjadi rata-rata anggotanya
+                    cluster_id = match.cluster
+                    connection.execute(
+                        "UPDATE clusters SET size = size + 1, "
+                        "probability = probability + (? - probability) / (size + 1) WHERE id = ?",
+                        (float(probability), cluster_id),
+                    )
+                    members = connection.execute(
+                        "SELECT members FROM clusters WHERE id = ?", (cluster_id,)
+                    ).fetchone()[0]
+                if members < self.max_members:
+                    posting_id = connection.execute(
+                        "INSERT INTO postings (cluster, signature) VALUES (?, ?)",
+                        (cluster_id, signature.tobytes()),
+                    ).lastrowid
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO bands VALUES (?, ?)",
+                        [(key, posting_id) for key in band_keys(signature, self.bands)],
+                    )
+                    connection.execute("UPDATE clusters SET members = members + 1 WHERE id = ?", (cluster_id,))
+                cluster_ids.append(cluster_id)
+        connection.close()
+        return cluster_ids
+
+    def relabel(self, texts, labels):
+        """Jadikan verdict semua klaster yang cocok dengan ``texts`` label pasti ``labels``.
+
+        Dipakai untuk verdict moderator: klaster yang dibalik menjadi asli
+        tidak lagi menimpa prediksi model. Mengembalikan jumlah klaster yang diubah.
+        """
+        changed = set()
+        with self._connect() as connection:
+            for signature, label in zip(self.hasher.signatures(texts), labels):
+                if signature is None:
+                    continue
+                for cluster_id in self._similar(connection, signature):
+                    connection.execute(
+                        "UPDATE clusters SET label = ?, probability = ?, version = NULL WHERE id = ?",
+                        (int(label), float(label), cluster_id),
+                    )
+                    changed.add(cluster_id)
+        connection.close()
+        return len(changed)
+
+    def prune(self, version):
+        """Hapus klaster hasil prediksi versi model selain ``version``; kembalikan jumlahnya."""
+        with self._connect() as connection:
+            stale = "SELECT id FROM clusters WHERE version IS NOT NULL AND version != ?"
+            connection.execute(
+                f"DELETE FROM bands WHERE posting IN (SELECT id FROM postings WHERE cluster IN ({stale}))", (version,)
+            )
+            connection.execute(f"DELETE FROM postings WHERE cluster IN ({stale})", (version,))
+            removed = connection.execute(
+                "DELETE FROM clusters WHERE version IS NOT NULL AND version != ?", (version,)
+            ).rowcount
+        connection.close()
+        return removed
+
+    def stats(self):
+        with self._connect() as connection:
+            clusters, postings = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM clusters"
+            ).fetchone()
+            signatures = connection.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+        connection.close()
+        return {"clusters": clusters, "postings": postings, "signatures": signatures}
+
+
+_indexes = {}
+
+
+def get_index(path=DEFAULT_PATH):
+    index = _indexes.get(path)
+    if index is None:
+        index = _indexes.setdefault(path, DuplicateIndex(path))
+    return index
+
+
+def main(argv=None):
+    import argparse
+    import csv
+
+    from batch import DEFAULT_CHUNKSIZE, ID_COLUMN, combine_columns, iter_chunks
+
+    parser = argparse.ArgumentParser(description="Indeks dan klaster iklan hampir-duplikat (MinHash/LSH).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="isi indeks dengan iklan palsu dari CSV berlabel")
+    build.add_argument("dataset")
+    build.add_argument("--index", default=DEFAULT_PATH)
+    build.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    group = subparsers.add_parser("cluster", help="kelompokkan baris CSV (output: id,cluster)")
+    group.add_argument("dataset")
+    group.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    with open(args.dataset, encoding="utf-8", newline="") as f:
+        rows = csv.DictReader(f)
+        if args.command == "build":
+            index = DuplicateIndex(args.index)
+            for chunk in iter_chunks(rows, args.chunksize):
+                fake = [combine_columns(row) for row in chunk if row.get("fraudulent") == "1"]
+                index.add(fake, [1] * len(fake), [1.0] * len(fake))
+            stats = index.stats()
+            print(f"{stats['postings']:,} iklan palsu dalam {stats['clusters']:,} klaster", file=sys.stderr)
+        else:
+            rows = list(rows)
+            labels = cluster([combine_columns(row) for row in rows], args.threshold)
+            writer = csv.writer(sys.stdout)
+            writer.writerow([ID_COLUMN, "cluster"])
+            for i, (row, label) in enumerate(zip(rows, labels)):
+                writer.writerow([row.get(ID_COLUMN, i), label])
+            print(f"{len(rows):,} baris dalam {len(set(labels.tolist())):,} klaster", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
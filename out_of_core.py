@@ -0,0 +1,282 @@
+"""Pelatihan out-of-core untuk korpus yang tidak muat di memori.
+
+Mode biasa ``train.py`` memuat seluruh CSV, menggandakan iklan palsu
+(oversampling) dan membangun vocabulary ``CountVectorizer`` di memori.
+``train.py --out-of-core`` memakai modul ini:
+
+- CSV dibaca per ``--chunksize`` baris; kolom digabung secara vektor
+  (``train.combine_columns``);
+- fitur teks dan POS memakai hashing (``HashedVectorizer``, unigram +
+  bigram) tanpa vocabulary, sehingga ukuran ruang fitur tetap
+  (``--hash-bits``);
+- ``SGDClassifier(loss="log_loss")`` dilatih per chunk dengan
+  ``partial_fit``; ketidakseimbangan kelas diatasi dengan ``class_weight``
+  dari jumlah label (satu pass murah atas kolom ``fraudulent``), bukan
+  menggandakan baris;
+- tabel lemma ``TextPreprocessor`` dibangun dari ``--lemma-rows`` baris
+  pertama saja;
+- matriks fitur setiap chunk disimpan sebagai ``.npz`` di ``--cache-dir``,
+  sehingga epoch berikutnya dan evaluasi tidak mengulang preprocessing dan
+  POS tagging.
+
+Memori puncak ditentukan oleh ``--chunksize`` dan ``--hash-bits``, bukan
+jumlah baris. Baris holdout (``--test-size``) dipilih acak per chunk dengan
+seed tetap dan tidak pernah ikut dilatih.
+
+Contoh:
+    python train.py arsip_postingan.csv --out-of-core --chunksize 20000 --epochs 3
+"""
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix, hstack
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from batch import TEXT_COLUMNS, pos_pool_for
+from term_counts import class_counts
+from train import LABEL_COLUMN, _nltk_version, _spacy_version, combine_columns, file_digest
+
+DEFAULT_CHUNKSIZE = 10_000
+POS_HASH_BITS = 14
+DEFAULT_EPOCHS = 3
+DEFAULT_ALPHA = 1e-4
+DEFAULT_NAME_ROWS = 50_000
+COMPLETE = "complete.joblib"
+
+
+class HashedVectorizer:
+    """``HashingVectorizer`` (count, tanpa tanda alternatif) plus nama term untuk kolom yang pernah terlihat.
+
+    Nama dipakai oleh penjelasan prediksi dan word cloud
+    (``ModelBundle.text_feature_names``); jumlahnya paling banyak
+    ``n_features``. Jika beberapa term jatuh ke kolom yang sama, term
+    pertama yang disimpan.
+    """
+
+    def __init__(self, n_features, ngram_range=(1, 2)):
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, ngram_range=ngram_range, alternate_sign=False, norm=None
+        )
+        self.names = {}
+
+    @property
+    def n_features(self):
+        return self.vectorizer.n_features
+
+    def transform(self, texts):
+        return self.vectorizer.transform(texts)
+
+    def learn_names(self, texts):
+        analyzer = self.vectorizer.build_analyzer()
+        terms = list({term for text in texts for term in analyzer(text)})
+        if not terms:
+            return
+        # FeatureHasher memakai hash yang sama dengan HashingVectorizer; satu term per baris
+        hasher = FeatureHasher(self.n_features, input_type="string", alternate_sign=False)
+        columns = hasher.transform([[term] for term in terms]).indices
+        names = self.names
+        for term, column in zip(terms, columns.tolist()):
+            names.setdefault(column, term)
+
+    def feature_name(self, column):
+        return self.names.get(int(column), f"#{int(column)}")
+
+
+def iter_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """DataFrame ``combined_text`` + label untuk setiap chunk CSV."""
+    reader = pd.read_csv(
+        path, usecols=TEXT_COLUMNS + [LABEL_COLUMN], chunksize=chunksize,
+        dtype={**{column: str for column in TEXT_COLUMNS}, LABEL_COLUMN: "int8"},
+    )
+    for chunk in reader:
+        yield combine_columns(chunk)
+
+
+def count_labels(path, chunksize=DEFAULT_CHUNKSIZE):
+    counts = np.zeros(2, dtype=np.int64)
+    for chunk in pd.read_csv(path, usecols=[LABEL_COLUMN], chunksize=chunksize * 10, dtype="int8"):
+        counts += np.bincount(chunk[LABEL_COLUMN].to_numpy(), minlength=2)
+    return counts
+
+
+def class_weight(counts):
+    """Bobot 'balanced' ala sklearn, n / (n_kelas * jumlah_kelas), dari jumlah label."""
+    total = counts.sum()
+    return {label: float(total / (len(counts) * count)) for label, count in enumerate(counts) if count}
+
+
+def fit_preprocessor(path, rows, chunksize=DEFAULT_CHUNKSIZE):
+    """``TextPreprocessor`` dengan tabel lemma dari ``rows`` baris pertama."""
+    from preprocessing import TextPreprocessor
+
+    preprocessor = TextPreprocessor()
+    cleaned = []
+    for chunk in iter_chunks(path, min(chunksize, rows)):
+        cleaned += [preprocessor.clean(text) for text in chunk["combined_text"]]
+        if len(cleaned) >= rows:
+            break
+    return preprocessor.fit(cleaned[:rows])
+
+
+def _save_chunk(path, matrix, labels, holdout):
+    with open(path + ".tmp", "wb") as f:
+        np.savez(f, data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+                 shape=np.array(matrix.shape), labels=labels, holdout=holdout)
+    os.replace(path + ".tmp", path)
+
+
+def load_chunk(path):
+    with np.load(path) as saved:
+        matrix = csr_matrix((saved["data"], saved["indices"], saved["indptr"]), shape=tuple(saved["shape"]))
+        return matrix, saved["labels"], saved["holdout"]
+
+
+def featurize(path, feature_dir, preprocessor, vectorizer_text, vectorizer_pos, chunksize=DEFAULT_CHUNKSIZE,
+              test_size=0.2, seed=42, name_rows=DEFAULT_NAME_ROWS, pos_workers=None):
+    """Tulis matriks fitur setiap chunk ke ``feature_dir``; kembalikan jumlah term teks per kelas.
+
+    ``pos_workers=None`` berarti semua core, sama dengan ``pos_tagging.pos_features``.
+    """
+    from pos_tagging import PosTagger
+
+    pos_workers = pos_workers or os.cpu_count() or 1
+    os.makedirs(feature_dir, exist_ok=True)
+    counts = np.zeros((2, vectorizer_text.n_features), dtype=np.int64)
+    named = 0
+    with pos_pool_for(pos_workers) as pool:
+        tagger = pool or PosTagger()
+        for i, chunk in enumerate(iter_chunks(path, chunksize)):
+            texts = preprocessor.transform(chunk["combined_text"])
+            labels = chunk[LABEL_COLUMN].to_numpy(dtype=np.int64)
+            if named < name_rows:
+                vectorizer_text.learn_names(texts[:name_rows - named])
+                named += len(texts)
+            text_matrix = vectorizer_text.transform(texts)
+            matrix = hstack([text_matrix, vectorizer_pos.transform(tagger.map(texts))]).tocsr()
+            counts += class_counts(text_matrix, labels)
+            holdout = np.random.default_rng([seed, i]).random(len(labels)) < test_size
+            _save_chunk(os.path.join(feature_dir, f"chunk-{i:05d}.npz"), matrix, labels, holdout)
+    return counts
+
+
+def chunk_paths(feature_dir):
+    return sorted(glob.glob(os.path.join(feature_dir, "chunk-*.npz")))
+
+
+def fit(feature_dir, weights, epochs=DEFAULT_EPOCHS, alpha=DEFAULT_ALPHA, seed=42):
+    """``SGDClassifier`` logistik yang dilatih chunk demi chunk; urutan chunk dan baris diacak per epoch."""
+    from sklearn.linear_model import SGDClassifier
+
+    model = SGDClassifier(loss="log_loss", alpha=alpha, class_weight=weights, random_state=seed)
+    paths = chunk_paths(feature_dir)
+    classes = np.array([0, 1])
+    for epoch in range(epochs):
+        rng = np.random.default_rng([seed, epoch])
+        for index in rng.permutation(len(paths)):
+            matrix, labels, holdout = load_chunk(paths[index])
+            rows = np.flatnonzero(~holdout)
+            if not len(rows):
+                continue
+            rows = rng.permutation(rows)
+            model.partial_fit(matrix[rows], labels[rows], classes=classes)
+    return model
+
+
+def evaluate(model, feature_dir):
+    """Metrik pada baris holdout, dihitung dari confusion matrix yang diakumulasi per chunk."""
+    tp = fp = fn = tn = 0
+    for path in chunk_paths(feature_dir):
+        matrix, labels, holdout = load_chunk(path)
+        if not holdout.any():
+            continue
+        predicted = model.predict(matrix[holdout])
+        actual = labels[holdout]
+        tp += int(np.sum((predicted == 1) & (actual == 1)))
+        fp += int(np.sum((predicted == 1) & (actual == 0)))
+        fn += int(np.sum((predicted == 0) & (actual == 1)))
+        tn += int(np.sum((predicted == 0) & (actual == 0)))
+    total = tp + fp + fn + tn
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        "holdout_rows": total,
+        "accuracy": (tp + tn) / total if total else 0.0,
+        "precision": precision,
+        "recall": recall,
+        "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+    }
+
+
+def peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def train(args, pipeline):
+    """Kembalikan (model, vectorizer_text, vectorizer_pos, preprocessor, jumlah term, metrik).
+
+    ``args`` adalah argumen ``train.py``; ``pipeline`` (``train.Pipeline``)
+    mencatat waktu tahap dan menyimpan tabel lemma di cache.
+    """
+    digest = file_digest(args.dataset)
+    counts, _ = pipeline.run("labels", None, lambda: count_labels(args.dataset, args.chunksize), cache=False)
+    weights = class_weight(counts)
+
+    preprocessor, key = pipeline.run(
+        "lemmatize", [digest, args.lemma_rows, _spacy_version()],
+        lambda: fit_preprocessor(args.dataset, args.lemma_rows, args.chunksize),
+    )
+
+    # Fitur per chunk di-cache dengan kunci dari semua parameter yang memengaruhinya
+    params = [key, args.chunksize, args.hash_bits, args.test_size, args.seed, args.name_rows, _nltk_version()]
+    feature_key = hashlib.sha256(json.dumps(params).encode()).hexdigest()[:16]
+    if pipeline.use_cache:
+        feature_dir = os.path.join(pipeline.cache_dir, f"features-{feature_key}")
+    else:
+        feature_dir = tempfile.mkdtemp(prefix="features-")
+
+    def build_features():
+        complete = os.path.join(feature_dir, COMPLETE)
+        if os.path.exists(complete):
+            return joblib.load(complete)
+        shutil.rmtree(feature_dir, ignore_errors=True)
+        vectorizer_text = HashedVectorizer(2 ** args.hash_bits)
+        vectorizer_pos = HashedVectorizer(2 ** POS_HASH_BITS)
+        term_counts = featurize(args.dataset, feature_dir, preprocessor, vectorizer_text, vectorizer_pos,
+                                args.chunksize, args.test_size, args.seed, args.name_rows, args.pos_workers)
+        # Ditulis terakhir: folder tanpa file ini dianggap belum lengkap
+        joblib.dump((vectorizer_text, vectorizer_pos, term_counts), complete + ".tmp")
+        os.replace(complete + ".tmp", complete)
+        return vectorizer_text, vectorizer_pos, term_counts
+
+    try:
+        (vectorizer_text, vectorizer_pos, term_counts), _ = pipeline.run(
+            "featurize", None, build_features, cache=False
+        )
+        model, _ = pipeline.run(
+            "fit", None, lambda: fit(feature_dir, weights, args.epochs, args.alpha, args.seed), cache=False
+        )
+        metrics, _ = pipeline.run("evaluate", None, lambda: evaluate(model, feature_dir), cache=False)
+    finally:
+        if not pipeline.use_cache:
+            shutil.rmtree(feature_dir, ignore_errors=True)
+
+    metrics = {
+        "rows": int(counts.sum()),
+        "class_weight": weights,
+        **metrics,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+    return model, vectorizer_text, vectorizer_pos, preprocessor, term_counts, metrics
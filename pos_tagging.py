@@ -0,0 +1,113 @@
+"""Fitur POS (string tag dipisah spasi) untuk ``vectorizer_pos``.
+
+``PosTagger`` menghasilkan string yang sama dengan
+``' '.join(tag for _, tag in nltk.pos_tag(nltk.word_tokenize(text)))``,
+tetapi tagger perceptron dan model punkt hanya dimuat sekali. Secara
+default batas kalimat ditentukan oleh ``punkt_registry``, yang memilih
+model punkt sesuai bahasa teks.
+
+Untuk batch dan pelatihan, ``PosTaggingPool`` membagi dokumen ke beberapa
+proses; setiap worker memuat tagger dan punkt sekali saat start, dokumen
+dikirim per chunk untuk menekan biaya IPC, dan hasil dikembalikan dalam
+urutan input.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import nltk
+
+from instrumentation import stage
+from punkt_registry import get_registry
+
+NLTK_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data")
+DEFAULT_CHUNKSIZE = 64
+
+if NLTK_DATA_PATH not in nltk.data.path:
+    nltk.data.path.append(NLTK_DATA_PATH)
+
+
+def load_punkt(language="english"):
+    """Muat model kalimat punkt sekali; dipakai ulang oleh ``PosTagger.tokenize``.
+
+    Dibaca dari ``nltk_data/tokenizers/punkt_tab`` (lihat ``punkt_registry.py``);
+    ``LookupError`` jika bahasa tersebut tidak ada.
+    """
+    from nltk.tokenize import PunktTokenizer  # nltk >= 3.8.2
+    return PunktTokenizer(language)
+
+
+def load_tagger():
+    from nltk.tag.perceptron import PerceptronTagger
+    return PerceptronTagger()
+
+
+class PosTagger:
+    def __init__(self, tagger=None, sentence_tokenizer=None):
+        self.tagger = tagger if tagger is not None else load_tagger()
+        self.sentence_tokenizer = sentence_tokenizer if sentence_tokenizer is not None else get_registry()
+        self._word_tokenizer = nltk.tokenize.NLTKWordTokenizer()
+
+    def tokenize(self, text):
+        # Sama dengan nltk.word_tokenize, tetapi tanpa memuat ulang punkt per panggilan
+        return [
+            token
+            for sentence in self.sentence_tokenizer.tokenize(text)
+            for token in self._word_tokenizer.tokenize(sentence)
+        ]
+
+    def __call__(self, text):
+        return " ".join(tag for _, tag in self.tagger.tag(self.tokenize(text)))
+
+    def map(self, texts):
+        texts = list(texts)
+        with stage("tokenize", len(texts)):
+            tokens = [self.tokenize(text) for text in texts]
+        with stage("pos_tag", len(texts)):
+            return [" ".join(tag for _, tag in self.tagger.tag(words)) for words in tokens]
+
+
+# Tagger milik proses worker, dibuat sekali oleh _init_worker
+_worker_tagger = None
+
+
+def _init_worker():
+    global _worker_tagger
+    _worker_tagger = PosTagger()
+
+
+def _tag_chunk(texts):
+    return _worker_tagger.map(texts)
+
+
+class PosTaggingPool:
+    """Pool proses untuk POS tagging; pakai sebagai context manager."""
+
+    def __init__(self, workers=None, chunksize=DEFAULT_CHUNKSIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+    def map(self, texts):
+        texts = list(texts)
+        chunks = [texts[i:i + self.chunksize] for i in range(0, len(texts), self.chunksize)]
+        # executor.map menjaga urutan chunk sesuai input
+        return [tags for chunk in self._executor.map(_tag_chunk, chunks) for tags in chunk]
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def pos_features(texts, workers=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Fitur POS untuk semua ``texts``; paralel jika ``workers`` > 1 (default: semua core)."""
+    texts = list(texts)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(texts) <= chunksize:
+        return PosTagger().map(texts)
+    with PosTaggingPool(workers, chunksize) as pool:
+        return pool.map(texts)
@@ -0,0 +1,181 @@
+"""Cache hasil prediksi per teks posting.
+
+Iklan yang sama sering dinilai berulang (iklan di-repost, tombol
+"🔎 Prediksi" diklik lagi). Setiap kali, tokenisasi, POS tagging, kedua
+vectorizer dan model dijalankan ulang. ``PredictionCache`` menyimpan hasil
+``scoring.predict`` dengan kunci hash dari teks yang dinormalisasi
+(lowercase, spasi dirapikan; ``clean_text`` juga melakukan keduanya) dan
+versi artefak model, sehingga artefak baru otomatis tidak memakai hasil lama.
+Hasil mode cascade (lihat ``cascade.py``) disimpan dengan ``variant`` berisi
+pita cascade agar tidak tercampur dengan hasil model penuh.
+
+Cache di memori dibatasi jumlah entri (LRU) dan umur entri (TTL), dipakai
+bersama semua sesi Streamlit lewat ``get_cache``, dan bisa disimpan ke file
+sqlite3 agar dipakai juga oleh ``score.py --cache``. Label tidak disimpan
+sebagai keputusan akhir: ``scoring.predict`` menghitungnya ulang dari logit
+dengan ambang yang sedang dipakai.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(BASE_DIR, ".cache", "predictions.sqlite3")
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL = 7 * 24 * 3600
+WORD_FIELDS = ("highlight_words", "explanation")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    expires_at REAL NOT NULL
+)
+"""
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+class PredictionCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as connection:
+                connection.execute(SCHEMA)
+            connection.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def key(version, text, variant=""):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(version.encode("utf-8"))
+        digest.update(b"\0")
+        if variant:
+            digest.update(variant.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(normalize(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _usable(result, with_words):
+        if result is None or (with_words and "explanation" not in result):
+            return None
+        if not with_words:
+            result = {name: value for name, value in result.items() if name not in WORD_FIELDS}
+        return result
+
+    def get_many(self, keys, with_words=True):
+        """Hasil untuk setiap kunci, atau None jika tidak ada/kedaluwarsa/tanpa kata penjelas."""
+        now = time.time()
+        results = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] < now:
+                    del self._entries[key]
+                    self._counts["expired"] += 1
+                    entry = None
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    results[i] = self._usable(entry[1], with_words)
+                if results[i] is None:
+                    missing.append(i)
+
+        if missing and self.path is not None:
+            found = self._read_disk([keys[i] for i in missing], now)
+            still_missing = []
+            for i in missing:
+                entry = found.get(keys[i])
+                results[i] = self._usable(entry[1], with_words) if entry else None
+                if results[i] is None:
+                    still_missing.append(i)
+                else:
+                    self._remember(keys[i], *entry)
+            with self._lock:
+                self._counts["disk_hits"] += len(missing) - len(still_missing)
+            missing = still_missing
+
+        with self._lock:
+            self._counts["hits"] += len(keys) - len(missing)
+            self._counts["misses"] += len(missing)
+        return results
+
+    def put_many(self, items):
+        """Simpan pasangan (kunci, hasil)."""
+        expires_at = time.time() + self.ttl
+        for key, result in items:
+            self._remember(key, expires_at, result)
+        if self.path is not None and items:
+            with self._connect() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?)",
+                    [(key, json.dumps(result, ensure_ascii=False), expires_at) for key, result in items],
+                )
+                connection.execute("DELETE FROM predictions WHERE expires_at < ?", (time.time(),))
+            connection.close()
+
+    def _remember(self, key, expires_at, result):
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counts["evictions"] += 1
+
+    def _read_disk(self, keys, now):
+        found = {}
+        with self._connect() as connection:
+            # Batasi jumlah parameter per query (SQLITE_MAX_VARIABLE_NUMBER)
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = connection.execute(
+                    f"SELECT key, result, expires_at FROM predictions "
+                    f"WHERE key IN ({','.join('?' * len(batch))}) AND expires_at >= ?",
+                    [*batch, now],
+                ).fetchall()
+                found.update((key, (expires_at, json.loads(result))) for key, result, expires_at in rows)
+        connection.close()
+        return found
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.path is not None:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM predictions")
+            connection.close()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counts, size=len(self._entries), max_entries=self.max_entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+# Satu cache per (path, ukuran, TTL) per proses, dipakai bersama semua sesi Streamlit
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(path=None, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+    with _caches_lock:
+        cache = _caches.get((path, max_entries, ttl))
+        if cache is None:
+            cache = _caches[(path, max_entries, ttl)] = PredictionCache(max_entries, ttl, path)
+        return cache
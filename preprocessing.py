@@ -0,0 +1,101 @@
+"""Preprocessing teks yang sama persis untuk pelatihan dan aplikasi.
+
+Notebook membersihkan ``combined_text`` dengan ``clean_text`` (lowercase,
+hapus tag HTML/URL/karakter non-alfanumerik, tokenisasi, hapus stopword)
+lalu melakukan lematisasi dengan spaCy. ``TextPreprocessor`` membungkus
+kedua langkah itu dalam satu objek yang disimpan bersama model
+(``preprocessor.pkl``), sehingga teks saat pelatihan dan saat prediksi
+diproses oleh kode dan data yang sama.
+
+Jalur cepatnya:
+- regex dikompilasi sekali dan stopword disimpan sebagai ``frozenset``;
+- setelah karakter non-alfanumerik diganti spasi, ``nltk.word_tokenize``
+  setara dengan ``str.split`` ditambah pemecahan beberapa kontraksi
+  (``cannot`` -> ``can not``), sehingga tidak perlu punkt/Treebank;
+- lematisasi memakai tabel lookup token -> lemma yang dibangun sekali dari
+  spaCy saat ``fit``, bukan menjalankan pipeline spaCy per dokumen.
+"""
+import re
+from collections import Counter, defaultdict
+
+_HTML_TAG = re.compile(r"<.*?>")
+_URL = re.compile(r"http\S+")
+_NON_ALNUM = re.compile(r"[^a-zA-Z0-9]")
+# Kontraksi yang dipecah NLTKWordTokenizer walaupun tanpa tanda kutip
+_CONTRACTIONS = [
+    re.compile(pattern)
+    for pattern in (
+        r"\b(can)(not)\b", r"\b(gim)(me)\b", r"\b(gon)(na)\b",
+        r"\b(got)(ta)\b", r"\b(lem)(me)\b", r"\b(wan)(na)\b",
+    )
+]
+
+
+def english_stop_words():
+    import nltk
+    return nltk.corpus.stopwords.words("english")
+
+
+class TextPreprocessor:
+    """``clean_text`` + lematisasi dari notebook dalam satu objek yang bisa di-pickle."""
+
+    def __init__(self, stop_words=None):
+        self.stop_words = frozenset(english_stop_words() if stop_words is None else stop_words)
+        # Token (hasil clean) -> lemma; hanya token yang lemmanya berbeda yang disimpan
+        self.lemmas = {}
+
+    def tokenize(self, text):
+        for pattern in _CONTRACTIONS:
+            text = pattern.sub(r"\1 \2", text)
+        return text.split()
+
+    def clean(self, text):
+        """Sama dengan ``clean_text`` di notebook."""
+        if not isinstance(text, str):
+            return ""
+        text = text.lower()
+        text = _HTML_TAG.sub("", text)
+        text = _URL.sub("", text)
+        text = _NON_ALNUM.sub(" ", text)
+        stop_words = self.stop_words
+        return " ".join(token for token in self.tokenize(text) if token not in stop_words)
+
+    def lemmatize(self, text):
+        lemmas = self.lemmas
+        # filter(None, ...) membuang token yang lemmanya kosong, seperti di notebook
+        return " ".join(filter(None, (lemmas.get(token, token) for token in text.split())))
+
+    def __call__(self, text):
+        return self.lemmatize(self.clean(text))
+
+    def transform(self, texts):
+        return [self(text) for text in texts]
+
+    def fit(self, cleaned_texts, nlp=None, batch_size=50):
+        """Bangun tabel lemma dari spaCy atas teks yang sudah di-``clean``.
+
+        Untuk setiap token (dipisah spasi) diambil lemma spaCy yang paling
+        sering muncul; token yang dipecah spaCy (mis. ``10km``) disimpan
+        sebagai gabungan lemma sub-tokennya.
+        """
+        if nlp is None:
+            import spacy
+            nlp = spacy.load("en_core_web_sm", disable=["parser", "ner"])
+
+        counts = defaultdict(Counter)
+        for doc in nlp.pipe(cleaned_texts, batch_size=batch_size):
+            surface, lemmas = [], []
+            for token in doc:
+                surface.append(token.text)
+                if not token.is_punct and not token.is_space:
+                    lemmas.append(token.lemma_)
+                if token.whitespace_ or token.i == len(doc) - 1:
+                    counts["".join(surface)][" ".join(lemmas)] += 1
+                    surface, lemmas = [], []
+
+        self.lemmas = {}
+        for token, candidates in counts.items():
+            lemma = candidates.most_common(1)[0][0]
+            if lemma != token:
+                self.lemmas[token] = lemma
+        return self
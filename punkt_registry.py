@@ -0,0 +1,243 @@
+"""Registry tokenizer kalimat punkt multibahasa yang dimuat saat dibutuhkan.
+
+Repo menyertakan model punkt untuk 19 bahasa di ``nltk_data/tokenizers/punkt``
+(masing-masing 1-2 MB), tetapi selama ini setiap teks dipecah dengan model
+bahasa Inggris. ``PunktRegistry`` punya antarmuka ``tokenize(text)`` yang
+sama dengan tokenizer punkt sehingga bisa langsung dipakai ``PosTagger``:
+
+- bahasa dideteksi dari ~300 token pertama: aksara (Sirilik, Yunani,
+  Malayalam) atau jumlah kata fungsi yang umum per bahasa. Biayanya beberapa
+  mikrodetik per dokumen; jika tidak yakin, bahasa Inggris yang dipakai.
+  Teks yang sampai ke sini sudah di-preprocess (stopword bahasa Inggris
+  dibuang, lematisasi), jadi sisa token pendek seperti "en", "al" atau "di"
+  tidak boleh cukup: kata fungsi bahasa lain harus mencakup minimal
+  ``MIN_SHARE`` dari token sampel;
+- model punkt bahasa tersebut dimuat (``pos_tagging.load_punkt``) hanya saat
+  pertama dipakai;
+- paling banyak ``max_models`` model disimpan (LRU). Bahasa default tidak
+  pernah dikeluarkan;
+- jumlah dokumen, hit, muat, waktu muat dan eviction per bahasa tersedia
+  lewat ``stats()`` dan counter ``instrumentation``.
+
+Tokenisasi kata dan POS tagging tetap memakai model bahasa Inggris;
+registry ini hanya menentukan batas kalimat.
+
+NLTK >= 3.9 tidak lagi memuat model punkt dalam bentuk pickle, hanya format
+``punkt_tab``. ``python punkt_registry.py convert`` mengubah pickle bawaan
+repo menjadi ``nltk_data/tokenizers/punkt_tab/<bahasa>/``.
+
+Contoh:
+    python punkt_registry.py convert
+"""
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from instrumentation import count
+
+DEFAULT_LANGUAGE = "english"
+DEFAULT_MAX_MODELS = 4
+SAMPLE_CHARS = 2000
+SAMPLE_TOKENS = 300
+MIN_HITS = 3
+# Pada teks berbahasa lain kata fungsi biasanya 30-50% token; sisa kebetulan di teks Inggris jauh di bawahnya
+MIN_SHARE = 0.2
+SCRIPT_SHARE = 0.3
+
+# Kata fungsi yang sering muncul dan cukup khas untuk setiap bahasa punkt
+STOP_WORDS = {
+    "english": "the and of to in is for with you are that this will be our",
+    "german": "der die und das ist nicht mit sie ein eine für wir auf den sind",
+    "french": "le la les et des est pour vous une nous dans avec sur du au",
+    "spanish": "el los las y que en para con una por del es se su al",
+    "italian": "il di che per una sono con non gli del della nel le alla è",
+    "portuguese": "o que em para com uma os não do da são você na ao as",
+    "dutch": "de het een en van is voor met zijn wij niet op je bij",
+    "danish": "og at det er en til på med som af for vi ikke har",
+    "swedish": "och att det är en för på med som av vi inte till har",
+    "norwegian": "og det er en til på med som av for vi ikke har å",
+    "finnish": "ja on että ei se ovat myös tai kanssa joka olet sinä",
+    "estonian": "ja on et ei see ka kui oma või mis ning meie",
+    "czech": "a je se na že v pro jsou s to jako ve nebo",
+    "polish": "i w na jest że z do się nie dla oraz jak są",
+    "slovene": "in je da na za se so v z ki kot pri tudi",
+    "turkish": "ve bir bu için ile da de olarak çok daha gibi olan ne",
+}
+SCRIPTS = {
+    "russian": re.compile(r"[\u0400-\u04ff]"),
+    "greek": re.compile(r"[\u0370-\u03ff]"),
+    "malayalam": re.compile(r"[\u0d00-\u0d7f]"),
+}
+LANGUAGES = tuple(STOP_WORDS) + tuple(SCRIPTS)
+
+_WORD = re.compile(r"\w+")
+_LETTER = re.compile(r"[^\W\d_]")
+_WORD_LANGUAGES = {}
+for _language, _words in STOP_WORDS.items():
+    for _word in _words.split():
+        _WORD_LANGUAGES.setdefault(_word, []).append(_language)
+
+
+def detect_language(text, default=DEFAULT_LANGUAGE):
+    """Bahasa punkt yang paling cocok untuk ``text``; ``default`` jika tidak yakin."""
+    sample = text[:SAMPLE_CHARS]
+    letters = 0 if sample.isascii() else len(_LETTER.findall(sample))
+    if letters:
+        for language, pattern in SCRIPTS.items():
+            if len(pattern.findall(sample)) > letters * SCRIPT_SHARE:
+                return language
+
+    hits = Counter()
+    words = _WORD.findall(sample.lower())[:SAMPLE_TOKENS]
+    for word in words:
+        languages = _WORD_LANGUAGES.get(word)
+        if languages:
+            hits.update(languages)
+    if not hits:
+        return default
+    language, best = hits.most_common(1)[0]
+    # Bahasa lain harus jelas lebih kuat dari default agar iklan bahasa Inggris tidak salah rute
+    if best < MIN_HITS or best < MIN_SHARE * len(words) or best <= hits[default]:
+        return default
+    return language
+
+
+class PunktRegistry:
+    """Tokenizer kalimat yang memilih model punkt per dokumen dan menyimpan model dalam LRU."""
+
+    def __init__(self, max_models=DEFAULT_MAX_MODELS, default=DEFAULT_LANGUAGE, loader=None):
+        self.max_models = max(1, max_models)
+        self.default = default
+        self._loader = loader
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._failed = set()
+        self.counters = {name: Counter() for name in ("documents", "hits", "loads", "evictions", "failures")}
+        self.load_seconds = Counter()
+
+    def _load(self, language):
+        if self._loader is not None:
+            return self._loader(language)
+        # Lewat modul agar load_punkt yang diganti (tes, worker) ikut terpakai
+        import pos_tagging
+        return pos_tagging.load_punkt(language)
+
+    def get(self, language):
+        """Model punkt ``language`` (dimuat jika belum ada); bahasa yang gagal dimuat memakai default."""
+        with self._lock:
+            model = self._models.get(language)
+            if model is not None:
+                self._models.move_to_end(language)
+                self.counters["hits"][language] += 1
+                count("punkt_hits")
+                return model
+        if language in self._failed:
+            return self.get(self.default)
+
+        start = time.perf_counter()
+        try:
+            model = self._load(language)
+        except (LookupError, OSError):
+            if language == self.default:
+                raise
+            with self._lock:
+                self._failed.add(language)
+                self.counters["failures"][language] += 1
+            return self.get(self.default)
+        seconds = time.perf_counter() - start
+
+        with self._lock:
+            # Thread lain mungkin sudah memuat bahasa yang sama
+            model = self._models.setdefault(language, model)
+            self._models.move_to_end(language)
+            self.counters["loads"][language] += 1
+            self.load_seconds[language] += seconds
+            count("punkt_loads")
+            while len(self._models) > self.max_models:
+                victim = next(name for name in self._models if name != self.default)
+                del self._models[victim]
+                self.counters["evictions"][victim] += 1
+        return model
+
+    def tokenize(self, text):
+        language = detect_language(text, self.default)
+        with self._lock:
+            self.counters["documents"][language] += 1
+        return self.get(language).tokenize(text)
+
+    def stats(self):
+        """Counter per bahasa dan daftar model yang sedang dimuat (urutan LRU, terbaru terakhir)."""
+        with self._lock:
+            languages = sorted(set().union(*self.counters.values()))
+            return {
+                "loaded": list(self._models),
+                "max_models": self.max_models,
+                "languages": {
+                    language: {
+                        **{name: counter[language] for name, counter in self.counters.items()},
+                        "load_seconds": self.load_seconds[language],
+                    }
+                    for language in languages
+                },
+            }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Registry bersama untuk seluruh proses (model punkt tidak bergantung pada artefak model)."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PunktRegistry()
+    return _registry
+
+
+def convert_pickles(source, output):
+    """Tulis parameter setiap model pickle di ``source`` sebagai ``punkt_tab`` di ``output``.
+
+    Pickle di ``source/PY3`` dipakai jika ada; sisanya adalah pickle Python 2
+    yang dibaca dengan ``encoding="latin1"``. Kembalikan daftar bahasa.
+    """
+    import pickle
+
+    from nltk.tokenize.punkt import save_punkt_params
+
+    languages = []
+    names = sorted(name[:-len(".pickle")] for name in os.listdir(source) if name.endswith(".pickle"))
+    for language in names:
+        py3_path = os.path.join(source, "PY3", f"{language}.pickle")
+        path = py3_path if os.path.exists(py3_path) else os.path.join(source, f"{language}.pickle")
+        # pickle.load biasa: hanya untuk file bawaan repo, bukan input pengguna
+        with open(path, "rb") as f:
+            tokenizer = pickle.load(f, encoding="latin1")
+        os.makedirs(output, exist_ok=True)
+        save_punkt_params(tokenizer._params, dir=os.path.join(output, language))
+        languages.append(language)
+    return languages
+
+
+def main(argv=None):
+    import argparse
+
+    from pos_tagging import NLTK_DATA_PATH
+
+    parser = argparse.ArgumentParser(description="Konversi model punkt pickle ke format punkt_tab.")
+    parser.add_argument("command", choices=["convert"])
+    parser.add_argument("--source", default=os.path.join(NLTK_DATA_PATH, "tokenizers", "punkt"))
+    parser.add_argument("--output", default=os.path.join(NLTK_DATA_PATH, "tokenizers", "punkt_tab"))
+    args = parser.parse_args(argv)
+
+    languages = convert_pickles(args.source, args.output)
+    print(f"{len(languages)} bahasa ditulis ke {args.output}: {', '.join(languages)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
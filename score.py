@@ -0,0 +1,159 @@
+"""CLI untuk menilai iklan lowongan kerja tanpa Streamlit.
+
+Input berupa CSV (skema fake_job_postings.csv), JSONL (satu objek per baris,
+dengan field ``text`` atau kolom-kolom posting) atau teks biasa (satu iklan
+per baris). Output selalu JSONL, satu hasil per input.
+
+Contoh:
+    python score.py fake_job_postings.csv > hasil.jsonl
+    cat postings.jsonl | python score.py --format jsonl
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+
+import instrumentation
+from batch import DEFAULT_CHUNKSIZE, ID_COLUMN, TEXT_COLUMNS, combine_columns, iter_chunks, pos_pool_for
+from model_bundle import artifact_paths, get_bundle
+from near_duplicates import DEFAULT_PATH as DEFAULT_DEDUP_PATH, get_index as get_duplicate_index
+from prediction_cache import DEFAULT_PATH as DEFAULT_CACHE_PATH, get_cache
+from scoring import DEFAULT_THRESHOLD, predict
+
+FORMATS = ("auto", "csv", "jsonl", "text")
+
+
+def detect_format(path, first_line):
+    extension = os.path.splitext(path)[1].lower() if path != "-" else ""
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".json", ".ndjson"):
+        return "jsonl"
+    if first_line.lstrip().startswith("{"):
+        return "jsonl"
+    header = next(csv.reader([first_line]), [])
+    if {ID_COLUMN, "title", "combined_text", "text"} & set(header):
+        return "csv"
+    return "text"
+
+
+def read_records(lines, fmt):
+    if fmt == "csv":
+        yield from csv.DictReader(lines)
+    elif fmt == "jsonl":
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        for line in lines:
+            if line.strip():
+                yield {"text": line.rstrip("\r\n")}
+
+
+def record_text(record):
+    """Teks satu record; ``TypeError`` jika record, ``text`` atau kolom posting bukan string.
+
+    Divalidasi di sini agar satu input rusak ditolak sendiri dan tidak
+    menggagalkan seluruh batch/micro-batch di ``predict``.
+    """
+    if not isinstance(record, dict):
+        raise TypeError(f"posting harus string atau objek, bukan {type(record).__name__}")
+    fields = ["text"] if "text" in record else [*TEXT_COLUMNS, "combined_text"]
+    for field in fields:
+        value = record.get(field)
+        if value is not None and not isinstance(value, str):
+            raise TypeError(f"field {field!r} harus string, bukan {type(value).__name__}")
+    if "text" in record:
+        return record["text"] or ""
+    return combine_columns(record)
+
+
+def score_records(records, bundle, chunksize=DEFAULT_CHUNKSIZE, with_words=True,
+                  threshold=DEFAULT_THRESHOLD, workers=1, cache=None, duplicates=None, cascade=None):
+    """Generator hasil (dict) untuk setiap record, diproses per chunk."""
+    index = 0
+    with pos_pool_for(workers) as pos_pool:
+        for chunk in iter_chunks(records, chunksize):
+            texts = [record_text(record) for record in chunk]
+            results = predict(bundle, texts, with_words=with_words, threshold=threshold, pos_pool=pos_pool,
+                              cache=cache, duplicates=duplicates, cascade=cascade)
+            for record, result in zip(chunk, results):
+                yield {"id": record.get(ID_COLUMN, record.get("id", index)), **result}
+                index += 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deteksi iklan lowongan kerja palsu (output JSONL).")
+    parser.add_argument("input", nargs="?", default="-", help="file input, atau '-' untuk stdin")
+    parser.add_argument("-o", "--output", default="-", help="file output JSONL, atau '-' untuk stdout")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="auto")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="ambang probabilitas palsu (default 0.5)")
+    parser.add_argument("--workers", type=int, default=1, help="jumlah proses untuk POS tagging")
+    parser.add_argument("--artifacts-dir", default=None, help="folder berisi file .pkl model")
+    parser.add_argument("--no-words", action="store_true", help="jangan sertakan highlight_words")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_PATH, default=None, metavar="PATH",
+                        help=f"pakai cache prediksi sqlite3 (default {DEFAULT_CACHE_PATH}, sama dengan aplikasi)")
+    parser.add_argument("--dedup", nargs="?", const=DEFAULT_DEDUP_PATH, default=None, metavar="PATH",
+                        help=f"pakai indeks iklan hampir-duplikat (default {DEFAULT_DEDUP_PATH})")
+    parser.add_argument("--cascade", action="store_true",
+                        help="early exit dengan model tahap pertama (cascade_model.pkl, lihat cascade.py)")
+    parser.add_argument("--cascade-band", nargs=2, type=float, default=None, metavar=("LOW", "HIGH"),
+                        help="pita ketidakpastian cascade (default: pita yang disimpan bersama model)")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="aktifkan timer per tahap dan tulis metrik Prometheus ke PATH di akhir")
+    args = parser.parse_args(argv)
+
+    if args.metrics:
+        instrumentation.configure(enabled=True)
+    bundle = get_bundle(artifact_paths(args.artifacts_dir))
+    cache = get_cache(args.cache) if args.cache else None
+    duplicates = get_duplicate_index(args.dedup) if args.dedup else None
+    cascade = None
+    if args.cascade:
+        if bundle.cascade is None:
+            parser.error("--cascade butuh cascade_model.pkl; jalankan 'python cascade.py fit' dulu")
+        cascade = bundle.cascade.banded(*args.cascade_band) if args.cascade_band else bundle.cascade
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        first_line = source.readline()
+        fmt = args.format if args.format != "auto" else detect_format(args.input, first_line)
+        records = read_records(itertools.chain([first_line], source), fmt)
+
+        start = time.perf_counter()
+        rows = early_exits = 0
+        results = score_records(records, bundle, args.chunksize, with_words=not args.no_words,
+                                threshold=args.threshold, workers=args.workers, cache=cache, duplicates=duplicates,
+                                cascade=cascade)
+        for result in results:
+            sink.write(json.dumps(result, ensure_ascii=False) + "\n")
+            rows += 1
+            early_exits += result.get("stage") == "first"
+        elapsed = time.perf_counter() - start
+        print(f"{rows} baris dalam {elapsed:.2f} detik ({rows / elapsed if elapsed else 0:.0f} baris/detik)",
+              file=sys.stderr)
+        if args.metrics:
+            with open(args.metrics, "w", encoding="utf-8") as f:
+                f.write(instrumentation.prometheus_text())
+        if cascade is not None:
+            print(f"cascade: {early_exits} early exit ({early_exits / rows if rows else 0:.1%}), "
+                  f"pita {cascade.low}-{cascade.high}", file=sys.stderr)
+        if cache is not None:
+            stats = cache.stats()
+            print(f"cache: {stats['hits']} hit, {stats['misses']} miss ({stats['hit_rate']:.1%})", file=sys.stderr)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""Logika inferensi tanpa Streamlit.
+
+Modul ini hanya bergantung pada numpy/scipy/scikit-learn/nltk sehingga bisa
+dipakai oleh ``app.py``, prediksi batch, maupun CLI ``score.py`` tanpa ikut
+memuat Streamlit, matplotlib atau seaborn.
+"""
+from collections import namedtuple
+
+import numpy as np
+from scipy.sparse import hstack
+from scipy.special import expit, logit
+
+from instrumentation import count, stage
+
+TOP_WORDS = 5
+DEFAULT_THRESHOLD = 0.5
+
+Scores = namedtuple("Scores", ["labels", "probabilities", "logits"])
+
+
+def featurize(bundle, texts, pos_pool=None):
+    """Kembalikan (matriks teks, matriks gabungan teks + POS) untuk daftar dokumen.
+
+    ``pos_pool`` (``pos_tagging.PosTaggingPool``) membagi POS tagging ke
+    beberapa proses; tanpa pool, tagging berjalan di proses ini.
+    """
+    n = len(texts)
+    # Preprocessing yang sama dengan pelatihan (clean_text + lematisasi)
+    with stage("preprocess", n):
+        texts = bundle.preprocess(texts)
+    with stage("pos", n):
+        pos_features = (pos_pool or bundle.pos_tagger).map(texts)
+    with stage("vectorize_text", n):
+        text_matrix = bundle.vectorizer_text.transform(texts)
+    with stage("vectorize_pos", n):
+        pos_matrix = bundle.vectorizer_pos.transform(pos_features)
+    with stage("hstack", n):
+        combined_matrix = hstack([text_matrix, pos_matrix]).tocsr()
+    return text_matrix, combined_matrix
+
+
+def fraud_parameters(model):
+    """Bobot per fitur dan intercept model ke arah kelas palsu (1)."""
+    coef, intercept = model.coef_[0], model.intercept_[0]
+    if model.classes_[1] == 1:
+        return coef, intercept
+    return -coef, -intercept
+
+
+def score_matrix(model, matrix, threshold=DEFAULT_THRESHOLD):
+    """Label, probabilitas palsu dan logit dari satu perkalian sparse dengan ``coef_``.
+
+    Menggantikan pasangan ``model.predict`` + ``model.predict_proba`` yang
+    masing-masing menghitung ulang decision function. ``threshold`` adalah
+    ambang probabilitas palsu; dengan 0.5 hasilnya sama dengan ``predict``.
+    """
+    weights, intercept = fraud_parameters(model)
+    logits = matrix @ weights + intercept
+    labels = (logits > logit(threshold)).astype(np.int64)
+    return Scores(labels, expit(logits), logits)
+
+
+def explain(bundle, text_matrix, row=0, k=TOP_WORDS):
+    """Term dengan kontribusi terbesar (count x bobot) ke logit palsu pada satu baris.
+
+    Hanya memakai nonzero baris CSR, jadi O(nnz) tanpa ``toarray`` atau
+    ``get_feature_names_out`` per prediksi. Mengembalikan dict ``fraud``
+    (kontribusi positif) dan ``real`` (kontribusi negatif), masing-masing
+    berisi pasangan [term, kontribusi] terurut dari yang paling kuat.
+    """
+    start, end = text_matrix.indptr[row], text_matrix.indptr[row + 1]
+    columns = text_matrix.indices[start:end]
+    weights, _ = fraud_parameters(bundle.model)
+    contributions = text_matrix.data[start:end] * weights[columns]
+    return {
+        "fraud": _top_terms(bundle, columns, contributions, k),
+        "real": _top_terms(bundle, columns, -contributions, k, sign=-1),
+    }
+
+
+def _top_terms(bundle, columns, scores, k, sign=1):
+    positive = scores > 0
+    columns, scores = columns[positive], scores[positive]
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+        columns, scores = columns[top], scores[top]
+    order = np.argsort(-scores, kind="stable")
+    names = bundle.text_feature_names(columns[order])
+    return [[name, float(sign * score)] for name, score in zip(names, scores[order])]
+
+
+def predict(bundle, texts, with_words=True, threshold=DEFAULT_THRESHOLD, pos_pool=None, term_counts=None,
+            cache=None, duplicates=None, cascade=None):
+    """Prediksi banyak dokumen sekaligus; satu dict hasil per dokumen.
+
+    Jika ``term_counts`` (``term_counts.TermCounts``) diberikan, jumlah term
+    dokumen ditambahkan ke tabel word cloud sesuai label prediksinya. Dengan
+    ``cache`` (``prediction_cache.PredictionCache``), hanya teks yang belum
+    ada di cache yang diproses. Dengan ``duplicates``
+    (``near_duplicates.DuplicateIndex``), teks yang hampir sama dengan klaster
+    iklan palsu yang dikenal langsung memakai verdict klaster tersebut, dan
+    iklan yang diprediksi palsu ditambahkan ke indeks. Dengan ``cascade``
+    (``cascade.CascadeModel``), hanya iklan di dalam pita ketidakpastian
+    model tahap pertama yang diproses model penuh; jika ``threshold`` di luar
+    pita, semua iklan diproses model penuh.
+    """
+    if cascade is not None and not cascade.covers(threshold):
+        # Iklan di sekitar ambang akan diputus model tahap pertama tanpa pernah sampai ke model penuh
+        cascade = None
+    if cache is not None:
+        return _predict_cached(bundle, list(texts), with_words, threshold, pos_pool, term_counts, cache,
+                               duplicates, cascade)
+    if duplicates is not None:
+        return _predict_deduplicated(bundle, list(texts), with_words, threshold, pos_pool, term_counts,
+                                     duplicates, cascade)
+    if cascade is not None:
+        return _predict_cascade(bundle, list(texts), with_words, threshold, pos_pool, term_counts, cascade)
+
+    count("predictions", len(texts))
+    text_matrix, combined_matrix = featurize(bundle, texts, pos_pool)
+    with stage("score", len(texts)):
+        scores = score_matrix(bundle.model, combined_matrix, threshold)
+    if term_counts is not None:
+        with stage("term_counts", len(texts)):
+            term_counts.update(text_matrix, scores.labels)
+
+    results = []
+    for i, (label, prob, logit_value) in enumerate(zip(*scores)):
+        result = {"prediction": int(label), "probability": float(prob), "logit": float(logit_value)}
+        if with_words:
+            with stage("explain"):
+                explanation = explain(bundle, text_matrix, i)
+            result["highlight_words"] = [term for term, _ in explanation["fraud"]]
+            result["explanation"] = explanation
+        results.append(result)
+    return results
+
+
+def _predict_cached(bundle, texts, with_words, threshold, pos_pool, term_counts, cache, duplicates, cascade):
+    # Hasil cascade bisa berasal dari model tahap pertama; jangan dipakai untuk prediksi model penuh
+    variant = cascade.variant if cascade is not None else ""
+    keys = [cache.key(bundle.version, text, variant) for text in texts]
+    results = cache.get_many(keys, with_words)
+    missing = [i for i, result in enumerate(results) if result is None]
+    count("cache_hits", len(texts) - len(missing))
+    if missing:
+        fresh = predict(bundle, [texts[i] for i in missing], with_words, threshold, pos_pool, term_counts,
+                        duplicates=duplicates, cascade=cascade)
+        cache.put_many([(keys[i], result) for i, result in zip(missing, fresh)])
+        for i, result in zip(missing, fresh):
+            results[i] = result
+    # Label dihitung ulang dari logit karena hasil di cache bisa berasal dari ambang lain
+    cutoff = logit(threshold)
+    return [{**result, "prediction": int(result["logit"] > cutoff)} for result in results]
+
+
+def _predict_deduplicated(bundle, texts, with_words, threshold, pos_pool, term_counts, duplicates, cascade):
+    with stage("duplicate_lookup", len(texts)):
+        matches = duplicates.lookup(texts, bundle.version)
+    results = [None] * len(texts)
+    for i, match in enumerate(matches):
+        if match is not None and match.label == 1:
+            probability = min(max(match.probability, 1e-12), 1 - 1e-12)
+            result = {
+                "prediction": int(probability > threshold),
+                "probability": probability,
+                "logit": float(logit(probability)),
+                "duplicate_of": match.cluster,
+                "similarity": match.similarity,
+            }
+            if with_words:
+                result["highlight_words"] = []
+                result["explanation"] = {"fraud": [], "real": []}
+            results[i] = result
+
+    missing = [i for i, result in enumerate(results) if result is None]
+    count("duplicate_matches", len(texts) - len(missing))
+    if missing:
+        fresh = predict(bundle, [texts[i] for i in missing], with_words, threshold, pos_pool, term_counts,
+                        cascade=cascade)
+        for i, result in zip(missing, fresh):
+            results[i] = result
+        # Hanya iklan palsu yang disimpan: indeks dipakai untuk mengenali kampanye penipuan
+        fraud = [(texts[i], result["probability"]) for i, result in zip(missing, fresh) if result["prediction"] == 1]
+        if fraud:
+            with stage("duplicate_add", len(fraud)):
+                duplicates.add([text for text, _ in fraud], [1] * len(fraud), [prob for _, prob in fraud],
+                               bundle.version)
+    return results
+
+
+def _predict_cascade(bundle, texts, with_words, threshold, pos_pool, term_counts, cascade):
+    with stage("cascade_first", len(texts)):
+        matrix, logits = cascade.first_stage(bundle, texts)
+    probabilities = expit(logits)
+    uncertain = cascade.uncertain(probabilities)
+    certain = np.flatnonzero(~uncertain)
+    count("cascade_early_exit", len(certain))
+
+    results = [None] * len(texts)
+    cutoff = logit(threshold)
+    for i in certain:
+        result = {"prediction": int(logits[i] > cutoff), "probability": float(probabilities[i]),
+                  "logit": float(logits[i]), "stage": "first"}
+        if with_words:
+            # Penjelasan dari bobot model tahap pertama (CascadeModel meniru antarmuka bundle)
+            explanation = explain(cascade, matrix, i)
+            result["highlight_words"] = [term for term, _ in explanation["fraud"]]
+            result["explanation"] = explanation
+        results[i] = result
+    if term_counts is not None and len(certain):
+        # Tabel word cloud memakai vocabulary model penuh; vectorizer teks jauh lebih murah dari POS tagging
+        with stage("term_counts", len(certain)):
+            certain_texts = bundle.preprocess([texts[i] for i in certain])
+            term_counts.update(bundle.vectorizer_text.transform(certain_texts),
+                               [results[i]["prediction"] for i in certain])
+
+    missing = np.flatnonzero(uncertain)
+    if len(missing):
+        fresh = predict(bundle, [texts[i] for i in missing], with_words, threshold, pos_pool, term_counts)
+        for i, result in zip(missing, fresh):
+            results[i] = {**result, "stage": "full"}
+    return results
+
@@ -0,0 +1,262 @@
+"""Indeks terbalik untuk pencarian lowongan di halaman "📌 Tentang".
+
+``str.contains`` atas kolom ``title`` memindai seluruh baris pada setiap
+ketikan. ``build_index`` membuat indeks sekali dari store kolumnar
+(``dataset_store.py``) atas kolom ``title``, ``company_profile``,
+``description`` dan ``requirements``, lalu menyimpannya sebagai array numpy
+di versi baru ``dataset/search/<versi>/`` yang dipasang dengan mengganti
+``dataset/search/CURRENT`` (lihat ``versioned_dir.py``), sehingga rebuild
+tidak pernah menulis ulang file yang masih dipetakan ``SearchIndex`` di sesi
+lain. Isi setiap versi:
+
+- ``terms.npy`` + ``term_offsets.npy`` : term (UTF-8) terurut;
+- ``posting_offsets.npy``, ``docs.npy``, ``weights.npy`` : posting list per
+  term (nomor baris terurut dan bobot BM25 yang sudah dihitung);
+- ``labels.npy`` : label ``fraudulent`` per baris untuk filter;
+- ``manifest.json`` : parameter dan versi store sumber.
+
+``SearchIndex`` membaca folder tersebut dengan ``mmap_mode='r'``. Query
+multi-term dicocokkan dengan AND (term terakhir juga dicocokkan sebagai
+prefiks karena query diketik bertahap), skor BM25 dijumlahkan, dan top-k
+dipilih dengan ``argpartition``.
+
+Contoh:
+    python search_index.py
+"""
+import bisect
+import functools
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+import versioned_dir
+from dataset_store import STORE_DIR, ensure_store, load_columns, load_stats
+
+INDEX_DIR = "search"
+MANIFEST = "manifest.json"
+SEARCH_COLUMNS = ["title", "company_profile", "description", "requirements"]
+TOKEN_PATTERN = r"(?u)\b\w+\b"
+# Kemunculan di title dihitung beberapa kali agar judul yang cocok naik ke atas
+TITLE_WEIGHT = 3
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_PREFIX_TERMS = 64
+
+# truncated: prefiks term terakhir cocok dengan lebih dari MAX_PREFIX_TERMS term, jadi total adalah batas bawah
+Hits = namedtuple("Hits", ["rows", "scores", "total", "truncated"], defaults=(False,))
+
+
+def build_index(store_dir=STORE_DIR):
+    """Bangun indeks dari store di ``store_dir``; kembalikan manifest-nya."""
+    from sklearn.feature_extraction.text import CountVectorizer
+
+    df = load_columns(SEARCH_COLUMNS + ["fraudulent"], store_dir)
+    texts = df[SEARCH_COLUMNS].fillna("").astype(str)
+    combined = texts[SEARCH_COLUMNS[0]].str.cat([texts[c] for c in SEARCH_COLUMNS[1:]], sep=" ")
+
+    vectorizer = CountVectorizer(token_pattern=TOKEN_PATTERN, dtype=np.int32)
+    counts = vectorizer.fit_transform(combined)
+    counts = counts + (TITLE_WEIGHT - 1) * vectorizer.transform(texts["title"])
+    # Kolom CountVectorizer sudah terurut secara leksikografis (sama dengan urutan byte UTF-8)
+    terms = [term.encode("utf-8") for term in vectorizer.get_feature_names_out()]
+
+    postings = counts.tocsc()
+    postings.sort_indices()
+    n_docs = counts.shape[0]
+    doc_lengths = np.asarray(counts.sum(axis=1)).ravel()
+    avg_length = doc_lengths.mean() if n_docs else 0.0
+    doc_freq = np.diff(postings.indptr)
+    idf = np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    tf = postings.data.astype(np.float32)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[postings.indices] / max(avg_length, 1e-9))
+    weights = np.repeat(idf, doc_freq) * tf * (BM25_K1 + 1) / (tf + norm)
+
+    term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum([len(term) for term in terms], out=term_offsets[1:])
+
+    directory = os.path.join(store_dir, INDEX_DIR)
+    staged = versioned_dir.staging(directory)
+    arrays = {
+        "terms": np.frombuffer(b"".join(terms), dtype=np.uint8),
+        "term_offsets": term_offsets,
+        "posting_offsets": postings.indptr.astype(np.int64),
+        "docs": postings.indices.astype(np.int32),
+        "weights": weights.astype(np.float32),
+        "labels": df["fraudulent"].to_numpy(dtype=np.int8),
+    }
+    for name, array in arrays.items():
+        np.save(os.path.join(staged, name + ".npy"), array)
+
+    manifest = {
+        "columns": SEARCH_COLUMNS,
+        "token_pattern": TOKEN_PATTERN,
+        "title_weight": TITLE_WEIGHT,
+        "k1": BM25_K1,
+        "b": BM25_B,
+        "n_terms": len(terms),
+        "n_docs": int(n_docs),
+        "source_mtime_ns": load_stats(store_dir)["source_mtime_ns"],
+    }
+    with open(os.path.join(staged, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    versioned_dir.publish(staged, directory)
+    return manifest
+
+
+def ensure_index(store_dir=STORE_DIR):
+    """Pastikan store dan indeks ada dan sesuai dengan CSV sumber."""
+    ensure_store(store_dir=store_dir)
+    active = versioned_dir.resolve(os.path.join(store_dir, INDEX_DIR))
+    if active is not None:
+        with open(os.path.join(active, MANIFEST), encoding="utf-8") as f:
+            if json.load(f).get("source_mtime_ns") == load_stats(store_dir)["source_mtime_ns"]:
+                return store_dir
+    build_index(store_dir)
+    return store_dir
+
+
+def get_index(store_dir=STORE_DIR):
+    """``SearchIndex`` untuk ``store_dir``, dimuat sekali per versi indeks."""
+    directory = os.path.join(store_dir, INDEX_DIR)
+    active = versioned_dir.resolve(directory)
+    if active is None:
+        raise FileNotFoundError(f"indeks pencarian belum dibangun di {directory}")
+    return _load_index(active)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_index(directory):
+    # Folder versi tidak pernah ditulis ulang, jadi path-nya cukup sebagai kunci cache
+    return SearchIndex(directory)
+
+
+class _Terms:
+    """Urutan term terurut di atas blob UTF-8, untuk ``bisect``."""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]])
+
+
+class SearchIndex:
+    def __init__(self, directory, mmap_mode="r"):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self._token_re = re.compile(self.manifest["token_pattern"])
+
+        def load(name):
+            return np.load(os.path.join(directory, name + ".npy"), mmap_mode=mmap_mode)
+
+        self.terms = _Terms(load("terms"), load("term_offsets"))
+        self.posting_offsets = load("posting_offsets")
+        self.docs = load("docs")
+        self.weights = load("weights")
+        self.labels = load("labels")
+
+    def tokenize(self, query):
+        # Sama dengan analyzer CountVectorizer saat indeks dibangun (lowercase + token_pattern)
+        return list(dict.fromkeys(self._token_re.findall(query.lower())))
+
+    def _postings(self, position):
+        start, end = self.posting_offsets[position], self.posting_offsets[position + 1]
+        return self.docs[start:end], self.weights[start:end]
+
+    def _term_range(self, term, prefix):
+        key = term.encode("utf-8")
+        lo = bisect.bisect_left(self.terms, key)
+        hi = bisect.bisect_left(self.terms, key + b"\xff", lo) if prefix else lo + 1
+        hi = min(hi, len(self.terms))
+        if not prefix and (lo >= hi or self.terms[lo] != key):
+            lo = hi
+        return lo, hi
+
+    def prefix_count(self, term):
+        """Jumlah term di indeks yang berawalan ``term``."""
+        lo, hi = self._term_range(term, prefix=True)
+        return max(hi - lo, 0)
+
+    def postings(self, term, prefix=False):
+        """(nomor baris, bobot) untuk ``term``; jika ``prefix``, gabungan term berawalan ``term``.
+
+        Prefiks yang cocok dengan lebih dari ``MAX_PREFIX_TERMS`` term hanya
+        memakai ``MAX_PREFIX_TERMS`` term pertama (lihat ``Hits.truncated``).
+        """
+        lo, hi = self._term_range(term, prefix)
+        if lo >= hi:
+            return np.empty(0, np.int32), np.empty(0, np.float32)
+        if hi - lo == 1:
+            return self._postings(lo)
+
+        # Untuk prefiks pendek, batasi jumlah term yang digabung
+        parts = [self._postings(i) for i in range(lo, min(hi, lo + MAX_PREFIX_TERMS))]
+        docs, inverse = np.unique(np.concatenate([d for d, _ in parts]), return_inverse=True)
+        weights = np.zeros(len(docs), dtype=np.float32)
+        np.maximum.at(weights, inverse, np.concatenate([w for _, w in parts]))
+        return docs, weights
+
+    def search(self, query, k=15, label=None, prefix=True):
+        """Top-``k`` baris yang memuat semua term ``query``, opsional hanya ``label`` (0/1)."""
+        terms = self.tokenize(query)
+        if not terms:
+            return Hits(np.empty(0, np.int64), np.empty(0, np.float32), 0)
+
+        lists = [self.postings(term, prefix=prefix and i == len(terms) - 1) for i, term in enumerate(terms)]
+        truncated = prefix and self.prefix_count(terms[-1]) > MAX_PREFIX_TERMS
+        # Mulai dari posting list terpendek agar irisan tetap kecil
+        lists.sort(key=lambda postings: len(postings[0]))
+        docs, scores = lists[0]
+        scores = np.asarray(scores, dtype=np.float32)
+        for other_docs, other_weights in lists[1:]:
+            if not len(docs):
+                break
+            docs, mine, theirs = np.intersect1d(docs, other_docs, assume_unique=True, return_indices=True)
+            scores = scores[mine] + other_weights[theirs]
+
+        if label is not None:
+            mask = self.labels[docs] == label
+            docs, scores = docs[mask], scores[mask]
+
+        total = len(docs)
+        if total > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            docs, scores = docs[top], scores[top]
+        order = np.argsort(-scores, kind="stable")
+        return Hits(np.asarray(docs[order], dtype=np.int64), scores[order], total, truncated)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bangun indeks pencarian untuk store dataset.")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    parser.add_argument("query", nargs="?", help="jika diisi, jalankan pencarian setelah indeks siap")
+    args = parser.parse_args(argv)
+
+    ensure_store(store_dir=args.store_dir)
+    manifest = build_index(args.store_dir)
+    print(f"{manifest['n_terms']:,} term dari {manifest['n_docs']:,} baris diindeks")
+    if args.query:
+        hits = get_index(args.store_dir).search(args.query)
+        for row, score in zip(hits.rows, hits.scores):
+            print(f"{row}\t{score:.3f}")
+        print(f"{'setidaknya ' if hits.truncated else ''}{hits.total:,} baris cocok")
+        if hits.truncated:
+            print(f"awalan '{args.query.split()[-1]}' cocok dengan lebih dari {MAX_PREFIX_TERMS} term; "
+                  "hasil tidak lengkap", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
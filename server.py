@@ -0,0 +1,241 @@
+"""Layanan HTTP JSON untuk prediksi dengan micro-batching.
+
+Request yang datang bersamaan dikumpulkan selama beberapa milidetik lalu
+diproses sebagai satu batch: satu ``transform`` sparse untuk setiap
+vectorizer dan satu perkalian dengan bobot model (lihat ``scoring.predict``).
+
+Endpoint:
+    POST /score    {"text": "..."} atau {"postings": [{...}, ...]}
+    GET  /metrics  latensi p50/p99, histogram ukuran batch dan counter tokenizer punkt per bahasa
+    GET  /metrics/prometheus  waktu per tahap (teks Prometheus, lihat instrumentation.py)
+    GET  /health
+
+Contoh:
+    python server.py --port 8000 --max-wait-ms 5
+    curl -s localhost:8000/score -d '{"text": "Work from home, earn money fast"}'
+"""
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import instrumentation
+from model_bundle import artifact_paths, get_bundle
+from punkt_registry import get_registry
+from score import record_text
+from scoring import DEFAULT_THRESHOLD, predict
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_WAIT = 0.005
+LATENCY_WINDOW = 10000
+
+
+class _Pending:
+    __slots__ = ("texts", "with_words", "done", "results", "error", "submitted")
+
+    def __init__(self, texts, with_words):
+        self.texts = texts
+        self.with_words = with_words
+        self.done = threading.Event()
+        self.results = None
+        self.error = None
+        self.submitted = time.perf_counter()
+
+
+class MicroBatcher:
+    """Gabungkan request bersamaan menjadi satu batch prediksi."""
+
+    def __init__(self, paths=None, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT,
+                 threshold=DEFAULT_THRESHOLD):
+        self.paths = paths
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.threshold = threshold
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._batch_sizes = Counter()
+        self._requests = 0
+        self._postings = 0
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, texts, with_words=False):
+        if not texts:
+            return []
+        pending = _Pending(texts, with_words)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.results
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        size = len(batch[0].texts)
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                pending = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(pending)
+            size += len(pending.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for pending in batch for text in pending.texts]
+            try:
+                # get_bundle() murah (hanya stat file) dan memuat ulang jika artefak berganti
+                bundle = get_bundle(self.paths)
+                results = predict(bundle, texts, with_words=any(p.with_words for p in batch),
+                                  threshold=self.threshold)
+            except Exception as e:  # diteruskan ke setiap request dalam batch
+                for pending in batch:
+                    pending.error = e
+                    pending.done.set()
+                continue
+
+            offset = 0
+            now = time.perf_counter()
+            with self._lock:
+                self._batch_sizes[_bucket(len(texts))] += 1
+                for pending in batch:
+                    self._latencies.append(now - pending.submitted)
+                    self._requests += 1
+                    self._postings += len(pending.texts)
+            for pending in batch:
+                pending.results = results[offset:offset + len(pending.texts)]
+                offset += len(pending.texts)
+                pending.done.set()
+
+    def metrics(self):
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            batch_sizes = dict(sorted(self._batch_sizes.items()))
+            requests, postings = self._requests, self._postings
+        p50, p99 = (float(v) for v in np.percentile(latencies, [50, 99])) if len(latencies) else (None, None)
+        return {
+            "requests": requests,
+            "postings": postings,
+            "latency_ms": {"p50": p50, "p99": p99, "window": len(latencies)},
+            # Kunci histogram adalah batas atas bucket (pangkat dua)
+            "batch_size_histogram": {str(k): v for k, v in batch_sizes.items()},
+            "queue_depth": self._queue.qsize(),
+            "punkt": get_registry().stats(),
+        }
+
+
+def _bucket(size):
+    bucket = 1
+    while bucket < size:
+        bucket *= 2
+    return bucket
+
+
+def parse_request(payload):
+    """Kembalikan (daftar teks, apakah request tunggal)."""
+    if isinstance(payload, dict) and "postings" in payload:
+        postings, single = payload["postings"], False
+        if not isinstance(postings, list):
+            raise TypeError("field 'postings' harus list")
+    elif isinstance(payload, list):
+        postings, single = payload, False
+    else:
+        postings, single = [payload], True
+    texts = [posting if isinstance(posting, str) else record_text(posting) for posting in postings]
+    return texts, single
+
+
+class ScoringServer(ThreadingHTTPServer):
+    # Backlog default (5) terlalu kecil untuk banyak koneksi bersamaan
+    request_queue_size = 128
+
+
+def make_handler(batcher):
+    class ScoreHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                self._send(200, batcher.metrics())
+            elif self.path == "/metrics/prometheus":
+                data = instrumentation.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            elif self.path == "/health":
+                self._send(200, {"status": "ok"})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/score":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"null")
+                texts, single = parse_request(payload)
+                with_words = isinstance(payload, dict) and bool(payload.get("explain"))
+            except (ValueError, TypeError, AttributeError) as e:
+                self._send(400, {"error": f"request tidak valid: {e}"})
+                return
+            try:
+                results = batcher.submit(texts, with_words=with_words)
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+                return
+            self._send(200, results[0] if single else {"results": results})
+
+        def log_message(self, format, *args):
+            pass  # metrik tersedia di /metrics; hindari log per request
+
+    return ScoreHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan HTTP prediksi iklan lowongan kerja palsu.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT * 1000)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--artifacts-dir", default=None)
+    args = parser.parse_args(argv)
+
+    paths = artifact_paths(args.artifacts_dir)
+    get_bundle(paths)  # muat di awal agar request pertama tidak menunggu
+    batcher = MicroBatcher(paths, args.max_batch, args.max_wait_ms / 1000, args.threshold)
+    server = ScoringServer((args.host, args.port), make_handler(batcher))
+    print(f"Melayani di http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
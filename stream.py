@@ -0,0 +1,301 @@
+"""Skoring aliran (stream) iklan JSON lines dengan asyncio dan backpressure.
+
+Sumber input berupa file yang terus bertambah (seperti ``tail -f``) atau
+socket lokal (TCP/Unix) yang mengirim satu objek JSON per baris, dengan
+skema yang sama seperti ``score.py`` (field ``text`` atau kolom posting).
+
+Alur:
+
+    sumber -> antrean (maks. --max-queue) -> batcher -> executor (predict) -> writer -> sink
+
+- Batcher mengambil semua yang sudah antre (sampai ``--max-batch``); jika
+  antrean sepi, ia menunggu paling lama ``--max-wait-ms`` sejak item
+  pertama. Saat beban tinggi batch penuh tanpa menunggu, saat sepi latensi
+  tetap rendah.
+- ``scoring.predict`` berjalan di thread executor; dengan ``--workers`` > 1
+  POS tagging dibagi ke proses lain (``PosTaggingPool``).
+- Backpressure: paling banyak ``--inflight`` batch diproses sekaligus. Jika
+  scorer tertinggal, batcher berhenti mengambil dari antrean, antrean
+  penuh, dan sumber berhenti membaca (untuk socket, TCP flow control
+  menahan pengirim).
+- Hasil ditulis sesuai urutan masuk. Statistik (throughput, kedalaman
+  antrean, batch yang sedang diproses) dicetak ke stderr sebagai JSON
+  setiap ``--stats-interval`` detik.
+
+Contoh:
+    python stream.py --tail feed.jsonl -o verdicts.jsonl
+    python stream.py --listen 127.0.0.1:9000 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import instrumentation
+from batch import ID_COLUMN, pos_pool_for
+from model_bundle import artifact_paths, get_bundle
+from score import record_text
+from scoring import DEFAULT_THRESHOLD, predict
+
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_WAIT = 0.05
+DEFAULT_MAX_QUEUE = 4096
+DEFAULT_INFLIGHT = 2
+RATE_WINDOW = 10.0
+
+_EOF = object()
+
+
+class StreamStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.counts = Counter()
+        self.batch_sizes = Counter()
+        self._scored = deque()
+
+    def scored(self, n):
+        now = time.perf_counter()
+        self.counts["scored"] += n
+        self._scored.append((now, n))
+        while self._scored and self._scored[0][0] < now - RATE_WINDOW:
+            self._scored.popleft()
+
+    def snapshot(self, queue_depth, inflight):
+        now = time.perf_counter()
+        recent = sum(n for _, n in self._scored)
+        window = min(RATE_WINDOW, now - self.started) or 1e-9
+        elapsed = now - self.started
+        return {
+            **self.counts,
+            "queue_depth": queue_depth,
+            "inflight_batches": inflight,
+            "rows_per_sec": recent / window,
+            "rows_per_sec_total": self.counts["scored"] / elapsed if elapsed else 0.0,
+            "mean_batch": (
+                sum(size * n for size, n in self.batch_sizes.items()) / sum(self.batch_sizes.values())
+                if self.batch_sizes else 0.0
+            ),
+        }
+
+
+class StreamScorer:
+    def __init__(self, sink, paths=None, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT,
+                 max_queue=DEFAULT_MAX_QUEUE, inflight=DEFAULT_INFLIGHT, threshold=DEFAULT_THRESHOLD,
+                 pos_pool=None):
+        self.sink = sink
+        self.paths = paths
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.inflight = inflight
+        self.threshold = threshold
+        self.pos_pool = pos_pool
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.stats = StreamStats()
+        self._results = asyncio.Queue()
+        self._slots = asyncio.Semaphore(inflight)
+        self._active = 0  # batch yang sudah memegang slot dan belum ditulis
+        self._executor = ThreadPoolExecutor(max_workers=inflight, thread_name_prefix="stream-score")
+        self._sequence = 0
+
+    async def put_line(self, line):
+        """Parse satu baris JSON lalu masukkan ke antrean (menunggu jika antrean penuh)."""
+        line = line.strip()
+        if not line:
+            return
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                record = {"text": str(record)}
+            # Tolak di sini: satu record rusak tidak boleh menggagalkan seluruh batch-nya
+            record_text(record)
+        except (ValueError, TypeError):
+            self.stats.counts["invalid"] += 1
+            return
+        self.stats.counts["received"] += 1
+        await self.queue.put(record)
+
+    async def close_input(self):
+        await self.queue.put(_EOF)
+
+    def _score(self, records):
+        # get_bundle() murah (hanya stat file) dan memuat ulang jika artefak berganti
+        bundle = get_bundle(self.paths)
+        texts = [record_text(record) for record in records]
+        with instrumentation.stage("stream_batch", len(texts)):
+            return predict(bundle, texts, with_words=False, threshold=self.threshold, pos_pool=self.pos_pool)
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self.queue.get()
+            if first is _EOF:
+                break
+            batch = [first]
+            deadline = loop.time() + self.max_wait
+            finished = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self.queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _EOF:
+                    finished = True
+                    break
+                batch.append(item)
+
+            # Backpressure: tunggu slot kosong sebelum mengambil batch berikutnya dari antrean
+            await self._slots.acquire()
+            self._active += 1
+            self.stats.batch_sizes[len(batch)] += 1
+            future = loop.run_in_executor(self._executor, self._score, batch)
+            await self._results.put((batch, future))
+            if finished:
+                break
+        await self._results.put(_EOF)
+
+    async def _writer(self):
+        while True:
+            entry = await self._results.get()
+            if entry is _EOF:
+                return
+            batch, future = entry
+            try:
+                results = await future
+            except Exception as e:  # batch gagal: catat per record agar urutan output tetap
+                results = [{"error": str(e)}] * len(batch)
+                self.stats.counts["errors"] += len(batch)
+            finally:
+                self._active -= 1
+                self._slots.release()
+            for record, result in zip(batch, results):
+                record_id = record.get(ID_COLUMN, record.get("id", self._sequence))
+                self.sink.write(json.dumps({"id": record_id, **result}, ensure_ascii=False) + "\n")
+                self._sequence += 1
+            self.sink.flush()
+            self.stats.scored(len(batch))
+
+    def snapshot(self):
+        return self.stats.snapshot(self.queue.qsize(), self._active)
+
+    async def _report(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            print(json.dumps(self.snapshot()), file=sys.stderr, flush=True)
+
+    async def run(self, source, stats_interval=None):
+        """Jalankan ``source`` (coroutine yang memanggil ``put_line``) sampai selesai."""
+        reporter = asyncio.create_task(self._report(stats_interval)) if stats_interval else None
+        batcher = asyncio.create_task(self._batcher())
+        writer = asyncio.create_task(self._writer())
+        try:
+            await source
+            await self.close_input()
+            await asyncio.gather(batcher, writer)
+        finally:
+            for task in (reporter, batcher, writer):
+                if task is not None:
+                    task.cancel()
+            self._executor.shutdown(wait=True)
+        return self.snapshot()
+
+
+async def tail_file(scorer, path, follow=True, from_start=True, poll_interval=0.2):
+    """Baca ``path`` baris per baris; jika ``follow``, tunggu baris baru seperti ``tail -f``."""
+    with open(path, encoding="utf-8") as f:
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        partial = ""
+        while True:
+            line = f.readline()
+            if line:
+                partial += line
+                if partial.endswith("\n"):
+                    await scorer.put_line(partial)
+                    partial = ""
+                continue
+            if not follow:
+                break
+            # File dipotong (rotasi/truncate): mulai lagi dari awal
+            if os.path.getsize(path) < f.tell():
+                f.seek(0)
+            await asyncio.sleep(poll_interval)
+        if partial:
+            await scorer.put_line(partial)
+
+
+async def serve_socket(scorer, address):
+    """Terima JSON lines dari banyak koneksi di ``host:port`` atau path socket Unix."""
+
+    async def handle(reader, writer):
+        try:
+            while line := await reader.readline():
+                # put_line menunggu saat antrean penuh, sehingga koneksi ini berhenti dibaca
+                await scorer.put_line(line.decode("utf-8", errors="replace"))
+        finally:
+            writer.close()
+
+    if ":" in address and not address.startswith(("/", ".")):
+        host, port = address.rsplit(":", 1)
+        server = await asyncio.start_server(handle, host, int(port))
+    else:
+        server = await asyncio.start_unix_server(handle, address)
+    print(f"Menerima JSON lines di {address}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+async def run(args, sink):
+    paths = artifact_paths(args.artifacts_dir)
+    get_bundle(paths)  # muat di awal agar batch pertama tidak menunggu
+    with pos_pool_for(args.workers) as pos_pool:
+        scorer = StreamScorer(sink, paths, args.max_batch, args.max_wait_ms / 1000, args.max_queue,
+                              args.inflight, args.threshold, pos_pool)
+        if args.tail:
+            source = tail_file(scorer, args.tail, follow=not args.no_follow, from_start=not args.from_end)
+        else:
+            source = serve_socket(scorer, args.listen)
+        return await scorer.run(source, args.stats_interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skoring aliran iklan JSON lines dengan backpressure.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--tail", metavar="FILE", help="ikuti file JSONL yang terus bertambah")
+    source.add_argument("--listen", metavar="ADDR", help="host:port TCP atau path socket Unix")
+    parser.add_argument("-o", "--output", default="-", help="file output JSONL, atau '-' untuk stdout")
+    parser.add_argument("--no-follow", action="store_true", help="berhenti di akhir file (--tail)")
+    parser.add_argument("--from-end", action="store_true", help="lewati isi file yang sudah ada (--tail)")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT * 1000)
+    parser.add_argument("--max-queue", type=int, default=DEFAULT_MAX_QUEUE)
+    parser.add_argument("--inflight", type=int, default=DEFAULT_INFLIGHT, help="batch yang diproses sekaligus")
+    parser.add_argument("--workers", type=int, default=1, help="jumlah proses untuk POS tagging")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--artifacts-dir", default=None)
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="detik antar laporan statistik (0 = mati)")
+    args = parser.parse_args(argv)
+
+    sink = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    try:
+        stats = asyncio.run(run(args, sink))
+        print(json.dumps(stats), file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+"""Frekuensi term per kelas untuk halaman "☁️ Word Cloud".
+
+Notebook membuat word cloud dengan ``WordCloud.generate(' '.join(teks))``,
+yang menggabungkan seluruh korpus lalu men-tokenisasi ulang. Di sini word
+cloud dibuat dengan ``generate_from_frequencies`` dari tabel jumlah term per
+kelas di atas kolom ``vectorizer_text`` (unigram + bigram):
+
+- ``base.npy``       : jumlah term korpus pelatihan, shape (2, n_features),
+  ditulis oleh ``train.py`` atau ``python term_counts.py fake_job_postings.csv``;
+- ``updates.sqlite3``: tambahan dari posting yang diskor (aplikasi, batch),
+  per hari dan per label prediksi, sehingga bisa dibatasi ke jendela waktu.
+
+Gambar hasil render disimpan di ``RenderCache`` dengan kunci
+(kelas, jendela) dan dibuang secara LRU; entri dirender ulang jika revisi
+data berubah.
+
+Contoh:
+    python term_counts.py fake_job_postings.csv
+"""
+import io
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COUNTS_DIR = os.path.join(BASE_DIR, "term_counts")
+BASE_FILE = "base.npy"
+UPDATES_FILE = "updates.sqlite3"
+MANIFEST = "manifest.json"
+N_CLASSES = 2
+SECONDS_PER_DAY = 86400
+# Tambahan yang lebih tua dari ini dihapus saat update
+RETENTION_DAYS = 365
+MAX_WORDS = 200
+RENDER_CACHE_SIZE = 8
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS counts (
+    day INTEGER NOT NULL,
+    label INTEGER NOT NULL,
+    term INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, label, term)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+def class_counts(text_matrix, labels, n_classes=N_CLASSES):
+    """Jumlah setiap kolom ``text_matrix`` per label, shape (n_classes, n_features)."""
+    labels = np.asarray(labels, dtype=np.int64)
+    indicator = csr_matrix(
+        (np.ones(len(labels), dtype=np.int64), (labels, np.arange(len(labels)))),
+        shape=(n_classes, len(labels)),
+    )
+    return np.asarray((indicator @ text_matrix).todense(), dtype=np.int64)
+
+
+def save_base(counts, directory=COUNTS_DIR):
+    """Tulis tabel dasar; tambahan lama dihapus karena indeks kolomnya milik vocabulary lama."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, BASE_FILE)
+    with open(path + ".tmp", "wb") as f:
+        np.save(f, np.asarray(counts, dtype=np.int64))
+    os.replace(path + ".tmp", path)
+    updates_path = os.path.join(directory, UPDATES_FILE)
+    if os.path.exists(updates_path):
+        os.remove(updates_path)
+    tmp_path = os.path.join(directory, MANIFEST + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"n_features": int(counts.shape[1]), "created_at": time.time()}, f, indent=2)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST))
+
+
+class TermCounts:
+    """Tabel dasar + tambahan inkremental untuk satu vocabulary ``vectorizer_text``."""
+
+    def __init__(self, directory=COUNTS_DIR):
+        self.directory = directory
+        self.updates_path = os.path.join(directory, UPDATES_FILE)
+        self._base = None
+        self._base_version = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        os.makedirs(self.directory, exist_ok=True)
+        connection = sqlite3.connect(self.updates_path, timeout=30)
+        connection.executescript(SCHEMA)
+        return connection
+
+    def base(self):
+        """Tabel dasar (mmap), atau None jika belum dibuat."""
+        path = os.path.join(self.directory, BASE_FILE)
+        try:
+            version = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            if version != self._base_version:
+                self._base = np.load(path, mmap_mode="r")
+                self._base_version = version
+            return self._base
+
+    def available(self):
+        return self.base() is not None
+
+    def update(self, text_matrix, labels, timestamp=None):
+        """Tambahkan jumlah term dari posting yang baru diskor (satu transaksi per batch)."""
+        base = self.base()
+        if base is None or text_matrix.shape[1] != base.shape[1] or not text_matrix.shape[0]:
+            return
+        counts = csr_matrix(class_counts(text_matrix, labels))
+        day = int((timestamp if timestamp is not None else time.time()) // SECONDS_PER_DAY)
+        rows = [
+            (day, label, int(term), int(count))
+            for label in range(counts.shape[0])
+            for term, count in zip(counts[label].indices, counts[label].data)
+        ]
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT INTO counts VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (day, label, term) DO UPDATE SET count = count + excluded.count",
+                rows,
+            )
+            connection.execute("DELETE FROM counts WHERE day < ?", (day - RETENTION_DAYS,))
+            connection.execute(
+                "INSERT INTO meta VALUES ('revision', 1) "
+                "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+            )
+        connection.close()
+
+    def revision(self):
+        """Berubah setiap kali tabel dasar diganti atau ada tambahan baru."""
+        revision = 0
+        if os.path.exists(self.updates_path):
+            with self._connect() as connection:
+                row = connection.execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+            connection.close()
+            revision = row[0] if row else 0
+        self.base()
+        return self._base_version, revision
+
+    def frequencies(self, label, window_days=None, now=None):
+        """Jumlah per kolom untuk ``label``; dengan ``window_days`` hanya tambahan dalam jendela itu."""
+        base = self.base()
+        if base is None:
+            raise FileNotFoundError(f"tabel dasar belum dibuat di {self.directory}")
+        counts = np.zeros(base.shape[1], dtype=np.int64) if window_days else np.array(base[label])
+        if not os.path.exists(self.updates_path):
+            return counts
+        first_day = 0
+        if window_days:
+            first_day = int((now if now is not None else time.time()) // SECONDS_PER_DAY) - window_days + 1
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT term, SUM(count) FROM counts WHERE label = ? AND day >= ? GROUP BY term",
+                (label, first_day),
+            ).fetchall()
+        connection.close()
+        if rows:
+            terms, sums = np.array(rows, dtype=np.int64).T
+            counts[terms] += sums
+        return counts
+
+
+def top_frequencies(counts, feature_names, max_words=MAX_WORDS):
+    """Dict term -> jumlah untuk ``max_words`` kolom terbanyak (input ``generate_from_frequencies``)."""
+    columns = np.flatnonzero(counts)
+    if len(columns) > max_words:
+        columns = columns[np.argpartition(-counts[columns], max_words - 1)[:max_words]]
+    names = feature_names(columns)
+    return {name: int(count) for name, count in zip(names, counts[columns])}
+
+
+def render_png(frequencies, width=1000, height=400):
+    """Render word cloud dari frekuensi (pengaturan sama dengan notebook) ke PNG."""
+    from wordcloud import WordCloud
+
+    cloud = WordCloud(min_font_size=4, width=width, height=height, background_color="white")
+    cloud.generate_from_frequencies(frequencies)
+    buffer = io.BytesIO()
+    cloud.to_image().save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class RenderCache:
+    """Cache LRU gambar word cloud dengan kunci (kelas, jendela) dan revisi data."""
+
+    def __init__(self, max_entries=RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, revision, render):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == revision:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        image = render()
+        with self._lock:
+            self._entries[key] = (revision, image)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return image
+
+
+# Dipakai bersama semua sesi Streamlit dalam satu proses
+render_cache = RenderCache()
+_stores = {}
+
+
+def get_term_counts(directory=COUNTS_DIR):
+    store = _stores.get(directory)
+    if store is None:
+        store = _stores.setdefault(directory, TermCounts(directory))
+    return store
+
+
+def word_cloud(bundle, label, window_days=None, store=None, cache=render_cache):
+    """PNG word cloud untuk ``label`` (0 = asli, 1 = palsu), dari cache jika datanya tidak berubah."""
+    store = store or get_term_counts()
+    revision = (bundle.version, store.revision())
+
+    def render():
+        counts = store.frequencies(label, window_days)
+        return render_png(top_frequencies(counts, bundle.text_feature_names)) if counts.any() else None
+
+    return cache.get((label, window_days), revision, render)
+
+
+def main(argv=None):
+    import argparse
+    import csv
+
+    from batch import DEFAULT_CHUNKSIZE, combine_columns, iter_chunks
+    from model_bundle import get_bundle
+
+    parser = argparse.ArgumentParser(description="Hitung tabel dasar frekuensi term per kelas dari dataset berlabel.")
+    parser.add_argument("dataset", help="CSV dengan skema fake_job_postings.csv (kolom fraudulent)")
+    parser.add_argument("--output-dir", default=COUNTS_DIR)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args(argv)
+
+    bundle = get_bundle()
+    counts = None
+    with open(args.dataset, encoding="utf-8", newline="") as f:
+        for chunk in iter_chunks(csv.DictReader(f), args.chunksize):
+            texts = bundle.preprocess([combine_columns(row) for row in chunk])
+            labels = [int(row["fraudulent"]) for row in chunk]
+            chunk_counts = class_counts(bundle.vectorizer_text.transform(texts), labels)
+            counts = chunk_counts if counts is None else counts + chunk_counts
+    if counts is None:
+        print("dataset kosong", file=sys.stderr)
+        return 1
+    save_base(counts, args.output_dir)
+    print(f"{counts.shape[1]:,} term, {counts[0].sum():,} (asli) / {counts[1].sum():,} (palsu) kemunculan")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""Pelatihan ulang model dari ``fake_job_postings.csv`` tanpa notebook.
+
+Langkah-langkah di ``iklan-palsu.ipynb`` dijadikan tahap pipeline:
+
+    load -> combine -> clean -> lemmatize -> pos -> vectorize -> cv -> fit -> export
+
+Hasil tahap data (sampai ``vectorize``) disimpan di ``--cache-dir`` dengan
+kunci hash konten: kunci sebuah tahap dihitung dari parameternya dan kunci
+tahap sebelumnya, sehingga mengubah pengaturan model (mis. ``--max-iter``)
+tidak menjalankan ulang lematisasi atau POS tagging. Fold cross-validation
+dijalankan paralel dan waktu setiap tahap dilaporkan di akhir.
+
+Untuk korpus yang tidak muat di memori, ``--out-of-core`` membaca CSV per
+chunk dan melatih ``SGDClassifier`` di atas fitur hashing (lihat
+``out_of_core.py``).
+
+Contoh:
+    python train.py fake_job_postings.csv --output-dir . --jobs -1
+    python train.py arsip_postingan.csv --out-of-core --chunksize 20000
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import joblib
+import pandas as pd
+
+import versioned_dir
+from batch import TEXT_COLUMNS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(BASE_DIR, ".cache", "train")
+LABEL_COLUMN = "fraudulent"
+
+
+class Pipeline:
+    """Menjalankan tahap dengan cache berbasis hash konten dan mencatat waktunya."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, use_cache=True):
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
+        self.timings = []
+
+    def run(self, name, params, fn, cache=True):
+        key = hashlib.sha256(json.dumps([name, params], sort_keys=True, default=str).encode()).hexdigest()[:16]
+        path = os.path.join(self.cache_dir, f"{name}-{key}.joblib")
+        start = time.perf_counter()
+        cached = cache and self.use_cache and os.path.exists(path)
+        if cached:
+            result = joblib.load(path)
+        else:
+            result = fn()
+            if cache and self.use_cache:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                joblib.dump(result, path + ".tmp")
+                os.replace(path + ".tmp", path)
+        self.timings.append({"stage": name, "seconds": time.perf_counter() - start, "cached": cached})
+        return result, key
+
+    def report(self, file=sys.stderr):
+        for timing in self.timings:
+            note = " (cache)" if timing["cached"] else ""
+            print(f"{timing['stage']:<10} {timing['seconds']:8.2f} s{note}", file=file)
+
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_dataset(path, seed):
+    df = pd.read_csv(path, usecols=TEXT_COLUMNS + [LABEL_COLUMN])
+    fake = df[df[LABEL_COLUMN] == 1]
+    real = df[df[LABEL_COLUMN] == 0]
+    # Oversampling iklan palsu hingga sama banyak dengan iklan asli (seperti notebook)
+    fake = fake.sample(len(real), replace=True, random_state=seed)
+    return pd.concat([fake, real], ignore_index=True)
+
+
+def combine_columns(df):
+    """Versi vektor dari ``df[cols].apply(lambda x: ' '.join(x), axis=1)``."""
+    columns = df[TEXT_COLUMNS].fillna(" ").astype(str)
+    combined = columns[TEXT_COLUMNS[0]].str.cat([columns[c] for c in TEXT_COLUMNS[1:]], sep=" ")
+    return pd.DataFrame({"combined_text": combined, LABEL_COLUMN: df[LABEL_COLUMN].to_numpy()})
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Latih ulang model deteksi iklan lowongan kerja palsu.")
+    parser.add_argument("dataset", help="path fake_job_postings.csv")
+    parser.add_argument("--output-dir", default=BASE_DIR, help="folder tujuan artefak .pkl")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--max-iter", type=int, default=500)
+    parser.add_argument("--C", type=float, default=1.0)
+    parser.add_argument("--jobs", type=int, default=-1, help="proses untuk fold CV (-1 = semua core)")
+    parser.add_argument("--pos-workers", type=int, default=None, help="proses untuk POS tagging (default: semua core)")
+    parser.add_argument("--compact-vocab", action="store_true",
+                        help="ekspor juga countvectorizer_text.vocab (lihat vocabulary.py)")
+    parser.add_argument("--mmap", action="store_true",
+                        help="ekspor juga artifacts.mmap/ (lihat mapped_artifacts.py)")
+    parser.add_argument("--report", help="simpan metrik dan waktu tahap ke file JSON")
+
+    out_of_core = parser.add_argument_group("out-of-core (lihat out_of_core.py)")
+    out_of_core.add_argument("--out-of-core", action="store_true",
+                             help="baca CSV per chunk dan latih SGDClassifier dengan fitur hashing")
+    out_of_core.add_argument("--chunksize", type=int, default=10_000, help="baris per chunk")
+    out_of_core.add_argument("--epochs", type=int, default=3)
+    out_of_core.add_argument("--alpha", type=float, default=1e-4, help="regularisasi L2 SGDClassifier")
+    out_of_core.add_argument("--hash-bits", type=int, default=20, help="jumlah fitur teks = 2**hash_bits")
+    out_of_core.add_argument("--lemma-rows", type=int, default=20_000,
+                             help="baris pertama yang dipakai untuk membangun tabel lemma")
+    out_of_core.add_argument("--name-rows", type=int, default=50_000,
+                             help="baris pertama yang dipakai untuk nama term (penjelasan, word cloud)")
+    return parser
+
+
+def export_artifacts(args, model, vectorizer_text, vectorizer_pos, preprocessor, term_counts):
+    os.makedirs(args.output_dir, exist_ok=True)
+    vocab_dir = os.path.join(args.output_dir, "countvectorizer_text.vocab")
+    mapped_dir = os.path.join(args.output_dir, "artifacts.mmap")
+    # load_bundle memakai vocabulary ringkas dan artifacts.mmap di atas pickle. Versi lama dilepas
+    # sebelum pickle diganti dan versi baru dipasang sesudahnya, jadi pickle baru tidak pernah
+    # dipasangkan dengan vocabulary/bobot lama
+    versioned_dir.withdraw(vocab_dir)
+    versioned_dir.withdraw(mapped_dir)
+    artifacts = {
+        "logistic_model.pkl": model,
+        "countvectorizer_text.pkl": vectorizer_text,
+        "countvectorizer_pos.pkl": vectorizer_pos,
+        "preprocessor.pkl": preprocessor,
+    }
+    for filename, obj in artifacts.items():
+        # Tulis ke file sementara lalu os.replace agar aplikasi tidak membaca file setengah jadi
+        path = os.path.join(args.output_dir, filename)
+        joblib.dump(obj, path + ".tmp")
+        os.replace(path + ".tmp", path)
+    if args.compact_vocab:
+        from vocabulary import export_vocabulary
+        export_vocabulary(vectorizer_text, vocab_dir)
+    if args.mmap:
+        from mapped_artifacts import export as export_mapped
+        export_mapped(model, vectorizer_text, vectorizer_pos, mapped_dir)
+    # Tabel frekuensi term per kelas untuk halaman Word Cloud (kolom teks saja)
+    from term_counts import save_base
+    save_base(term_counts, os.path.join(args.output_dir, "term_counts"))
+    return sorted(artifacts)
+
+
+def report(args, pipeline, metrics):
+    for name, value in metrics.items():
+        print(f"{name}: {value}")
+    pipeline.report()
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"metrics": metrics, "timings": pipeline.timings}, f, indent=2)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    pipeline = Pipeline(args.cache_dir, use_cache=not args.no_cache)
+
+    if args.out_of_core:
+        if args.compact_vocab or args.mmap:
+            parser.error("--compact-vocab dan --mmap butuh vocabulary; tidak tersedia dengan --out-of-core")
+        from out_of_core import train
+
+        model, vectorizer_text, vectorizer_pos, preprocessor, term_counts, metrics = train(args, pipeline)
+        pipeline.run("export", None, lambda: export_artifacts(
+            args, model, vectorizer_text, vectorizer_pos, preprocessor, term_counts
+        ), cache=False)
+        report(args, pipeline, metrics)
+        return 0
+
+    # Tahap data (di-cache)
+    df, key = pipeline.run("load", [file_digest(args.dataset), args.seed],
+                           lambda: load_dataset(args.dataset, args.seed))
+    df, key = pipeline.run("combine", [key, TEXT_COLUMNS], lambda: combine_columns(df))
+
+    def clean():
+        from preprocessing import TextPreprocessor
+
+        preprocessor = TextPreprocessor()
+        return preprocessor, [preprocessor.clean(text) for text in df["combined_text"]]
+
+    (preprocessor, cleaned), key = pipeline.run("clean", [key], clean)
+
+    def lemmatize():
+        preprocessor.fit(cleaned)
+        return preprocessor, [preprocessor.lemmatize(text) for text in cleaned]
+
+    (preprocessor, texts), key = pipeline.run("lemmatize", [key, _spacy_version()], lemmatize)
+
+    def pos():
+        from pos_tagging import pos_features
+        return pos_features(texts, workers=args.pos_workers)
+
+    pos_tags, key = pipeline.run("pos", [key, _nltk_version()], pos)
+
+    def vectorize():
+        from scipy.sparse import hstack
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        vectorizer_text = CountVectorizer(ngram_range=(1, 2))
+        vectorizer_pos = CountVectorizer(ngram_range=(1, 2))
+        matrix = hstack([vectorizer_text.fit_transform(texts), vectorizer_pos.fit_transform(pos_tags)]).tocsr()
+        return vectorizer_text, vectorizer_pos, matrix
+
+    (vectorizer_text, vectorizer_pos, matrix), key = pipeline.run("vectorize", [key], vectorize)
+
+    # Tahap model (tidak di-cache: murah dibanding tahap data dan sering diubah)
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+    from sklearn.model_selection import cross_val_score, train_test_split
+
+    labels = df[LABEL_COLUMN].to_numpy()
+    X_train, X_test, y_train, y_test = train_test_split(
+        matrix, labels, test_size=args.test_size, random_state=args.seed
+    )
+    model = LogisticRegression(max_iter=args.max_iter, C=args.C)
+
+    cv_scores, _ = pipeline.run(
+        "cv", None, lambda: cross_val_score(model, X_train, y_train, cv=args.cv, n_jobs=args.jobs), cache=False
+    )
+    model, _ = pipeline.run("fit", None, lambda: model.fit(X_train, y_train), cache=False)
+
+    y_pred = model.predict(X_test)
+    metrics = {
+        "cv_scores": [float(score) for score in cv_scores],
+        "cv_mean": float(cv_scores.mean()),
+        "accuracy": accuracy_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred),
+        "recall": recall_score(y_test, y_pred),
+        "f1": f1_score(y_test, y_pred),
+    }
+
+    def export():
+        from term_counts import class_counts
+
+        term_counts = class_counts(matrix[:, :len(vectorizer_text.vocabulary_)], labels)
+        return export_artifacts(args, model, vectorizer_text, vectorizer_pos, preprocessor, term_counts)
+
+    pipeline.run("export", None, export, cache=False)
+    report(args, pipeline, metrics)
+    return 0
+
+
+def _spacy_version():
+    try:
+        import spacy
+        return [spacy.__version__, spacy.util.get_package_version("en_core_web_sm")]
+    except ImportError:
+        return None
+
+
+def _nltk_version():
+    import nltk
+    return nltk.__version__
+
+
+if __name__ == "__main__":
+    sys.exit(main())
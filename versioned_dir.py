@@ -0,0 +1,98 @@
+"""Folder artefak berversi yang dipasang dengan satu ``os.replace``.
+
+Artefak berbentuk folder (``artifacts.mmap/``, ``countvectorizer_text.vocab/``,
+``dataset/search/``) dibaca proses lain dengan ``mmap_mode='r'``. Menulis
+ulang filenya di tempat memotong inode yang sedang dipetakan (SIGBUS atau
+campuran file lama dan baru), dan menukar folder dengan dua rename membuat
+celah saat folder tidak ada sama sekali. Di sini ``directory`` hanya wadah:
+
+- setiap versi ditulis lengkap di ``directory/.tmp-*`` (``staging``) lalu
+  di-rename menjadi ``directory/<versi>/``;
+- ``directory/CURRENT`` berisi nama versi aktif dan diganti dengan
+  ``os.replace`` (``publish``), jadi pembaca selalu melihat versi lama atau
+  versi baru yang sudah lengkap;
+- versi aktif dan satu versi sebelumnya disimpan; yang lebih lama dihapus.
+  Proses yang masih memetakan file versi terhapus tetap aman (inode tetap
+  ada sampai di-unmap).
+
+Pembaca memanggil ``resolve`` sekali lalu membuka semua file dari folder
+versi yang dikembalikannya.
+"""
+import os
+import shutil
+import threading
+import time
+
+POINTER = "CURRENT"
+TMP_PREFIX = ".tmp-"
+
+
+def pointer_path(directory):
+    return os.path.join(directory, POINTER)
+
+
+def resolve(directory):
+    """Folder versi aktif di dalam ``directory``, atau None jika belum ada versi terpasang."""
+    try:
+        with open(pointer_path(directory), encoding="utf-8") as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(directory, name) if name else None
+
+
+def staging(directory):
+    """Folder sementara yang kosong untuk menulis versi berikutnya."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{TMP_PREFIX}{os.getpid()}-{threading.get_ident()}")
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    return path
+
+
+def publish(staged, directory, version=None):
+    """Jadikan ``staged`` versi aktif ``directory``; kembalikan folder versinya.
+
+    ``version`` sebaiknya hash isi: jika versi yang sama sudah ada, isinya
+    identik dan ``staged`` dibuang.
+    """
+    version = version or f"{time.time_ns():x}-{os.getpid()}"
+    target = os.path.join(directory, version)
+    if os.path.exists(target):
+        shutil.rmtree(staged, ignore_errors=True)
+    else:
+        os.replace(staged, target)
+    previous = resolve(directory)
+    tmp_pointer = f"{pointer_path(directory)}{TMP_PREFIX}{os.getpid()}-{threading.get_ident()}"
+    with open(tmp_pointer, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp_pointer, pointer_path(directory))
+    keep = {version}
+    if previous:
+        keep.add(os.path.basename(previous))
+    _prune(directory, keep)
+    return target
+
+
+def withdraw(directory):
+    """Lepas versi aktif (loader kembali ke pickle) lalu hapus semua versi."""
+    if not os.path.isdir(directory):
+        return
+    try:
+        os.remove(pointer_path(directory))
+    except FileNotFoundError:
+        pass
+    _prune(directory, set())
+
+
+def _prune(directory, keep):
+    for name in os.listdir(directory):
+        # Pointer dan folder staging milik proses lain tidak disentuh
+        if name in keep or name.startswith((TMP_PREFIX, POINTER)):
+            continue
+        path = os.path.join(directory, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            # Sisa format lama (file langsung di dalam folder, tanpa CURRENT)
+            os.remove(path)
@@ -0,0 +1,193 @@
+"""Vocabulary ringkas (memory-mapped) untuk CountVectorizer unigram+bigram.
+
+``countvectorizer_text.pkl`` menyimpan ``vocabulary_`` sebagai dict Python
+berisi ratusan ribu string bigram; dict itu mendominasi ukuran pickle dan
+RSS setiap proses. ``export_vocabulary`` menulis vocabulary yang sama
+sebagai versi baru ``countvectorizer_text.vocab/<versi>/`` lalu memasangnya
+dengan mengganti ``CURRENT`` (lihat ``versioned_dir.py``); file yang sedang
+dipetakan proses lain tidak pernah ditulis ulang. Isi setiap versi:
+
+- ``hashes.npy``  : hash 64-bit (blake2b) setiap term, terurut;
+- ``columns.npy`` : indeks kolom untuk setiap hash (urutan sama);
+- ``offsets.npy`` + ``terms.npy`` : nama term (UTF-8) per indeks kolom;
+- ``manifest.json``: parameter analyzer dan jumlah fitur.
+
+``CompactCountVectorizer`` membaca folder tersebut dengan ``mmap_mode='r'``
+(dimuat dalam hitungan milidetik dan dibagi antar proses lewat page cache)
+dan menghasilkan matriks dengan indeks kolom yang sama persis dengan
+vectorizer asli, sehingga ``logistic_model.pkl`` tetap bisa dipakai.
+Term di luar vocabulary hanya salah dipetakan jika hash 64-bitnya bertabrakan
+dengan term vocabulary (peluang ~n/2**64).
+
+Contoh:
+    python vocabulary.py countvectorizer_text.pkl countvectorizer_text.vocab
+"""
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+import versioned_dir
+
+MANIFEST = "manifest.json"
+# Parameter CountVectorizer yang menentukan analyzer (harus bisa diserialisasi ke JSON)
+ANALYZER_PARAMS = (
+    "analyzer", "lowercase", "token_pattern", "ngram_range",
+    "strip_accents", "stop_words", "encoding", "decode_error",
+)
+
+
+def term_hash(term):
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def export_vocabulary(vectorizer, directory):
+    """Pasang ``vectorizer.vocabulary_`` sebagai versi baru ``directory``; kembalikan manifest-nya."""
+    staged = versioned_dir.staging(directory)
+    manifest = write_vocabulary(vectorizer, staged)
+    versioned_dir.publish(staged, directory)
+    return manifest
+
+
+def write_vocabulary(vectorizer, directory):
+    """Tulis ``vectorizer.vocabulary_`` sebagai array numpy di folder baru ``directory``."""
+    if vectorizer.preprocessor is not None or vectorizer.tokenizer is not None:
+        raise ValueError("preprocessor/tokenizer kustom tidak bisa diekspor ke vocabulary ringkas")
+    if not isinstance(vectorizer.analyzer, str):
+        raise ValueError("analyzer kustom tidak bisa diekspor ke vocabulary ringkas")
+
+    vocabulary = vectorizer.vocabulary_
+    n_features = len(vocabulary)
+    terms = [None] * n_features
+    for term, column in vocabulary.items():
+        terms[column] = term
+
+    hashes = np.fromiter((term_hash(term) for term in terms), dtype=np.uint64, count=n_features)
+    order = np.argsort(hashes, kind="stable")
+    sorted_hashes = hashes[order]
+    if n_features > 1 and (np.diff(sorted_hashes) == 0).any():
+        raise ValueError("tabrakan hash pada vocabulary; tidak bisa diekspor")
+
+    encoded = [term.encode("utf-8") for term in terms]
+    offsets = np.zeros(n_features + 1, dtype=np.int64)
+    np.cumsum([len(term) for term in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, "hashes.npy"), sorted_hashes)
+    np.save(os.path.join(directory, "columns.npy"), order.astype(np.int32))
+    np.save(os.path.join(directory, "offsets.npy"), offsets)
+    np.save(os.path.join(directory, "terms.npy"), blob)
+
+    params = vectorizer.get_params()
+    manifest = {name: params[name] for name in ANALYZER_PARAMS}
+    manifest["ngram_range"] = list(manifest["ngram_range"])
+    if manifest["stop_words"] is not None and not isinstance(manifest["stop_words"], str):
+        manifest["stop_words"] = sorted(manifest["stop_words"])
+    manifest.update(
+        n_features=n_features,
+        binary=bool(params["binary"]),
+        dtype=np.dtype(params["dtype"]).name,
+    )
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class CompactCountVectorizer:
+    """Pengganti ``CountVectorizer.transform`` yang membaca vocabulary ringkas.
+
+    ``directory`` adalah folder satu versi (``versioned_dir.resolve``).
+    """
+
+    def __init__(self, directory, mmap_mode="r"):
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        params = {name: self.manifest[name] for name in ANALYZER_PARAMS}
+        params["ngram_range"] = tuple(params["ngram_range"])
+        self._analyzer = CountVectorizer(**params).build_analyzer()
+        self.n_features = self.manifest["n_features"]
+        self.binary = self.manifest["binary"]
+        self.dtype = np.dtype(self.manifest["dtype"])
+
+        def load(name):
+            return np.load(os.path.join(directory, name + ".npy"), mmap_mode=mmap_mode)
+
+        self.hashes = load("hashes")
+        self.columns = load("columns")
+        self.offsets = load("offsets")
+        self.terms = load("terms")
+        self._feature_names = None
+
+    def build_analyzer(self):
+        return self._analyzer
+
+    def lookup(self, terms):
+        """Indeks kolom untuk setiap term, atau -1 jika tidak ada di vocabulary."""
+        hashes = np.fromiter((term_hash(term) for term in terms), dtype=np.uint64)
+        if not len(hashes) or not self.n_features:
+            return np.full(len(hashes), -1, dtype=np.int64)
+        positions = np.searchsorted(self.hashes, hashes)
+        positions[positions == self.n_features] = 0
+        found = self.hashes[positions] == hashes
+        return np.where(found, self.columns[positions], -1)
+
+    def transform(self, raw_documents):
+        indptr = [0]
+        indices = []
+        data = []
+        for document in raw_documents:
+            columns = self.lookup(self._analyzer(document))
+            columns, counts = np.unique(columns[columns >= 0], return_counts=True)
+            indices.append(columns)
+            data.append(np.ones_like(counts) if self.binary else counts)
+            indptr.append(indptr[-1] + len(columns))
+        matrix = csr_matrix(
+            (
+                np.concatenate(data).astype(self.dtype) if data else np.empty(0, self.dtype),
+                np.concatenate(indices) if indices else np.empty(0, np.int64),
+                np.asarray(indptr, dtype=np.int64),
+            ),
+            shape=(len(indptr) - 1, self.n_features),
+        )
+        return matrix
+
+    def feature_name(self, column):
+        start, end = self.offsets[column], self.offsets[column + 1]
+        return bytes(self.terms[start:end]).decode("utf-8")
+
+    def get_feature_names_out(self):
+        # Didekode sekali lalu disimpan; hindari pada jalur prediksi
+        if self._feature_names is None:
+            blob = bytes(self.terms)
+            offsets = np.asarray(self.offsets)
+            self._feature_names = np.array(
+                [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(self.n_features)],
+                dtype=object,
+            )
+        return self._feature_names
+
+
+def main(argv=None):
+    import argparse
+
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Ekspor vocabulary CountVectorizer ke format ringkas.")
+    parser.add_argument("vectorizer", help="file pickle CountVectorizer, mis. countvectorizer_text.pkl")
+    parser.add_argument("output", help="folder tujuan, mis. countvectorizer_text.vocab")
+    args = parser.parse_args(argv)
+
+    manifest = export_vocabulary(joblib.load(args.vectorizer), args.output)
+    print(f"{manifest['n_features']:,} term diekspor ke {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())